@@ -0,0 +1,6 @@
+import sys
+
+from core.batch_pipeline import main
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,64 @@
+"""
+Line grouping cost: pandas DataFrame groupby (old controller code) vs OcrResult.lines().
+Uses synthetic Tesseract-shaped word lists of 100 to 10k words.
+
+Usage: python -m benchmarks.bench_ocr_result [--repeat 20]
+"""
+import argparse
+import random
+import time
+
+import pandas as pd
+
+from services.ocr_result import OcrResult
+
+def synthetic_words(n_words, words_per_line=8, lines_per_block=6, seed=0):
+    rng = random.Random(seed)
+    data = {name: [] for name in ('text', 'left', 'top', 'width', 'height', 'conf', 'block_num', 'line_num')}
+    for i in range(n_words):
+        line_index = i // words_per_line
+        data['text'].append("".join(rng.choice("abcdefghijklmnopqrstuvwxyz") for _ in range(rng.randint(2, 9))))
+        data['left'].append((i % words_per_line) * 60 + rng.randint(0, 3))
+        data['top'].append(line_index * 20 + rng.randint(0, 2))
+        data['width'].append(rng.randint(20, 55))
+        data['height'].append(rng.randint(10, 14))
+        data['conf'].append(rng.randint(60, 99))
+        data['block_num'].append(line_index // lines_per_block + 1)
+        data['line_num'].append(line_index % lines_per_block + 1)
+    return data
+
+def pandas_lines(df):
+    # Verbatim grouping logic from the DataFrame-based controller
+    original_texts, lines_metadata = [], []
+    for _, group in df.groupby(['block_num', 'line_num']):
+        line_text = " ".join(group.text.astype(str)).strip()
+        if not line_text: continue
+        original_texts.append(line_text)
+        x_min, y_min = group.left.min(), group.top.min()
+        x_max, y_max = (group.left + group.width).max(), (group.top + group.height).max()
+        lines_metadata.append({'original': line_text, 'box': (x_min, y_min, x_max, y_max)})
+    return original_texts, lines_metadata
+
+def best_of(fn, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    print(f"{'words':>7} {'pandas build+group':>20} {'OcrResult build+lines':>22} {'speedup':>8}")
+    for n_words in (100, 1000, 10000):
+        data = synthetic_words(n_words)
+        assert pandas_lines(pd.DataFrame(data))[0] == OcrResult.from_columns(data).lines()[0]
+        pandas_ms = best_of(lambda: pandas_lines(pd.DataFrame(data)), args.repeat)
+        result_ms = best_of(lambda: OcrResult.from_columns(data).lines(), args.repeat)
+        print(f"{n_words:>7} {pandas_ms:>18.2f}ms {result_ms:>20.2f}ms {pandas_ms / result_ms:>7.1f}x")
+
+if __name__ == "__main__":
+    main()
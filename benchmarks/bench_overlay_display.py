@@ -0,0 +1,105 @@
+"""
+Per-update latency and peak memory of the overlay display path on large frames:
+legacy (copy + PIL text + tobytes + QImage.copy + QPixmap per update) versus the vector
+layer (one pixmap per capture, QPainter text per update). Each mode runs in its own
+process so peak RSS is comparable.
+
+Usage: python -m benchmarks.bench_overlay_display [--size 3840x2160] [--lines 200] [--updates 20]
+"""
+import argparse
+import json
+import os
+import random
+import resource
+import subprocess
+import sys
+import time
+
+def run_mode(mode, width, height, line_count, updates):
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+    from PIL import Image
+    from PyQt6.QtWidgets import QApplication
+    from PyQt6.QtGui import QImage, QPainter, QPixmap
+    from benchmarks.synthetic import random_line
+    from services.drawing_service import OverlayScene, draw_line_patches, draw_line_text
+    from ui.overlay_view import OverlayView
+
+    app = QApplication.instance() or QApplication([])
+    rng = random.Random(0)
+    image = Image.effect_noise((width, height), 64).convert("RGB")
+    lines = []
+    for i in range(line_count):
+        y = (i * 40) % (height - 30)
+        x = rng.randint(0, width // 2)
+        lines.append({'box': (x, y, x + rng.randint(200, width // 3), y + 22)})
+    texts = [random_line(rng) for _ in lines]
+    viewport = QImage(1920, 1080, QImage.Format.Format_RGB32)  # what the window actually shows
+    baseline = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+    timings = []
+    per_update = max(1, line_count // updates)
+    if mode == "legacy":
+        from PIL import ImageDraw
+        canvas = image.copy()
+        draw = ImageDraw.Draw(canvas)
+        draw_line_patches(draw, lines)
+        for update in range(updates):
+            start = time.perf_counter()
+            for i in range(update * per_update, min(line_count, (update + 1) * per_update)):
+                draw_line_text(draw, lines[i], texts[i])
+            frame = canvas.copy()  # controller: snapshot per emit
+            data = frame.tobytes("raw", "RGB")  # ResultWindow.pil_to_qimage
+            qimage = QImage(data, width, height, width * 3, QImage.Format.Format_RGB888).copy()
+            pixmap = QPixmap.fromImage(qimage)
+            painter = QPainter(viewport)
+            painter.drawPixmap(0, 0, pixmap)
+            painter.end()
+            timings.append(time.perf_counter() - start)
+    else:
+        view = OverlayView()
+        translated = [""] * line_count
+        for update in range(updates):
+            start = time.perf_counter()
+            for i in range(update * per_update, min(line_count, (update + 1) * per_update)):
+                translated[i] = texts[i]
+            view.set_scene(OverlayScene(image, lines, list(translated)))
+            painter = QPainter(viewport)
+            view.paint_scene(painter, viewport.rect())
+            painter.end()
+            timings.append(time.perf_counter() - start)
+
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    to_mb = 1024 if sys.platform != "darwin" else 1024 * 1024  # ru_maxrss: KiB on Linux, bytes on macOS
+    return {
+        "first_ms": timings[0] * 1000,
+        "median_ms": sorted(timings)[len(timings) // 2] * 1000,
+        "total_ms": sum(timings) * 1000,
+        "peak_growth_mb": (peak - baseline) / to_mb,
+    }
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--size", default="3840x2160")
+    parser.add_argument("--lines", type=int, default=200)
+    parser.add_argument("--updates", type=int, default=20)
+    parser.add_argument("--mode", choices=("legacy", "vector"))
+    args = parser.parse_args()
+    width, height = (int(v) for v in args.size.split("x"))
+
+    if args.mode:
+        print(json.dumps(run_mode(args.mode, width, height, args.lines, args.updates)))
+        return
+
+    print(f"{args.size}, {args.lines} lines, {args.updates} progressive updates")
+    print(f"{'mode':>7} {'first ms':>9} {'median ms':>10} {'total ms':>9} {'peak +MB':>9}")
+    for mode in ("legacy", "vector"):
+        output = subprocess.run(
+            [sys.executable, "-m", "benchmarks.bench_overlay_display", "--mode", mode, "--size", args.size,
+             "--lines", str(args.lines), "--updates", str(args.updates)],
+            capture_output=True, text=True, check=True
+        ).stdout
+        result = json.loads(output.strip().splitlines()[-1])
+        print(f"{mode:>7} {result['first_ms']:>9.1f} {result['median_ms']:>10.1f} {result['total_ms']:>9.1f} {result['peak_growth_mb']:>9.1f}")
+
+if __name__ == "__main__":
+    main()
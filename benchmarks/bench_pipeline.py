@@ -0,0 +1,197 @@
+"""
+End-to-end pipeline benchmark on deterministic synthetic screenshots. Each stage is timed separately:
+capture conversion, OCR, line grouping, translation (offline stub provider), overlay drawing and
+QImage/QPixmap conversion. OCR needs the tesseract binary; without it the stage is reported as null
+and the later stages run on ground-truth words.
+
+Usage:
+  python -m benchmarks.bench_pipeline --output before.json
+  python -m benchmarks.bench_pipeline --output after.json --compare before.json [--tolerance 0.2]
+"""
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+from types import SimpleNamespace
+
+import numpy as np
+
+from benchmarks.synthetic import render_text_image
+from services.batch_translator import BatchTranslator
+from services.capture_service import CaptureService
+from services.drawing_service import draw_translation_overlay
+from services.ocr_result import OcrResult
+from services.stub_translator import StubTranslatorProvider
+
+# name -> (width, height, font_size, fill_ratio, columns)
+CASES = {
+    "small-dense": (800, 600, 14, 1.0, 1),
+    "hd-dense": (1920, 1080, 16, 1.0, 1),
+    "hd-sparse": (1920, 1080, 24, 0.3, 1),
+    "4k-dense": (3840, 2160, 18, 1.0, 1),
+    "4k-two-column": (3840, 2160, 18, 1.0, 2),
+}
+STAGES = ("capture", "ocr", "grouping", "translate", "draw", "qimage")
+
+class ReplayGrabber:
+    """mss-like grabber returning the same BGRA frame every time."""
+
+    def __init__(self, image):
+        rgba = np.asarray(image.convert("RGBA"))
+        self.raw = bytearray(rgba[..., [2, 1, 0, 3]].tobytes())
+        self.width, self.height = image.size
+
+    def grab(self, monitor):
+        return SimpleNamespace(raw=self.raw, width=self.width, height=self.height)
+
+def truth_words(lines):
+    """Word-level OcrResult from ground-truth line boxes (word x-ranges proportional to character offsets)."""
+    columns = {key: [] for key in ('text', 'block_num', 'line_num', 'left', 'top', 'width', 'height', 'conf')}
+    for number, line in enumerate(lines, start=1):
+        x0, y0, x1, y1 = line['box']
+        per_char = (x1 - x0) / max(1, len(line['text']))
+        offset = 0
+        for word in line['text'].split(" "):
+            columns['text'].append(word)
+            columns['block_num'].append(number)
+            columns['line_num'].append(1)
+            columns['left'].append(int(x0 + offset * per_char))
+            columns['top'].append(y0)
+            columns['width'].append(max(1, int(len(word) * per_char)))
+            columns['height'].append(y1 - y0)
+            columns['conf'].append(95)
+            offset += len(word) + 1
+    return OcrResult.from_columns(columns)
+
+def make_ocr_service():
+    """OCRService when tesseract (or another engine) is usable, else None."""
+    import pytesseract
+    from services.ocr_service import OCRService
+    from utils import helpers as utils
+
+    pytesseract.pytesseract.tesseract_cmd = utils.get_tesseract_cmd()
+    try:
+        pytesseract.get_tesseract_version()
+    except Exception as e:
+        print(f"OCR stage skipped (tesseract not available: {e})")
+        return None
+    return OCRService(strategy=utils.get_ocr_strategy())
+
+def timed(fn, repeat):
+    """Returns (median milliseconds, last result)."""
+    samples, result = [], None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples), result
+
+def run_case(spec, ocr_service, latency, repeat):
+    from services.ocr_service import extract_lines
+    from ui.overlay_view import pil_to_pixmap
+
+    width, height, font_size, fill_ratio, columns = spec
+    image, truth = render_text_image(width, height, font_size=font_size, fill_ratio=fill_ratio, columns=columns, seed=width + font_size)
+    stages = {}
+
+    capture = CaptureService(ReplayGrabber(image))
+    region = {"top": 0, "left": 0, "width": width, "height": height}
+    stages["capture"], frame = timed(lambda: capture.grab(region), repeat)
+
+    data = None
+    if ocr_service is not None:
+        def ocr():
+            ocr_service.cache.clear()  # measure recognition, not cache hits
+            return ocr_service.perform_ocr(frame)
+        stages["ocr"], data = timed(ocr, repeat)
+    else:
+        stages["ocr"] = None
+    if data is None or data.empty:
+        data = truth_words(truth)
+
+    stages["grouping"], (texts, metadata) = timed(lambda: extract_lines(data), repeat)
+    # Fresh translator per run: no translation memory, every line goes to the stub
+    stages["translate"], translated = timed(
+        lambda: BatchTranslator(StubTranslatorProvider(latency=latency)).translate_lines(texts), repeat)
+
+    def draw():
+        overlay = frame.copy()
+        draw_translation_overlay(overlay, metadata, translated)
+        return overlay
+    stages["draw"], overlay = timed(draw, repeat)
+    stages["qimage"], _ = timed(lambda: pil_to_pixmap(overlay), repeat)
+    return {"size": [width, height], "font_size": font_size, "fill_ratio": fill_ratio, "columns": columns,
+            "lines": len(texts), "stages": stages}
+
+def git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True).stdout.strip()
+    except Exception:
+        return None
+
+def compare(current, baseline, tolerance):
+    """Prints per-stage deltas. Returns the list of (case, stage) that regressed beyond tolerance."""
+    regressions = []
+    print(f"\n{'case':>14} {'stage':>10} {'base ms':>9} {'now ms':>9} {'change':>8}")
+    for name, case in current["cases"].items():
+        base_case = baseline.get("cases", {}).get(name)
+        if not base_case:
+            continue
+        for stage in STAGES:
+            now, base = case["stages"].get(stage), base_case["stages"].get(stage)
+            if now is None or base is None:
+                continue
+            change = (now - base) / base if base else 0.0
+            # Ignore sub-millisecond noise
+            regressed = change > tolerance and now - base > 1.0
+            if regressed:
+                regressions.append((name, stage))
+            print(f"{name:>14} {stage:>10} {base:>9.1f} {now:>9.1f} {change:>+7.0%}{'  <-- regression' if regressed else ''}")
+    return regressions
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--cases", default=",".join(CASES), help="comma-separated subset of: " + ", ".join(CASES))
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--latency-ms", type=float, default=50.0, help="stub provider latency per request")
+    parser.add_argument("--output", help="write results as JSON")
+    parser.add_argument("--compare", help="baseline JSON to compare against (non-zero exit on regression)")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="allowed slowdown ratio per stage")
+    args = parser.parse_args()
+
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+    from PyQt6.QtWidgets import QApplication
+    app = QApplication.instance() or QApplication([])  # QPixmap needs an application
+
+    ocr_service = make_ocr_service()
+    results = {
+        "meta": {"commit": git_commit(), "python": sys.version.split()[0], "platform": platform.platform(),
+                 "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"), "repeat": args.repeat, "latency_ms": args.latency_ms},
+        "cases": {},
+    }
+    print(f"{'case':>14} {'lines':>6} " + " ".join(f"{stage:>9}" for stage in STAGES))
+    for name in args.cases.split(","):
+        case = run_case(CASES[name], ocr_service, args.latency_ms / 1000.0, args.repeat)
+        results["cases"][name] = case
+        cells = " ".join(f"{'-':>9}" if case["stages"][stage] is None else f"{case['stages'][stage]:>9.1f}" for stage in STAGES)
+        print(f"{name:>14} {case['lines']:>6} {cells}")
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+        print(f"\nResults written to {args.output}")
+
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            baseline = json.load(f)
+        regressions = compare(results, baseline, args.tolerance)
+        if regressions:
+            print(f"\n{len(regressions)} stage(s) regressed by more than {args.tolerance:.0%}")
+            sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+"""
+OCR time per megapixel and word recall with and without the preprocessing stage,
+on synthetic captures with tiny, normal and huge text. Requires the tesseract binary.
+
+Usage: python -m benchmarks.bench_preprocess [--size 1920x1080]
+"""
+import argparse
+import time
+
+import pytesseract
+
+from benchmarks.synthetic import render_text_image
+from services.ocr_result import OcrResult
+from services.preprocess import Preprocessor
+from utils import helpers as utils
+
+def recall(result, truth):
+    expected = [word.lower() for line in truth for word in line['text'].split()]
+    found = {}
+    for word in result.text.tolist():
+        found[word.lower()] = found.get(word.lower(), 0) + 1
+    hits = 0
+    for word in expected:
+        if found.get(word):
+            found[word] -= 1
+            hits += 1
+    return hits / max(1, len(expected))
+
+def ocr(image):
+    return OcrResult.from_columns(pytesseract.image_to_data(image, config='--psm 3', output_type=pytesseract.Output.DICT))
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--size", default="1920x1080")
+    args = parser.parse_args()
+
+    pytesseract.pytesseract.tesseract_cmd = utils.get_tesseract_cmd()
+    try:
+        pytesseract.get_tesseract_version()
+    except Exception as e:
+        raise SystemExit(f"Tesseract not available: {e}")
+
+    width, height = (int(v) for v in args.size.split("x"))
+    megapixels = width * height / 1e6
+    preprocessor = Preprocessor()
+    print(f"{'font':>5} {'raw s/MP':>9} {'raw recall':>11} {'prep s/MP':>10} {'prep recall':>12} {'scale':>6}")
+    for font_size in (9, 14, 18, 36, 72):
+        image, truth = render_text_image(width, height, font_size=font_size, seed=font_size)
+
+        start = time.perf_counter()
+        raw = ocr(image)
+        raw_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        processed, scale = preprocessor.process(image)
+        prepared = ocr(processed).scale(1.0 / scale)
+        prep_time = time.perf_counter() - start
+
+        print(f"{font_size:>5} {raw_time / megapixels:>9.2f} {recall(raw, truth):>11.1%} "
+              f"{prep_time / megapixels:>10.2f} {recall(prepared, truth):>12.1%} {scale:>6.2f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+"""
+Per-request latency of cold (constructed per capture) vs pooled (registry) translation providers.
+Runs fully offline against a local keep-alive HTTP stub server.
+
+Usage: python -m benchmarks.bench_provider_pool [--requests 50] [--delay-ms 0]
+"""
+import argparse
+import json
+import statistics
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from services.translator_service import GoogleTranslatorProvider, OpenAITranslatorProvider
+
+class StubHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # keep-alive, like the real endpoints
+    disable_nagle_algorithm = True
+    delay = 0.0
+
+    def _send(self, body, content_type):
+        time.sleep(self.delay)
+        data = body.encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def do_GET(self):
+        # Google "mobile" page shape parsed by deep_translator
+        self._send('<html><body><div class="result-container">translated</div></body></html>', "text/html")
+
+    def do_HEAD(self):
+        self.send_response(200)
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        self._send(json.dumps({
+            "id": "stub", "object": "chat.completion", "created": 0, "model": "stub",
+            "choices": [{"index": 0, "finish_reason": "stop", "message": {"role": "assistant", "content": "translated"}}],
+        }), "application/json")
+
+    def log_message(self, *args):
+        pass
+
+def measure(make_provider, pooled, n):
+    provider = make_provider() if pooled else None
+    samples = []
+    for _ in range(n):
+        start = time.perf_counter()
+        current = provider if pooled else make_provider()
+        current.translate("Hello world")  # raises TranslationError on failure
+        samples.append((time.perf_counter() - start) * 1000)
+        if not pooled:
+            current.close()
+    if provider:
+        provider.close()
+    samples.sort()
+    return {"mean_ms": statistics.mean(samples), "p50_ms": samples[len(samples) // 2], "p95_ms": samples[int(len(samples) * 0.95) - 1]}
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--requests", type=int, default=50)
+    parser.add_argument("--delay-ms", type=float, default=0.0, help="Simulated server processing time")
+    args = parser.parse_args()
+
+    StubHandler.delay = args.delay_ms / 1000
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StubHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base = f"http://127.0.0.1:{server.server_address[1]}"
+
+    providers = {
+        "google": lambda: GoogleTranslatorProvider(base_url=base + "/m"),
+        "openai": lambda: OpenAITranslatorProvider("stub-key", base_url=base + "/v1"),
+    }
+    for name, make_provider in providers.items():
+        for pooled in (False, True):
+            result = measure(make_provider, pooled, args.requests)
+            label = "pooled" if pooled else "cold"
+            print(f"{name:7s} {label:6s} mean={result['mean_ms']:.2f}ms p50={result['p50_ms']:.2f}ms p95={result['p95_ms']:.2f}ms")
+
+    server.shutdown()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+"""
+Overlay rendering time for 10, 100 and 1000 lines: the legacy per-line font loading
+versus the cached FontManager. Pass --font to use a real (e.g. CJK .ttc) font file.
+
+Usage: python -m benchmarks.bench_render [--font C:\\Windows\\Fonts\\msyh.ttc] [--repeat 3]
+"""
+import argparse
+import random
+import time
+
+from PIL import Image, ImageDraw, ImageFont
+
+from benchmarks.synthetic import random_line
+from services.drawing_service import draw_line_patches, draw_line_text
+from services.font_manager import FontManager
+from utils import helpers as utils
+
+def load_font(path, size):
+    return ImageFont.truetype(path, size) if path else ImageFont.load_default(size=size)
+
+def legacy_line(draw, metadata, text, font_path):
+    """The previous draw_line_text: one or two font loads per line, single proportional shrink."""
+    x_min, y_min, x_max, y_max = metadata['box']
+    font_size = max(12, int((y_max - y_min) * 0.9))
+    font = load_font(font_path, font_size)
+    text_bbox = draw.textbbox((0, 0), text, font=font)
+    text_w = text_bbox[2] - text_bbox[0]
+    if text_w > x_max - x_min > 0:
+        font_size = max(10, int(font_size * ((x_max - x_min) / text_w)))
+        font = load_font(font_path, font_size)
+    draw.text((x_min, y_min), text, fill="black", font=font)
+
+def make_lines(count, width, seed=0):
+    rng = random.Random(seed)
+    lines, translations = [], []
+    for i in range(count):
+        height = rng.choice((14, 16, 18, 22, 28))
+        y = (i * 32) % 4000
+        x = rng.randint(0, width // 2)
+        lines.append({'box': (x, y, x + rng.randint(120, width // 2), y + height)})
+        translations.append(random_line(rng, 3, 12))
+    return lines, translations
+
+def render(lines, translations, size, draw_text):
+    image = Image.new("RGB", size, "white")
+    draw = ImageDraw.Draw(image)
+    draw_line_patches(draw, lines)
+    start = time.perf_counter()
+    for metadata, text in zip(lines, translations):
+        draw_text(draw, metadata, text)
+    return time.perf_counter() - start
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--font", default=utils.get_font_path())
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    size = (1920, 4000)
+    print(f"font: {args.font or 'Pillow default (FreeType)'}")
+    print(f"{'lines':>6} {'legacy ms':>10} {'cached cold ms':>15} {'cached warm ms':>15} {'face loads':>11}")
+    for count in (10, 100, 1000):
+        lines, translations = make_lines(count, size[0], seed=count)
+        legacy = min(render(lines, translations, size, lambda d, m, t: legacy_line(d, m, t, args.font))
+                     for _ in range(args.repeat))
+
+        fonts = FontManager(font_path=args.font or "")  # "" = Pillow default, skips the path probe
+        cold = render(lines, translations, size, lambda d, m, t: draw_line_text(d, m, t, fonts))
+        warm = min(render(lines, translations, size, lambda d, m, t: draw_line_text(d, m, t, fonts))
+                   for _ in range(args.repeat))
+        print(f"{count:>6} {legacy * 1000:>10.1f} {cold * 1000:>15.1f} {warm * 1000:>15.1f} {fonts.stats['face_loads']:>11}")
+
+if __name__ == "__main__":
+    main()
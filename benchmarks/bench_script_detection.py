@@ -0,0 +1,106 @@
+"""
+OCR time and character accuracy per script: one pass with every language pack loaded at once
+(the naive fix for mixed-script users) vs the OSD pre-pass + only the detected language set.
+Requires the tesseract binary with osd, eng, jpn, kor, rus and chi_sim traineddata, and a font
+covering CJK/Cyrillic (--font, or a Noto CJK font found on the system).
+
+Usage: python -m benchmarks.bench_script_detection [--font NotoSansCJK-Regular.ttc] [--repeat 3]
+"""
+import argparse
+import difflib
+import os
+import statistics
+import time
+
+import pytesseract
+from PIL import Image, ImageDraw, ImageFont
+
+from services.ocr_result import OcrResult
+from services.script_detection import ScriptDetector, SCRIPT_LANGUAGES
+from utils import helpers as utils
+
+ALL_LANGUAGES = "eng+jpn+kor+rus+chi_sim"
+
+SAMPLES = {
+    "Latin": ["Quest log", "Continue the journey", "Save settings and exit", "The ancient temple lies beyond"],
+    "Japanese": ["クエストログ", "冒険を続ける", "設定を保存して終了", "古代の神殿は北の山の向こうにある"],
+    "Hangul": ["퀘스트 로그", "모험을 계속하다", "설정 저장 후 종료", "고대 신전은 북쪽 산 너머에 있다"],
+    "Cyrillic": ["Журнал заданий", "Продолжить путешествие", "Сохранить и выйти", "Древний храм лежит за горами"],
+    "Han": ["任务日志", "继续旅程", "保存设置并退出", "古老的神殿位于北方山脉之外"],
+}
+
+FONT_CANDIDATES = (
+    "/usr/share/fonts/opentype/noto/NotoSansCJK-Regular.ttc",
+    "/usr/share/fonts/noto-cjk/NotoSansCJK-Regular.ttc",
+    "/System/Library/Fonts/PingFang.ttc",
+    r"C:\Windows\Fonts\msyh.ttc",
+)
+
+def find_font(path):
+    for candidate in ((path,) if path else FONT_CANDIDATES):
+        if candidate and os.path.exists(candidate):
+            return candidate
+    return None
+
+def render(lines, font, font_size=28):
+    image = Image.new("RGB", (900, font_size * 2 * len(lines) + font_size), "white")
+    draw = ImageDraw.Draw(image)
+    for i, line in enumerate(lines):
+        draw.text((font_size, font_size + i * font_size * 2), line, fill="black", font=font)
+    return image
+
+def ocr(image, languages):
+    data = pytesseract.image_to_data(image, lang=languages, config='--psm 3', output_type=pytesseract.Output.DICT)
+    return OcrResult.from_columns(data)
+
+def accuracy(result, lines):
+    recognized = "".join(result.lines()[0]) if not result.empty else ""
+    expected = "".join(lines)
+    return difflib.SequenceMatcher(None, recognized.replace(" ", ""), expected.replace(" ", "")).ratio()
+
+def timed(fn, repeat):
+    samples, result = [], None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples), result
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--font", help="TTF/TTC covering CJK and Cyrillic")
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    pytesseract.pytesseract.tesseract_cmd = utils.get_tesseract_cmd()
+    try:
+        installed = set(pytesseract.get_languages(config=''))
+    except Exception as e:
+        raise SystemExit(f"Tesseract not available: {e}")
+    missing = {"osd", *ALL_LANGUAGES.split("+")} - installed
+    if missing:
+        raise SystemExit(f"Missing traineddata: {', '.join(sorted(missing))}")
+    font_path = find_font(args.font)
+    if font_path is None:
+        raise SystemExit("No CJK font found, pass --font")
+    font = ImageFont.truetype(font_path, 28)
+
+    detector = ScriptDetector(installed=installed)
+    print(f"{'script':>9} {'all ms':>8} {'all acc':>8} {'detect ms':>10} {'ocr ms':>8} {'acc':>6}  languages")
+    totals = {"all": 0.0, "detected": 0.0}
+    for script, lines in SAMPLES.items():
+        image = render(lines, font)
+        all_ms, all_result = timed(lambda: ocr(image, ALL_LANGUAGES), args.repeat)
+        detect_ms, languages = timed(lambda: detector.detect(image), args.repeat)
+        ocr_ms, result = timed(lambda: ocr(image, languages), args.repeat)
+        totals["all"] += all_ms
+        totals["detected"] += detect_ms + ocr_ms
+        expected = SCRIPT_LANGUAGES[script][0]
+        flag = "" if languages == expected else f"  (expected {expected})"
+        print(f"{script:>9} {all_ms:>8.0f} {accuracy(all_result, lines):>8.1%} {detect_ms:>10.0f} {ocr_ms:>8.0f} "
+              f"{accuracy(result, lines):>6.1%}  {languages}{flag}")
+    print(f"\nTotal: all languages {totals['all']:.0f} ms, detection + minimal set {totals['detected']:.0f} ms "
+          f"({totals['all'] / max(totals['detected'], 1e-9):.1f}x)")
+
+if __name__ == "__main__":
+    main()
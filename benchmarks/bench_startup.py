@@ -0,0 +1,103 @@
+"""
+Cold-start budget check: import time of the controller (parsed from -X importtime) and
+time from process launch until the capture overlay is shown / background services are ready.
+Exits non-zero when a budget is exceeded, so it can gate regressions.
+
+Usage: python -m benchmarks.bench_startup [--runs 5] [--import-budget-ms 300] [--overlay-budget-ms 1500]
+"""
+import argparse
+import os
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+OVERLAY_SCRIPT = """
+from core.app_controller import AppController
+controller = AppController()
+controller.start_capture()
+controller.app.processEvents()
+print("OVERLAY", flush=True)
+controller._wait_for_services()
+print("READY", flush=True)
+"""
+
+def child_env():
+    env = dict(os.environ)
+    env.setdefault("QT_QPA_PLATFORM", "offscreen")
+    return env
+
+def parse_importtime(stderr, module):
+    """Returns ({direct_child: cumulative_us}, total_us) for `module` from -X importtime output."""
+    pending = {}
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cum, raw_name = line[len("import time:"):].split("|")
+        if not cum.strip().isdigit():
+            continue
+        name = raw_name.strip()
+        depth = (len(raw_name) - len(raw_name.lstrip()) - 1) // 2
+        # Children are printed before their parent
+        if depth == 1:
+            pending[name] = int(cum)
+        elif depth == 0:
+            if name == module:
+                return pending, int(cum)
+            pending = {}
+    return {}, 0
+
+def measure_import(module):
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=ROOT, env=child_env(), capture_output=True, text=True, check=True
+    )
+    return parse_importtime(result.stderr, module)
+
+def measure_overlay():
+    start = time.perf_counter()
+    proc = subprocess.Popen([sys.executable, "-c", OVERLAY_SCRIPT], cwd=ROOT, env=child_env(),
+                            stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, text=True)
+    marks = {}
+    for line in proc.stdout:
+        marks[line.strip()] = (time.perf_counter() - start) * 1000
+    proc.wait()
+    return marks.get("OVERLAY"), marks.get("READY")
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--module", default="core.app_controller")
+    parser.add_argument("--import-budget-ms", type=float, default=300)
+    parser.add_argument("--overlay-budget-ms", type=float, default=1500)
+    args = parser.parse_args()
+
+    import_ms, breakdown = float("inf"), {}
+    for _ in range(args.runs):
+        cumulative, total_us = measure_import(args.module)
+        if total_us / 1000 < import_ms:
+            import_ms, breakdown = total_us / 1000, cumulative
+
+    top_level = sorted(breakdown.items(), key=lambda item: -item[1])[:8]
+    print(f"import {args.module}: {import_ms:.1f}ms (best of {args.runs})")
+    for name, us in top_level:
+        print(f"  {name:30s} {us / 1000:8.1f}ms")
+
+    overlay_runs = [measure_overlay() for _ in range(args.runs)]
+    overlay_ms = min(run[0] for run in overlay_runs if run[0] is not None)
+    ready_ms = min(run[1] for run in overlay_runs if run[1] is not None)
+    print(f"launch -> overlay shown: {overlay_ms:.1f}ms")
+    print(f"launch -> services ready: {ready_ms:.1f}ms (background)")
+
+    failed = False
+    if import_ms > args.import_budget_ms:
+        print(f"FAIL: import budget {args.import_budget_ms}ms exceeded")
+        failed = True
+    if overlay_ms > args.overlay_budget_ms:
+        print(f"FAIL: overlay budget {args.overlay_budget_ms}ms exceeded")
+        failed = True
+    sys.exit(1 if failed else 0)
+
+if __name__ == "__main__":
+    main()
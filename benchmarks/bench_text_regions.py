@@ -0,0 +1,103 @@
+"""
+Text-region pre-filter on synthetic game/video captures (mostly picture, a few text panels) and on a
+full text page: detection time, share of pixels left for OCR and ground-truth lines covered by a box.
+With the tesseract binary, also OCR time and word recall of one full-page pass vs the per-box passes.
+
+Captures are binarized like OCRService does, without resampling, so the ground truth stays in place.
+
+Usage: python -m benchmarks.bench_text_regions [--repeat 3] [--no-ocr]
+"""
+import argparse
+import statistics
+import time
+
+import pytesseract
+
+from benchmarks.synthetic import render_mixed_capture, render_text_image
+from services.ocr_result import OcrResult
+from services.preprocess import Preprocessor
+from services.text_regions import TextRegionDetector
+from services.tiled_ocr import TiledOCR
+from utils import helpers as utils
+
+SCENARIOS = [
+    ("mixed 1280x720", lambda: render_mixed_capture(1280, 720, font_size=14, seed=1)),
+    ("mixed 1920x1080", lambda: render_mixed_capture(1920, 1080, font_size=18, seed=2)),
+    ("mixed 3840x2160", lambda: render_mixed_capture(3840, 2160, font_size=30, seed=3)),
+    ("text + picture 1920x1080", lambda: render_text_image(1920, 1080, fill_ratio=0.3, seed=4)),
+    ("text page 1920x1080", lambda: render_text_image(1920, 1080, columns=2, seed=5)),
+]
+
+def recall(result, truth):
+    expected = [word.lower() for line in truth for word in line['text'].split()]
+    found = {}
+    for word in result.text.tolist():
+        found[word.lower()] = found.get(word.lower(), 0) + 1
+    hits = 0
+    for word in expected:
+        if found.get(word):
+            found[word] -= 1
+            hits += 1
+    return hits / max(1, len(expected))
+
+def covered(regions, truth):
+    """Share of ground-truth lines that lie entirely inside one proposed box."""
+    if regions is None:
+        return 1.0
+    inside = sum(any(x0 <= l['box'][0] and y0 <= l['box'][1] and x1 >= l['box'][2] and y1 >= l['box'][3]
+                     for (x0, y0, x1, y1), _ in regions) for l in truth)
+    return inside / max(1, len(truth))
+
+def timed(fn, repeat):
+    samples, result = [], None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples), result
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--no-ocr", action="store_true", help="detection only (no tesseract needed)")
+    args = parser.parse_args()
+
+    run_ocr = not args.no_ocr
+    if run_ocr:
+        pytesseract.pytesseract.tesseract_cmd = utils.get_tesseract_cmd()
+        try:
+            pytesseract.get_tesseract_version()
+        except Exception as e:
+            print(f"Tesseract not available ({e}): detection figures only\n")
+            run_ocr = False
+
+    preprocessor = Preprocessor(min_scale=1.0, max_scale=1.0)
+    detector = TextRegionDetector()
+    tiled = TiledOCR(workers=1)
+    header = f"{'capture':>25} {'detect ms':>10} {'boxes':>6} {'pixels':>7} {'lines in':>9}"
+    if run_ocr:
+        header += f" {'full ms':>8} {'recall':>7} {'boxes ms':>9} {'recall':>7} {'speedup':>8}"
+    print(header)
+    for name, render in SCENARIOS:
+        image, truth = render()
+        processed, _ = preprocessor.process(image)
+        detect_ms, regions = timed(lambda: detector.detect(processed), args.repeat)
+        width, height = processed.size
+        share = 1.0 if regions is None else sum((x1 - x0) * (y1 - y0) for (x0, y0, x1, y1), _ in regions) / (width * height)
+        row = (f"{name:>25} {detect_ms:>10.1f} {'full' if regions is None else len(regions):>6} "
+               f"{share:>7.1%} {covered(regions, truth):>9.1%}")
+        if run_ocr:
+            full_ms, full = timed(lambda: OcrResult.from_columns(pytesseract.image_to_data(
+                processed, config='--psm 3', output_type=pytesseract.Output.DICT)), args.repeat)
+            if regions is None:
+                boxes_ms, boxes = full_ms, full
+            else:
+                boxes_ms, boxes = timed(lambda: tiled.perform_ocr_regions(
+                    processed, regions, tesseract_cmd=pytesseract.pytesseract.tesseract_cmd), args.repeat)
+                boxes_ms += detect_ms
+            row += (f" {full_ms:>8.0f} {recall(full, truth):>7.1%} {boxes_ms:>9.0f} {recall(boxes, truth):>7.1%}"
+                    f" {full_ms / max(boxes_ms, 1e-9):>7.1f}x")
+        print(row)
+
+if __name__ == "__main__":
+    main()
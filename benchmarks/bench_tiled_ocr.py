@@ -0,0 +1,53 @@
+"""
+Tiled parallel OCR scaling: throughput from 1 to N process-pool workers on a synthetic
+full-screen capture, compared with a single Tesseract pass. Requires the tesseract binary.
+
+Usage: python -m benchmarks.bench_tiled_ocr [--size 3840x2160] [--max-workers N]
+"""
+import argparse
+import os
+import time
+
+import pytesseract
+
+from benchmarks.synthetic import render_text_image
+from services.ocr_result import OcrResult
+from services.tiled_ocr import TiledOCR
+from utils import helpers as utils
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--size", default="3840x2160")
+    parser.add_argument("--max-workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--font-size", type=int, default=18)
+    args = parser.parse_args()
+
+    pytesseract.pytesseract.tesseract_cmd = utils.get_tesseract_cmd()
+    try:
+        pytesseract.get_tesseract_version()
+    except Exception as e:
+        raise SystemExit(f"Tesseract not available: {e}")
+
+    width, height = (int(v) for v in args.size.split("x"))
+    image, truth = render_text_image(width, height, font_size=args.font_size, columns=2)
+    megapixels = width * height / 1e6
+    print(f"{args.size} ({megapixels:.1f} MP), {len(truth)} ground-truth lines")
+
+    start = time.perf_counter()
+    single = OcrResult.from_columns(pytesseract.image_to_data(image, config='--psm 3', output_type=pytesseract.Output.DICT))
+    baseline = time.perf_counter() - start
+    print(f"single pass      {baseline:7.2f}s  {megapixels / baseline:6.2f} MP/s  words={len(single)}")
+
+    workers = 1
+    while workers <= args.max_workers:
+        tiled = TiledOCR(workers=workers)
+        list(tiled._get_pool().map(abs, range(workers * 4)))  # spawn the pool outside the timing
+        start = time.perf_counter()
+        result = tiled.perform_ocr(image, tesseract_cmd=pytesseract.pytesseract.tesseract_cmd)
+        elapsed = time.perf_counter() - start
+        tiled.close()
+        print(f"tiled {workers:2d} workers {elapsed:7.2f}s  {megapixels / elapsed:6.2f} MP/s  words={len(result)}  speedup={baseline / elapsed:4.1f}x")
+        workers *= 2
+
+if __name__ == "__main__":
+    main()
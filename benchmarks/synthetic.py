@@ -0,0 +1,86 @@
+"""
+Deterministic synthetic "screenshots" of known text for benchmarks.
+"""
+import random
+from PIL import Image, ImageDraw, ImageFont
+
+VOCABULARY = (
+    "quest log inventory settings options continue save load exit player health mana level "
+    "attack defense skill map journal party equipment weapon armor potion gold experience "
+    "dialogue choose your path the ancient temple lies beyond northern mountains return "
+    "before nightfall merchant offers rare items for sale accept decline"
+).split()
+
+def random_line(rng, min_words=3, max_words=9):
+    return " ".join(rng.choice(VOCABULARY) for _ in range(rng.randint(min_words, max_words))).capitalize()
+
+def render_text_image(width, height, font_size=18, line_spacing=1.6, columns=1, fill_ratio=1.0,
+                      seed=0, background=(255, 255, 255), color=(0, 0, 0)):
+    """
+    Renders lines of random vocabulary text.
+    fill_ratio < 1 leaves the remainder of the image as text-free "picture" noise at the bottom.
+    Returns (image, lines) where lines is [{'text', 'box'}] ground truth in image coordinates.
+    """
+    rng = random.Random(seed)
+    image = Image.new("RGB", (width, height), background)
+    draw = ImageDraw.Draw(image)
+    font = ImageFont.load_default(size=font_size)
+
+    text_height = int(height * fill_ratio)
+    column_width = width // columns
+    step = int(font_size * line_spacing)
+    lines = []
+    for column in range(columns):
+        x = column * column_width + font_size
+        for y in range(font_size, text_height - step, step):
+            text = random_line(rng)
+            while draw.textlength(text, font=font) > column_width - 2 * font_size and " " in text:
+                text = text.rsplit(" ", 1)[0]
+            draw.text((x, y), text, fill=color, font=font)
+            lines.append({'text': text, 'box': draw.textbbox((x, y), text, font=font)})
+
+    if fill_ratio < 1.0:
+        # Smooth gradient "photo" area: no text, but not empty either
+        for y in range(text_height, height, 4):
+            shade = 60 + int(120 * (y - text_height) / max(1, height - text_height))
+            draw.rectangle([0, y, width, y + 3], fill=(shade, shade // 2 + 40, 200 - shade // 2))
+    return image, lines
+
+def render_mixed_capture(width, height, font_size=18, seed=0):
+    """
+    A game/video style capture: textured "scene" everywhere, a dialogue box at the bottom, a quest
+    log panel on the right and a small tooltip, i.e. mostly non-text pixels.
+    Returns (image, lines) like render_text_image.
+    """
+    rng = random.Random(seed)
+    image = Image.new("RGB", (width, height))
+    draw = ImageDraw.Draw(image)
+    font = ImageFont.load_default(size=font_size)
+    # Scene: soft vertical gradient with large blurry shapes
+    for y in range(0, height, 4):
+        shade = 40 + int(140 * y / height)
+        draw.rectangle([0, y, width, y + 3], fill=(shade // 2, shade, 90 + shade // 3))
+    for _ in range(12):
+        x, y, r = rng.randrange(width), rng.randrange(height), rng.randint(height // 20, height // 6)
+        tone = rng.randint(30, 220)
+        draw.ellipse([x - r, y - r, x + r, y + r], fill=(tone, tone // 2 + 60, 255 - tone))
+
+    lines = []
+    step = int(font_size * 1.6)
+    panels = (
+        ((width // 8, height * 3 // 4, width * 7 // 8, height - height // 20), (20, 20, 30), (240, 240, 240), 3),
+        ((width * 3 // 4, height // 10, width - width // 40, height // 2), (235, 225, 200), (40, 30, 20), 8),
+        ((width // 10, height // 6, width // 3, height // 6 + 2 * step + font_size), (250, 250, 210), (0, 0, 0), 2),
+    )
+    for (x0, y0, x1, y1), panel, color, count in panels:
+        draw.rectangle([x0, y0, x1, y1], fill=panel)
+        for i in range(count):
+            y = y0 + font_size // 2 + i * step
+            if y + step > y1:
+                break
+            text = random_line(rng)
+            while draw.textlength(text, font=font) > x1 - x0 - 2 * font_size and " " in text:
+                text = text.rsplit(" ", 1)[0]
+            draw.text((x0 + font_size, y), text, fill=color, font=font)
+            lines.append({'text': text, 'box': draw.textbbox((x0 + font_size, y), text, font=font)})
+    return image, lines
@@ -1,35 +1,110 @@
 import threading
 import sys
+import os
+import time
+from contextlib import nullcontext
 from PyQt6.QtWidgets import QApplication, QSystemTrayIcon, QMenu
 from PyQt6.QtGui import QIcon, QAction
-from PyQt6.QtCore import pyqtSignal, QObject
+from PyQt6.QtCore import pyqtSignal, QObject, QRect, QTimer
 
 from ui.result_window import ResultWindow
 from ui.capture_overlay import CaptureOverlay
-from services.ocr_service import OCRService
-from services.translator_service import TranslatorFactory
-from services.drawing_service import draw_translation_overlay
+from core.scheduler import PipelineScheduler, JobCancelled
+from core.pipeline import StagedPipeline, PipelineRun, capture_stages
+from services.base_translator import TranslationError
+from services.capture_service import CaptureService
 from utils import helpers as utils
-from PIL import ImageDraw, ImageFont
+from utils.async_runtime import runtime
+from utils.tracing import tracer, profile_run
+
+# Minimum seconds between progressive overlay repaints while translations stream in
+PROGRESSIVE_UPDATE_INTERVAL = 0.1
+
+# Delay before re-grabbing a region the result window had to be hidden from (compositor repaint)
+RECAPTURE_SETTLE_MS = 150
+
+# Heavy modules (OCR, providers, NumPy, drawing) are imported in _prepare_services / at first use,
+# so the capture overlay can appear before they finish loading.
 
 class AppController(QObject):
-    update_ui_signal = pyqtSignal(str, str, object)  # (original_text, translated_text, image)
+    update_ui_signal = pyqtSignal(str, str, object)  # (original_text, translated_text, scene or image)
+    watch_update_signal = pyqtSignal(str, str, object)  # same, from RegionWatcher: never steals focus
+    result_signal = pyqtSignal(int, str, str, object)  # (generation, original_text, translated_text, scene or image)
+    status_signal = pyqtSignal(str)
+    latency_signal = pyqtSignal(str)
+    history_signal = pyqtSignal(int, int)  # (position of the recorded capture, history length)
 
     def __init__(self):
         super().__init__()
         self.app = QApplication(sys.argv)
         self.app.setQuitOnLastWindowClosed(False)
         
-        self.ocr_service = OCRService()
+        # Built in the background by _prepare_services while the user draws the first selection
+        self.ocr_service = None
+        self.translation_memory = None
+        self.history = None
+        self._services_ready = threading.Event()
+        self._services_thread = None
+        # One grabber for the whole session (selection, re-capture and watch mode)
+        self.capture_service = CaptureService()
         self.result_window = ResultWindow()
         
         # Connect UI signals
         self.result_window.capture_requested.connect(self.start_capture)
+        self.result_window.watch_requested.connect(self.toggle_watch)
+        self.result_window.recapture_requested.connect(self.recapture_last_region)
         self.result_window.provider_changed.connect(self.trigger_retranslate)
+        self.result_window.font_changed.connect(self.trigger_rerender)
+        self.result_window.history_requested.connect(self.show_history)
+        self.result_window.save_layout_requested.connect(self.save_layout)
+        self.result_window.layout_capture_requested.connect(self.capture_layout)
         self.update_ui_signal.connect(self.result_window.update_display)
+        self.watch_update_signal.connect(self.result_window.show_watch_update)
+        self.result_signal.connect(self._on_result)
+        self.status_signal.connect(self.result_window.set_status)
+        self.latency_signal.connect(self.result_window.set_latency)
+        self.history_signal.connect(self._on_history)
         
         self._setup_tray()
         self.last_image = None
+        self.pipeline = None
+        self.last_metrics = None
+        # History position shown in the window, and the (pipeline, position) whose reruns replace that entry
+        self.history_cursor = None
+        self._recorded = (None, None)
+        self.profile_next = False
+        self.watcher = None
+        # Capture / retranslate jobs: bounded concurrency, newest request wins
+        self.scheduler = PipelineScheduler(max_workers=2)
+
+    def _prepare_services(self):
+        """Imports the pipeline modules, builds OCR (probes Windows OCR) and pre-warms the provider."""
+        try:
+            from services.ocr_service import OCRService
+            from services.translation_memory import TranslationMemory
+            from services.translator_service import registry as provider_registry
+            from services.capture_history import CaptureHistory
+            import services.drawing_service  # noqa: F401 (PIL font machinery)
+
+            self.ocr_service = OCRService(strategy=utils.get_ocr_strategy())
+            self.translation_memory = TranslationMemory(os.path.join(utils.get_cache_dir(), "translation_memory.sqlite3"))
+            self.history = CaptureHistory(utils.get_history_budget(), os.path.join(utils.get_cache_dir(), "history"))
+        finally:
+            self._services_ready.set()
+
+        # Pre-warm the selected provider's connection while the user is still selecting an area
+        provider_registry.warm_up(self.result_window.provider_combo.currentText())
+
+    def _start_services(self):
+        if self._services_thread is None:
+            self._services_thread = threading.Thread(target=self._prepare_services, daemon=True)
+            self._services_thread.start()
+
+    def _wait_for_services(self):
+        self._start_services()
+        self._services_ready.wait()
+        if self.ocr_service is None:
+            raise RuntimeError("OCR service failed to initialize")
 
     def _setup_tray(self):
         self.tray_icon = QSystemTrayIcon()
@@ -38,93 +113,350 @@ class AppController(QObject):
         tray_menu = QMenu()
         capture_action = QAction("Capture Screen", self.tray_icon)
         capture_action.triggered.connect(self.start_capture)
+
+        recapture_action = QAction("Re-capture Last Region", self.tray_icon)
+        recapture_action.triggered.connect(self.recapture_last_region)
+
+        layout_action = QAction("Capture Saved Layout", self.tray_icon)
+        layout_action.triggered.connect(self.capture_layout)
+
+        watch_action = QAction("Watch Region", self.tray_icon)
+        watch_action.triggered.connect(self.toggle_watch)
         
+        profile_action = QAction("Profile Next Capture", self.tray_icon)
+        profile_action.triggered.connect(self.profile_next_capture)
+
+        trace_action = QAction("Export Trace", self.tray_icon)
+        trace_action.triggered.connect(self.export_trace)
+
         quit_action = QAction("Quit", self.tray_icon)
         quit_action.triggered.connect(self.app.quit)
         
         tray_menu.addAction(capture_action)
+        tray_menu.addAction(recapture_action)
+        tray_menu.addAction(layout_action)
+        tray_menu.addAction(watch_action)
+        tray_menu.addSeparator()
+        tray_menu.addAction(profile_action)
+        tray_menu.addAction(trace_action)
         tray_menu.addSeparator()
         tray_menu.addAction(quit_action)
         
         self.tray_icon.setContextMenu(tray_menu)
         self.tray_icon.show()
 
+    def profile_next_capture(self):
+        """cProfile + tracemalloc around the next pipeline run (written to the cache dir)."""
+        self.profile_next = True
+        self.result_window.set_status("Profiling the next capture...")
+
+    def export_trace(self):
+        path = os.path.join(utils.get_cache_dir(), "traces", time.strftime("trace-%Y%m%d-%H%M%S.json"))
+        try:
+            tracer.export_chrome_trace(path)
+        except OSError as e:
+            print(f"Trace Error: {e}")
+            self.result_window.set_status(f"Cannot export the trace: {e}")
+            self.tray_icon.showMessage("Trace export failed", str(e))
+            return
+        print(f"Trace written to {path}")
+        self.tray_icon.showMessage("Trace exported", path)
+
     def start_capture(self):
+        self.stop_watch()
         self.result_window.hide()
-        self.overlay_window = CaptureOverlay()
+        self.overlay_window = CaptureOverlay(grab=self.capture_service.grab, allow_multiple=True)
         self.overlay_window.capture_complete.connect(self.handle_capture)
+        self.overlay_window.regions_selected.connect(self._recapture)
         self.overlay_window.capture_cancelled.connect(self.result_window.show)
         self.overlay_window.show()
 
-    def handle_capture(self, image):
+    def handle_capture(self, image, regions=None):
+        """Processes a new capture; regions are the region boxes when it is a multi-region grab."""
         self.last_image = image
+        # New capture, new artifacts: every stage runs once, later provider/font changes reuse what they can
+        self.pipeline = self._new_pipeline(image, regions)
         self.result_window.show()
-        self.result_window.image_label.setText("Processing...")
+        self.result_window.overlay_view.set_message("Processing...")
         self.trigger_retranslate()
 
+    def _new_pipeline(self, image, regions=None):
+        # regions is kept in the params (no stage reads it) so the history can record it
+        pipeline = StagedPipeline(capture_stages(lambda: self.ocr_service, self._get_translator, regions), regions=regions)
+        pipeline.set_input("capture", image)
+        return pipeline
+
+    def show_history(self, step):
+        """Re-displays an earlier (or later) capture of the session as it was recorded: no OCR, no translation."""
+        if self.history is None or not len(self.history) or self.history_cursor is None:
+            return
+        position = min(max(self.history_cursor + step, 0), len(self.history) - 1)
+        entry = self.history.get(position)
+        if entry is None:
+            self.result_window.set_status(f"Capture {position + 1} is no longer in the history")
+            return
+        self.history_cursor = position
+        # A provider or font change now applies to this capture (its OCR is usually still cached)
+        self.pipeline = self._new_pipeline(entry.scene.image, entry.regions)
+        self._recorded = (self.pipeline, position)
+        self.result_window.update_display(entry.original_text, entry.translated_text, entry.scene)
+        self.result_window.set_history(position, len(self.history))
+        self.result_window.set_status(time.strftime("Captured %H:%M:%S", time.localtime(entry.timestamp)))
+
+    def _record_history(self, pipeline, original_texts, scene):
+        """Adds a finished capture to the history; reruns of the same pipeline replace its entry."""
+        from services.capture_history import HistoryEntry
+
+        entry = HistoryEntry(scene, original_texts, regions=pipeline.params.get("regions"))
+        recorded, position = self._recorded
+        if recorded is pipeline:
+            self.history.replace(position, entry)
+        else:
+            position = self.history.add(entry)
+            self._recorded = (pipeline, position)
+        self.history_signal.emit(position, len(self.history))
+
+    def _on_history(self, position, count):
+        self.history_cursor = position
+        self.result_window.set_history(position, count)
+
+    def recapture_last_region(self):
+        """Grabs the previously selected region (or region set) again, without showing the selection overlay."""
+        regions = self.capture_service.last_regions
+        if not regions and self.capture_service.last_region:
+            regions = [self.capture_service.last_region]
+        if not regions:
+            self.start_capture()
+            return
+        self.capture_regions(regions)
+
+    def capture_layout(self):
+        """Captures the saved region layout in one go."""
+        from services.region_layout import load_layout
+
+        try:
+            regions = load_layout(utils.get_layout_path())
+        except (OSError, ValueError) as e:
+            print(f"Layout Error: {e}")
+            self.result_window.set_status("No saved layout: Shift+drag several regions, then Save Regions as Layout")
+            self.result_window.show()
+            return
+        self.capture_regions(regions)
+
+    def save_layout(self):
+        from services.region_layout import save_layout
+
+        regions = self.capture_service.last_regions
+        if not regions and self.capture_service.last_region:
+            regions = [self.capture_service.last_region]
+        if not regions:
+            self.result_window.set_status("Nothing captured yet")
+            return
+        path = utils.get_layout_path()
+        try:
+            save_layout(path, regions)
+        except OSError as e:
+            print(f"Layout Error: {e}")
+            self.result_window.set_status(f"Cannot save the layout: {e}")
+            return
+        self.result_window.set_status(f"Layout saved ({len(regions)} regions)")
+        print(f"Layout written to {path}")
+
+    def capture_regions(self, regions):
+        from services.region_layout import bounding_region
+
+        self.stop_watch()
+        bounds = bounding_region(regions)
+        region_rect = QRect(bounds["left"], bounds["top"], bounds["width"], bounds["height"])
+        if self.result_window.isVisible() and self.result_window.frameGeometry().intersects(region_rect):
+            # The result window covers part of the regions: hide it and let the compositor repaint first
+            self.result_window.hide()
+            QTimer.singleShot(RECAPTURE_SETTLE_MS, lambda: self._recapture(regions))
+        else:
+            self._recapture(regions)
+
+    def _recapture(self, regions):
+        """One grab for any number of regions; several regions are OCRed separately and translated together."""
+        try:
+            if len(regions) == 1:
+                image, boxes = self.capture_service.grab(regions[0]), None
+            else:
+                image, boxes = self.capture_service.grab_regions(regions)
+        except Exception as e:
+            print(f"Capture Error: {e}")
+            self.result_window.show()
+            return
+        print(f"Grab latency: {self.capture_service.latency()}")
+        self.handle_capture(image, boxes)
+
+    def toggle_watch(self):
+        if self.watcher and self.watcher.is_running:
+            self.stop_watch()
+            return
+        self.result_window.hide()
+        self.overlay_window = CaptureOverlay(grab=self.capture_service.grab)
+        self.overlay_window.region_selected.connect(self.start_watch)
+        self.overlay_window.capture_cancelled.connect(self.result_window.show)
+        self.overlay_window.show()
+
+    def start_watch(self, monitor):
+        from core.region_watcher import RegionWatcher
+
+        self.stop_watch()
+        self._wait_for_services()
+        self.watcher = RegionWatcher(
+            monitor, self.ocr_service, self._get_translator,
+            on_update=self.watch_update_signal.emit, on_status=self.status_signal.emit,
+            capture=self.capture_service
+        )
+        self.result_window.set_watching(True)
+        # The window stays on top: over the watched region it would be grabbed, diffed and OCRed itself
+        watched = QRect(monitor["left"], monitor["top"], monitor["width"], monitor["height"])
+        if not self.result_window.move_clear_of(watched):
+            print("Watch Warning: no room beside the watched region; the result window may be captured with it")
+        self.result_window.show()
+        self.watcher.start()
+
+    def stop_watch(self):
+        if self.watcher:
+            self.watcher.stop()
+            self.watcher = None
+            self.result_window.set_watching(False)
+
+    def _get_translator(self, provider=None):
+        from services.translator_service import TranslatorFactory
+        from services.translation_memory import CachedTranslator
+        from services.batch_translator import BatchTranslator
+
+        provider = provider or self.result_window.provider_combo.currentText()
+        # Cache misses only are sent upstream, as concurrent marker-aligned chunks
+        return CachedTranslator(BatchTranslator(TranslatorFactory.get_translator(provider)), self.translation_memory)
+
+    def _pipeline_params(self):
+        return {
+            "provider": self.result_window.provider_combo.currentText(),
+            "font": self.result_window.font_combo.currentFont().family(),
+        }
+
     def trigger_retranslate(self):
-        if self.last_image:
-            threading.Thread(target=self.process_image_threaded, args=(self.last_image,), daemon=True).start()
+        if self.watcher and self.watcher.is_running:
+            self.watcher.refresh()
+            return
+        self.trigger_rerender()
+
+    def trigger_rerender(self):
+        """Runs the current capture's pipeline with the UI's provider and font; unchanged stages are reused."""
+        if self.pipeline is not None:
+            pipeline, params = self.pipeline, self._pipeline_params()
+            self.scheduler.submit(lambda token: self.process_image_threaded(pipeline, params, token))
+
+    def _emit_result(self, token, original_text, translated_text, image):
+        if token is None:
+            self.update_ui_signal.emit(original_text, translated_text, image)
+        elif not token.cancelled:
+            self.result_signal.emit(token.generation, original_text, translated_text, image)
+
+    def _on_result(self, generation, original_text, translated_text, image):
+        # Runs on the UI thread: results of superseded jobs never reach the window
+        if self.scheduler.is_current(generation):
+            self.result_window.update_display(original_text, translated_text, image)
 
-    def process_image_threaded(self, image):
+    def process_image_threaded(self, pipeline, params, token=None):
+        capture_id = tracer.new_capture_id()
+        profiling, self.profile_next = self.profile_next, False
+        prefix = os.path.join(utils.get_cache_dir(), "profiles", f"capture-{capture_id}-{time.strftime('%Y%m%d-%H%M%S')}")
         try:
-            # Perform OCR
-            data = self.ocr_service.perform_ocr(image)
-            if data is None or data.empty:
-                self.update_ui_signal.emit("No text found", "", image)
-                return
-
-            # Get Translator
-            provider = self.result_window.provider_combo.currentText()
-            translator = TranslatorFactory.get_translator(provider)
-            
-            # Prepare overlay image
-            translated_img = image.copy()
-
-            
-            # 1. Collect lines and Prepare translation groups
-            groups = data.groupby(['block_num', 'line_num'])
-            lines_metadata = []
-            original_texts = []
-            
-            for _, group in groups:
-                line_text = " ".join(group.text.astype(str)).strip()
-                if not line_text: continue
-                
-                original_texts.append(line_text)
-                
-                # Calculate bounding box for this line
-                x_min, y_min = group.left.min(), group.top.min()
-                x_max, y_max = (group.left + group.width).max(), (group.top + group.height).max()
-                lines_metadata.append({
-                    'original': line_text,
-                    'box': (x_min, y_min, x_max, y_max)
-                })
-
-            if not original_texts:
-                self.update_ui_signal.emit("No translatable text found", "", image)
-                return
-
-            # 2. BATCH TRANSLATION: Join lines for better context and speed
-            full_original_block = "\n".join(original_texts)
-            translated_block = translator.translate(full_original_block) or ""
-            translated_lines = translated_block.split("\n")
-            
-            # Ensure we have a match for each line; pad if necessary
-            if len(translated_lines) < len(original_texts):
-                translated_lines.extend([""] * (len(original_texts) - len(translated_lines)))
-
-            # 3. Draw Overlay
-            draw_translation_overlay(translated_img, lines_metadata, translated_lines)
-            
-            # Prepare translated text for UI display (copyable)
-            translated_block = "\n".join(translated_lines)
-
-            self.update_ui_signal.emit("\n".join(original_texts), translated_block, translated_img)
+            with profile_run(prefix) if profiling else nullcontext():
+                self._process_image(pipeline, params, token, capture_id)
+            if profiling:
+                print(f"Profile written to {prefix}.prof")
+        except JobCancelled:
+            raise
         except Exception as e:
             print(f"Controller Error: {e}")
-            self.update_ui_signal.emit(f"Error: {e}", "", None)
+            self._emit_result(token, f"Error: {e}", "", None)
+
+    def _process_image(self, pipeline, params, token, capture_id):
+        started = time.perf_counter_ns()
+        with tracer.span("wait_services", capture_id):
+            self._wait_for_services()
+        from services.drawing_service import OverlayScene
+
+        # Only stages whose inputs changed are recomputed: a provider switch reruns translate + render,
+        # a font change render alone (core.pipeline)
+        pipeline.set_params(**params)
+        reused = [name for name in ("ocr", "layout", "translate") if pipeline.is_fresh(name)]
+        image = pipeline.get("capture")
+
+        data = pipeline.get("ocr", PipelineRun(token, capture_id))
+        if data is None or data.empty:
+            self._emit_result(token, "No text found", "", image)
+            return
+        original_texts, lines_metadata = pipeline.get("layout", PipelineRun(token, capture_id))
+        if not original_texts:
+            self._emit_result(token, "No translatable text found", "", image)
+            return
+        if token: token.raise_if_cancelled()
+
+        # The screenshot itself is never copied or drawn on: each update is an OverlayScene
+        # (image + boxes + translations so far) that the window paints as a vector layer
+        original_block = "\n".join(original_texts)
+
+        # STREAMED TRANSLATION: cached lines first, then each provider chunk (or line) as soon as it completes
+        partial = [""] * len(original_texts)
+        first_line = None
+        last_emit = 0.0
+
+        def on_progress(stage, translated_lines):
+            nonlocal first_line, last_emit
+            partial[:] = translated_lines
+            now = time.perf_counter_ns()
+            if first_line is None:
+                first_line = now
+                tracer.record("first_line", started, now, capture_id)
+            # Throttle partial repaints; each snapshot only copies the list of strings
+            if (now - last_emit) / 1e9 >= PROGRESSIVE_UPDATE_INTERVAL:
+                last_emit = now
+                scene = OverlayScene(image, lines_metadata, list(translated_lines), params.get("font"))
+                self._emit_result(token, original_block, "\n".join(translated_lines), scene)
+
+        try:
+            scene = pipeline.get("render", PipelineRun(token, capture_id, on_progress))
+        except TranslationError as e:
+            # Keep whatever was translated (cached lines, finished chunks) on screen and report the failure
+            print(f"Translation Error ({e.provider}): {e}")
+            if token: token.raise_if_cancelled()
+            self._emit_result(token, original_block, "\n".join(partial), OverlayScene(image, lines_metadata, partial, params.get("font")))
+            self.status_signal.emit(f"Translation failed ({e.provider}): {e}")
+            return
+        print(f"Translation memory: {self.translation_memory.stats}")
+        if token: token.raise_if_cancelled()
+
+        # Final overlay with every line; translated text for UI display (copyable)
+        finished = time.perf_counter_ns()
+        tracer.record("total", started, finished, capture_id, lines=len(original_texts))
+        first_line_ms = (first_line - started) / 1e6 if first_line is not None else None
+        total_ms = (finished - started) / 1e6
+        self.last_metrics = {"capture_id": capture_id, "first_line_ms": first_line_ms, "total_ms": total_ms,
+                             "lines": len(original_texts), "reused": reused}
+        print(f"Capture metrics: {self.last_metrics}")
+        self._emit_result(token, original_block, "\n".join(scene.translated_texts), scene)
+        self._record_history(pipeline, original_texts, scene)
+        status = f"First line {first_line_ms:.0f} ms · total {total_ms:.0f} ms" if first_line_ms is not None else f"Total {total_ms:.0f} ms"
+        if reused:
+            status += f" (reused {', '.join(reused)})"
+        self.status_signal.emit(status)
+        provider = params.get("provider")
+        self.latency_signal.emit(tracer.summary(
+            ["capture", "ocr", f"request:{provider}", f"translate:{provider}", "first_line", "total", "loop_lag"]
+        ))
 
     def run(self):
         self.start_capture()
-        return self.app.exec()
+        self._start_services()
+        try:
+            return self.app.exec()
+        finally:
+            if self.history is not None:
+                self.history.close()
+            runtime.close()
@@ -0,0 +1,272 @@
+"""
+Headless OCR -> translate -> draw pipeline for directories of screenshots or extracted video frames.
+
+Stages, connected by bounded queues so memory stays flat on arbitrarily large inputs:
+  feeder thread -> OCR worker processes -> translation threads (main process) -> render worker processes
+Each processed image is written as an overlay image plus a JSON sidecar with the lines, boxes and translations.
+Qt is never imported.
+"""
+import argparse
+import json
+import multiprocessing
+import os
+import queue
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+from PIL import Image
+
+from services.base_translator import TranslationError
+from services.script_detection import detect_text_language
+from utils import helpers as utils
+
+IMAGE_EXTENSIONS = ('.png', '.jpg', '.jpeg', '.bmp', '.webp', '.tif', '.tiff')
+
+# How often the parent checks that the worker processes it waits on are still alive
+POLL_SECONDS = 1.0
+
+def iter_inputs(paths):
+    """Yields (path, output name) for every image file given directly or found under a directory, in sorted order."""
+    for path in paths:
+        if os.path.isdir(path):
+            for root, dirs, files in os.walk(path):
+                dirs.sort()
+                for name in sorted(files):
+                    if name.lower().endswith(IMAGE_EXTENSIONS):
+                        full = os.path.join(root, name)
+                        yield full, os.path.relpath(full, path)
+        elif path.lower().endswith(IMAGE_EXTENSIONS):
+            yield path, os.path.basename(path)
+
+def default_ocr_factory(strategy='auto'):
+    from services.ocr_service import OCRService
+    from services.tiled_ocr import TiledOCR
+
+    # Parallelism comes from the worker processes: no nested tile pool inside each one
+    return OCRService(strategy=strategy, tiled_ocr=TiledOCR(workers=1))
+
+def default_translator(provider):
+    from services.translator_service import registry
+    from services.translation_memory import TranslationMemory, CachedTranslator
+    from services.batch_translator import BatchTranslator
+
+    # Same translation memory as the desktop app: repeated UI strings across frames are translated once
+    memory = TranslationMemory(os.path.join(utils.get_cache_dir(), "translation_memory.sqlite3"))
+    return CachedTranslator(BatchTranslator(registry.resilient(provider)), memory)
+
+def _ocr_worker(ocr_factory, strategy, jobs, results):
+    # The sentinel is posted however the worker ends, or the parent would wait for it forever
+    try:
+        from services.ocr_service import extract_lines
+
+        try:
+            ocr = ocr_factory(strategy)
+        except Exception as e:
+            results.put((None, None, [], [], 0.0, f"OCR setup failed: {e}"))
+            return
+        while True:
+            job = jobs.get()
+            if job is None:
+                break
+            path, name = job
+            started = time.perf_counter()
+            try:
+                with Image.open(path) as image:
+                    image = image.convert("RGB")
+                data = ocr.perform_ocr(image)
+                if data is None:
+                    # Engine missing or failed: not the same as an image without text
+                    raise RuntimeError("OCR engine returned no result")
+                texts, metadata = extract_lines(data) if not data.empty else ([], [])
+                boxes = [[int(v) for v in line['box']] for line in metadata]
+                results.put((path, name, texts, boxes, time.perf_counter() - started, None))
+            except Exception as e:
+                results.put((path, name, [], [], time.perf_counter() - started, str(e)))
+    finally:
+        results.put(None)
+
+def _poll(results, processes):
+    """
+    Next item from a worker queue. Raises RuntimeError when every process has exited
+    and nothing is left to read (a worker killed before posting its results).
+    """
+    while True:
+        try:
+            return results.get(timeout=POLL_SECONDS)
+        except queue.Empty:
+            if not any(process.is_alive() for process in processes):
+                try:
+                    return results.get(timeout=POLL_SECONDS)
+                except queue.Empty:
+                    raise RuntimeError("worker processes exited without finishing") from None
+
+def _render_worker(jobs, done):
+    from services.drawing_service import draw_translation_overlay
+
+    while True:
+        job = jobs.get()
+        if job is None:
+            break
+        path, image_path, sidecar_path, record = job
+        try:
+            with Image.open(path) as image:
+                image = image.convert("RGB")
+            lines = record['lines']
+            draw_translation_overlay(image, lines, [line['translated'] for line in lines])
+            os.makedirs(os.path.dirname(image_path) or ".", exist_ok=True)
+            image.save(image_path)
+            with open(sidecar_path, "w", encoding="utf-8") as f:
+                json.dump(record, f, ensure_ascii=False, indent=2)
+            done.put((path, len(lines), None))
+        except Exception as e:
+            done.put((path, 0, str(e)))
+
+def run_batch(inputs, output_dir, provider='google', ocr_strategy='auto', ocr_workers=None, render_workers=None,
+              translate_workers=4, queue_size=None, image_format=None, ocr_factory=default_ocr_factory, translator=None):
+    """
+    Translates every image under inputs into output_dir. Returns a summary dict with
+    images, lines, errors, translation_errors, seconds, images_per_s and lines_per_s.
+    ocr_factory(strategy) must be a picklable (module-level) callable returning an object with perform_ocr(image).
+    Raises ValueError for an unknown ocr_strategy.
+    """
+    from services.ocr_service import STRATEGIES
+
+    # Checked here rather than in every worker, where it could only be reported per image
+    if ocr_strategy not in STRATEGIES:
+        raise ValueError(f"Unknown OCR strategy '{ocr_strategy}', expected one of {STRATEGIES}")
+    ocr_workers = ocr_workers or max(1, (os.cpu_count() or 2) - 1)
+    render_workers = render_workers or max(1, ocr_workers // 2)
+    queue_size = queue_size or 2 * ocr_workers
+    translator = translator or default_translator(provider)
+
+    # 'spawn' everywhere, as for the tiled OCR pool: same behaviour on Windows and Linux
+    context = multiprocessing.get_context('spawn')
+    jobs = context.Queue(queue_size)
+    ocr_results = context.Queue(queue_size)
+    render_jobs = context.Queue(queue_size)
+    done = context.Queue()
+    workers = [context.Process(target=_ocr_worker, args=(ocr_factory, ocr_strategy, jobs, ocr_results), daemon=True)
+               for _ in range(ocr_workers)]
+    renderers = [context.Process(target=_render_worker, args=(render_jobs, done), daemon=True)
+                 for _ in range(render_workers)]
+    for process in workers + renderers:
+        process.start()
+
+    def feed():
+        for item in iter_inputs(inputs):
+            jobs.put(item)
+        for _ in workers:
+            jobs.put(None)
+
+    # Jobs left unread when the OCR workers died must not keep the parent from exiting
+    jobs.cancel_join_thread()
+    started = time.perf_counter()
+    threading.Thread(target=feed, daemon=True).start()
+
+    summary = {"images": 0, "lines": 0, "errors": 0, "translation_errors": 0}
+    queued = 0
+
+    def translate(item):
+        path, name, texts, boxes, ocr_seconds, _ = item
+        translated = [""] * len(texts)
+        error = None
+        try:
+            for index, value in translator.with_source(detect_text_language(texts)).translate_stream(texts):
+                translated[index] = value
+        except TranslationError as e:
+            # Still rendered with the lines that did translate; the sidecar records the failure
+            error = f"{e.provider}: {e}"
+            print(f"Batch Translation Error ({path}): {error}")
+        stem, ext = os.path.splitext(os.path.join(output_dir, name))
+        record = {
+            "source": os.path.abspath(path),
+            "provider": translator.name,
+            "ocr_seconds": round(ocr_seconds, 4),
+            "translation_error": error,
+            "lines": [{"original": text, "translated": value, "box": box}
+                      for text, value, box in zip(texts, translated, boxes)],
+        }
+        return path, stem + (image_format or ext), stem + ".json", record
+
+    def hand_off(job):
+        if job[3]["translation_error"] is not None:
+            summary["translation_errors"] += 1
+        render_jobs.put(job)
+
+    # Translation is network-bound: a few images in flight at once, handed to the renderers in input order
+    with ThreadPoolExecutor(max_workers=translate_workers) as pool:
+        pending = deque()
+        finished = 0
+        while finished < len(workers):
+            try:
+                item = _poll(ocr_results, workers)
+            except RuntimeError as e:
+                summary["errors"] += len(workers) - finished
+                print(f"Batch OCR Error: {e}")
+                break
+            if item is None:
+                finished += 1
+                continue
+            if item[5] is not None:
+                summary["errors"] += 1
+                print(f"Batch OCR Error ({item[0] or 'worker'}): {item[5]}")
+                continue
+            pending.append(pool.submit(translate, item))
+            while len(pending) > translate_workers or (pending and pending[0].done()):
+                hand_off(pending.popleft().result())
+                queued += 1
+        while pending:
+            hand_off(pending.popleft().result())
+            queued += 1
+
+    for _ in renderers:
+        render_jobs.put(None)
+    for rendered in range(queued):
+        try:
+            path, line_count, error = _poll(done, renderers)
+        except RuntimeError as e:
+            summary["errors"] += queued - rendered
+            print(f"Batch Render Error: {e}")
+            break
+        if error is not None:
+            summary["errors"] += 1
+            print(f"Batch Render Error ({path}): {error}")
+        else:
+            summary["images"] += 1
+            summary["lines"] += line_count
+    for process in workers + renderers:
+        process.join(POLL_SECONDS)
+        if process.is_alive():
+            # e.g. an OCR worker whose siblings died, still waiting for jobs that will never come
+            process.terminate()
+
+    seconds = time.perf_counter() - started
+    summary["seconds"] = seconds
+    summary["images_per_s"] = summary["images"] / seconds if seconds else 0.0
+    summary["lines_per_s"] = summary["lines"] / seconds if seconds else 0.0
+    return summary
+
+def main(argv=None):
+    from services.ocr_service import STRATEGIES
+
+    parser = argparse.ArgumentParser(description="Translate screenshots or extracted video frames without the GUI.")
+    parser.add_argument("inputs", nargs="+", help="image files and/or directories (searched recursively)")
+    parser.add_argument("-o", "--output", required=True, help="directory for overlay images and JSON sidecars")
+    parser.add_argument("--provider", default="google")
+    parser.add_argument("--ocr", default=utils.get_ocr_strategy(), choices=STRATEGIES)
+    parser.add_argument("--workers", type=int, default=None, help="OCR processes (default: cores - 1)")
+    parser.add_argument("--render-workers", type=int, default=None)
+    parser.add_argument("--queue-size", type=int, default=None)
+    parser.add_argument("--format", default=None, help="output image extension, e.g. .png (default: keep)")
+    args = parser.parse_args(argv)
+
+    summary = run_batch(
+        args.inputs, args.output, provider=args.provider, ocr_strategy=args.ocr, ocr_workers=args.workers,
+        render_workers=args.render_workers, queue_size=args.queue_size, image_format=args.format
+    )
+    print(f"Translated {summary['images']} images ({summary['lines']} lines, {summary['errors']} errors, "
+          f"{summary['translation_errors']} with translation errors) "
+          f"in {summary['seconds']:.1f} s: {summary['images_per_s']:.2f} images/s, {summary['lines_per_s']:.1f} lines/s")
+    return 1 if summary["errors"] or summary["translation_errors"] else 0
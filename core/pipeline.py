@@ -0,0 +1,184 @@
+"""
+Capture pipeline as explicit stages with memoized artifacts:
+
+  capture -> preprocess -> ocr -> layout -> language -> translate -> render
+
+Every stage output is kept per capture together with the signature of what produced it
+(upstream signatures + the parameters the stage reads). Asking for a stage recomputes it only
+when that signature changed, so switching provider reruns translate + render and changing the
+overlay font reruns render alone.
+"""
+import threading
+from collections import Counter
+
+from utils.tracing import tracer
+
+class Stage:
+    """A named step. fn(pipeline, run) computes the artifact, pulling its inputs with pipeline.get(name, run)."""
+    __slots__ = ('name', 'fn', 'inputs', 'params')
+
+    def __init__(self, name, fn=None, inputs=(), params=()):
+        self.name = name
+        self.fn = fn  # None: a source stage, set with set_input()
+        self.inputs = tuple(inputs)
+        self.params = tuple(params)
+
+class PipelineRun:
+    """Per-run context handed to stage functions: cancellation token, capture id and progress callback."""
+
+    def __init__(self, token=None, capture_id=None, on_progress=None):
+        self.token = token
+        self.capture_id = capture_id
+        self.on_progress = on_progress
+
+    def check(self):
+        if self.token:
+            self.token.raise_if_cancelled()
+
+    def progress(self, stage, value):
+        if self.on_progress:
+            self.on_progress(stage, value)
+
+class StagedPipeline:
+    """
+    Memoizes stage artifacts for one input. Stages are computed lazily (pull), so a stage whose
+    consumer does not need it on this run (e.g. preprocess on an OCR cache hit) never runs.
+    A failing or cancelled stage stores nothing; the next get() retries it.
+    """
+
+    def __init__(self, stages, **params):
+        self.stages = {stage.name: stage for stage in stages}
+        self.params = dict(params)
+        self._versions = {}  # source stage -> version
+        self._artifacts = {}  # stage -> (signature, value)
+        self._lock = threading.RLock()
+        self.stats = {"runs": Counter(), "reused": Counter()}
+
+    def set_input(self, name, value):
+        with self._lock:
+            version = self._versions.get(name, 0) + 1
+            self._versions[name] = version
+            self._artifacts[name] = (version, value)
+
+    def set_params(self, **params):
+        with self._lock:
+            self.params.update(params)
+
+    def signature(self, name):
+        stage = self.stages[name]
+        if stage.fn is None:
+            return self._versions.get(name)
+        return (tuple(self.params.get(param) for param in stage.params),
+                tuple(self.signature(dependency) for dependency in stage.inputs))
+
+    def is_fresh(self, name):
+        with self._lock:
+            cached = self._artifacts.get(name)
+            return cached is not None and cached[0] == self.signature(name)
+
+    def get(self, name, run=None):
+        run = run or PipelineRun()
+        with self._lock:
+            signature = self.signature(name)
+            cached = self._artifacts.get(name)
+            if cached is not None and cached[0] == signature:
+                self.stats["reused"][name] += 1
+                return cached[1]
+            stage = self.stages[name]
+            if stage.fn is None:
+                raise KeyError(f"No input set for stage '{name}'")
+            run.check()
+            with tracer.span(name, run.capture_id):
+                value = stage.fn(self, run)
+            self._artifacts[name] = (signature, value)
+            self.stats["runs"][name] += 1
+            return value
+
+    def invalidate(self, name=None):
+        """Drops one stage's artifact (or every computed artifact); inputs are kept."""
+        with self._lock:
+            names = [name] if name else [stage for stage in self._artifacts if self.stages[stage].fn is not None]
+            for stage in names:
+                self._artifacts.pop(stage, None)
+
+def capture_stages(get_ocr_service, get_translator, regions=None):
+    """
+    The desktop capture pipeline. Parameters: provider (translate) and font (render).
+    get_ocr_service() and get_translator(provider) are resolved at run time, so the pipeline can be
+    built on the UI thread before the services finished loading.
+    translate reports ("translate", lines so far) progress after every line that arrives.
+    regions: boxes of a multi-region capture (services.region_layout). Each is OCRed on its own crop,
+    concurrently; the lines of all regions are translated together and tagged with their region index.
+    """
+
+    def preprocess(pipeline, run):
+        return get_ocr_service().preprocess(pipeline.get("capture", run))
+
+    def ocr(pipeline, run):
+        if regions:
+            return ocr_regions(pipeline.get("capture", run), run)
+        return get_ocr_service().perform_ocr(pipeline.get("capture", run), prepare=lambda: pipeline.get("preprocess", run))
+
+    def ocr_regions(image, run):
+        import asyncio
+        from services.text_regions import merge_regions
+        from utils.async_runtime import runtime
+
+        service = get_ocr_service()
+        crops = [image.crop(box) for box in regions]
+
+        async def recognize_all():
+            # Crops are cached and recognized independently, so an unchanged region is an OCR cache hit
+            return await asyncio.gather(*(runtime.offload(service.perform_ocr, crop) for crop in crops))
+
+        results = runtime.run(recognize_all())
+        run.check()
+        return merge_regions([(box, None) for box in regions], results)
+
+    def layout(pipeline, run):
+        from services.ocr_service import extract_lines
+        from services.region_layout import region_of
+
+        data = pipeline.get("ocr", run)
+        if data is None or data.empty:
+            return [], []
+        texts, metadata = extract_lines(data)
+        if regions:
+            for line in metadata:
+                line['region'] = region_of(line['box'], regions)
+        return texts, metadata
+
+    def language(pipeline, run):
+        from services.script_detection import detect_text_language
+
+        texts, _ = pipeline.get("layout", run)
+        return detect_text_language(texts)
+
+    def translate(pipeline, run):
+        texts, _ = pipeline.get("layout", run)
+        # Detected source language: providers skip auto-detection (None: Latin script, let them detect)
+        translator = get_translator(pipeline.params.get("provider")).with_source(pipeline.get("language", run))
+        translated = [""] * len(texts)
+        with tracer.span(f"translate:{translator.name}", run.capture_id, lines=len(texts)):
+            for index, value in translator.translate_stream(texts):
+                run.check()
+                translated[index] = value
+                run.progress("translate", translated)
+        return translated
+
+    def render(pipeline, run):
+        from services.drawing_service import OverlayScene
+
+        _, metadata = pipeline.get("layout", run)
+        return OverlayScene(pipeline.get("capture", run), metadata, pipeline.get("translate", run),
+                            font_family=pipeline.params.get("font"))
+
+    return [
+        Stage("capture"),
+        Stage("preprocess", preprocess, inputs=("capture",)),
+        Stage("ocr", ocr, inputs=("capture", "preprocess")),
+        Stage("layout", layout, inputs=("ocr",)),
+        Stage("language", language, inputs=("layout",)),
+        Stage("translate", translate, inputs=("layout", "language"), params=("provider",)),
+        Stage("render", render, inputs=("capture", "layout", "translate"), params=("font",)),
+    ]
@@ -0,0 +1,152 @@
+import threading
+import time
+import mss
+
+from services.base_translator import TranslationError
+from services.frame_diff import FrameDiffer, changed_bands
+from services.ocr_service import extract_lines
+from services.drawing_service import OverlayScene
+from ui.capture_overlay import grab_region
+from utils.tracing import tracer
+
+# Above this fraction of changed rows a single full-frame OCR pass is cheaper than several strips
+FULL_REOCR_RATIO = 0.6
+
+class RegionWatcher:
+    """
+    Continuously re-grabs a screen region and keeps its translation overlay up to date.
+    Only the horizontal bands whose pixels changed are re-OCRed; lines outside them keep
+    their previous text and translation.
+    """
+
+    def __init__(self, monitor, ocr_service, get_translator, on_update, on_status=None, fps=4, differ=None, capture=None):
+        self.monitor = monitor
+        self.capture = capture  # CaptureService handing out pooled frames; default: own mss handle
+        self.ocr_service = ocr_service
+        self.get_translator = get_translator
+        self.on_update = on_update
+        self.on_status = on_status
+        self.interval = 1.0 / fps
+        self.differ = differ or FrameDiffer()
+        self.lines = []  # [{'original', 'box', 'translated'}], sorted top to bottom
+        self.stats = {"frames_processed": 0, "frames_skipped": 0}
+        self._stop = threading.Event()
+        self._thread = None
+        self._refresh = False
+
+    def start(self):
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+
+    def refresh(self):
+        """Forgets cached lines so the next frame is fully re-read (e.g. after a provider change)."""
+        self._refresh = True
+
+    @property
+    def is_running(self):
+        return self._thread is not None and self._thread.is_alive() and not self._stop.is_set()
+
+    def _run(self):
+        if self.capture is not None:
+            self._loop(self._grab_pooled)
+            return
+        # mss handles are bound to the thread that created them
+        with mss.mss() as sct:
+            self._loop(lambda monitor: grab_region(sct, monitor))
+
+    def _grab_pooled(self, monitor):
+        return self.capture.grab(monitor, pooled=True)
+
+    def _loop(self, grab):
+        while not self._stop.is_set():
+            started = time.perf_counter()
+            frame = processed = None
+            try:
+                with tracer.span("watch_frame"):
+                    frame = grab(self.monitor)
+                    processed = self.process_frame(frame)
+            except Exception as e:
+                print(f"Watch Error: {e}")
+            if self.capture is not None and frame is not None:
+                # Skipped (or failed) frames go back to the pool; processed ones now belong to the overlay scene
+                if processed:
+                    self.capture.detach(frame)
+                else:
+                    self.capture.release(frame)
+            self._stop.wait(max(0.0, self.interval - (time.perf_counter() - started)))
+
+    def process_frame(self, frame):
+        """Diffs the frame against the previous one and refreshes only changed lines. Returns True if processed."""
+        if self._refresh:
+            self._refresh = False
+            self.lines = []
+            self.differ.reset()
+
+        mask = self.differ.diff(frame)
+        if not mask.any():
+            self.stats["frames_skipped"] += 1
+            self._report()
+            return False
+
+        height = frame.size[1]
+        bands = changed_bands(mask, self.differ.tile_size, height)
+        if sum(y1 - y0 for y0, y1 in bands) > FULL_REOCR_RATIO * height:
+            bands = [(0, height)]
+
+        for y0, y1 in bands:
+            self._reocr_band(frame, y0, y1)
+        self._translate_pending()
+
+        translated = [line.get('translated', "") for line in self.lines]
+        self.on_update(
+            "\n".join(line['original'] for line in self.lines),
+            "\n".join(translated),
+            OverlayScene(frame, list(self.lines), translated)
+        )
+        self.stats["frames_processed"] += 1
+        self._report()
+        return True
+
+    def _reocr_band(self, frame, y0, y1):
+        # Grow the band so lines it cuts through are re-read whole; growing can reach lines already
+        # checked (overlapping boxes: ascenders, descenders), so repeat until the band is stable
+        grown = True
+        while grown:
+            grown = False
+            for line in self.lines:
+                top, bottom = line['box'][1], line['box'][3]
+                if top < y1 and bottom > y0 and (top < y0 or bottom > y1):
+                    y0, y1 = min(y0, top), max(y1, bottom)
+                    grown = True
+        self.lines = [line for line in self.lines if line['box'][3] <= y0 or line['box'][1] >= y1]
+
+        # A changed band is by definition different content: never accept a merely similar cached band
+        data = self.ocr_service.perform_ocr(frame.crop((0, y0, frame.size[0], y1)), perceptual=False)
+        _, band_lines = extract_lines(data)
+        for line in band_lines:
+            x_min, y_min, x_max, y_max = line['box']
+            line['box'] = (x_min, y_min + y0, x_max, y_max + y0)
+        self.lines = sorted(self.lines + band_lines, key=lambda line: (line['box'][1], line['box'][0]))
+
+    def _translate_pending(self):
+        pending = [line for line in self.lines if 'translated' not in line]
+        if not pending:
+            return
+        try:
+            translated = self.get_translator().translate_lines([line['original'] for line in pending])
+        except TranslationError as e:
+            # Lines left without a translation are retried with the next changed frame
+            print(f"Watch Translation Error ({e.provider}): {e}")
+            if self.on_status:
+                self.on_status(f"Translation failed ({e.provider}): {e}")
+            return
+        for line, text in zip(pending, translated):
+            line['translated'] = text
+
+    def _report(self):
+        if self.on_status:
+            self.on_status(f"Watching: {self.stats['frames_processed']} processed, {self.stats['frames_skipped']} skipped")
@@ -0,0 +1,103 @@
+import threading
+
+class JobCancelled(Exception):
+    """Raised inside a job when its token was cancelled by a newer request."""
+
+class CancellationToken:
+    """Per-job token checked by the pipeline between stages. Carries the job's generation id."""
+
+    def __init__(self, generation):
+        self.generation = generation
+        self._event = threading.Event()
+
+    def cancel(self):
+        self._event.set()
+
+    @property
+    def cancelled(self):
+        return self._event.is_set()
+
+    def raise_if_cancelled(self):
+        if self._event.is_set():
+            raise JobCancelled()
+
+class PipelineScheduler:
+    """
+    Runs pipeline jobs on a bounded pool of worker threads with latest-wins semantics:
+    - every submit() gets a new generation id and cancels all older jobs (pending or running);
+    - a burst of submits coalesces into one pending job (only the newest is kept);
+    - is_current(generation) lets the UI drop results from superseded jobs.
+    """
+
+    def __init__(self, max_workers=2):
+        self.max_workers = max_workers
+        self._cond = threading.Condition()
+        self._pending = None  # (token, fn)
+        self._running = set()
+        self._generation = 0
+        self._shutdown = False
+        self.stats = {"submitted": 0, "coalesced": 0, "started": 0, "completed": 0, "cancelled": 0, "max_concurrency": 0}
+        self._workers = [threading.Thread(target=self._worker, daemon=True) for _ in range(max_workers)]
+        for worker in self._workers:
+            worker.start()
+
+    def submit(self, fn):
+        """Schedules fn(token). Returns the job's CancellationToken."""
+        with self._cond:
+            self._generation += 1
+            token = CancellationToken(self._generation)
+            self.stats["submitted"] += 1
+            if self._pending is not None:
+                self._pending[0].cancel()
+                self.stats["coalesced"] += 1
+            for running in self._running:
+                running.cancel()
+            self._pending = (token, fn)
+            self._cond.notify()
+            return token
+
+    def is_current(self, generation):
+        with self._cond:
+            return generation == self._generation
+
+    def _worker(self):
+        while True:
+            with self._cond:
+                while self._pending is None and not self._shutdown:
+                    self._cond.wait()
+                if self._shutdown:
+                    return
+                token, fn = self._pending
+                self._pending = None
+                self._running.add(token)
+                self.stats["started"] += 1
+                self.stats["max_concurrency"] = max(self.stats["max_concurrency"], len(self._running))
+            try:
+                token.raise_if_cancelled()
+                fn(token)
+                outcome = "completed"
+            except JobCancelled:
+                outcome = "cancelled"
+            except Exception as e:
+                print(f"Scheduler Error: {e}")
+                outcome = "completed"
+            finally:
+                with self._cond:
+                    self._running.discard(token)
+                    self.stats[outcome] += 1
+                    self._cond.notify_all()
+
+    def wait_idle(self, timeout=None):
+        """Blocks until nothing is pending or running (used by tests and shutdown)."""
+        with self._cond:
+            return self._cond.wait_for(lambda: self._pending is None and not self._running, timeout)
+
+    def shutdown(self):
+        with self._cond:
+            self._shutdown = True
+            if self._pending is not None:
+                self._pending[0].cancel()
+                self._pending = None
+            for running in self._running:
+                running.cancel()
+            self._cond.notify_all()
@@ -1,7 +1,106 @@
+import copy
 from abc import ABC, abstractmethod
 
+class TranslationError(Exception):
+    """
+    Structured provider failure, raised instead of returning error text (which used to get painted
+    onto the overlay). retryable: worth another attempt; retry_after: server-requested wait in seconds.
+    """
+
+    retryable = False
+
+    def __init__(self, message, provider=None, status=None, retry_after=None):
+        super().__init__(message)
+        self.provider = provider
+        self.status = status
+        self.retry_after = retry_after
+
+class RateLimitedError(TranslationError):
+    """HTTP 429 / quota throttling."""
+    retryable = True
+
+class ProviderUnavailableError(TranslationError):
+    """Timeouts, connection failures and 5xx responses."""
+    retryable = True
+
+class CircuitOpenError(TranslationError):
+    """The provider failed repeatedly and is not being called until its breaker resets."""
+
 class BaseTranslator(ABC):
+    # Identity used to key cached translations (see services/translation_memory.py)
+    name = "base"
+    source_lang = "auto"
+    target_lang = "zh-CN"
+    # Lines per request when streaming a provider without native token streaming
+    stream_chunk_lines = 8
+    # True when translate_async() does non-blocking I/O on the shared event loop (utils.async_runtime)
+    native_async = False
+    # True when translate_lines() maps every translation to its own source line by construction
+    # (e.g. BatchTranslator's [[n]] markers), so results are always safe to cache per line
+    aligned_lines = False
+
     @abstractmethod
     def translate(self, text: str) -> str:
-        """Translates text from source to target."""
+        """Translates text from source to target. Raises TranslationError on failure."""
         pass
+
+    async def translate_async(self, text: str) -> str:
+        """
+        Coroutine version of translate(), run on the shared event loop. Default: the blocking
+        translate() on the runtime's executor; async providers override it and set native_async.
+        """
+        from utils.async_runtime import runtime
+
+        return await runtime.offload(self.translate, text)
+
+    def with_source(self, source_lang):
+        """
+        This translator for a known source language (e.g. from script detection), so the provider skips
+        auto-detection. Shallow copy: the connection pool and any state stay shared.
+        """
+        if not source_lang or source_lang == self.source_lang:
+            return self
+        clone = copy.copy(self)
+        clone.source_lang = source_lang
+        return clone
+
+    def failover_count(self):
+        """Calls so far answered by a fallback provider instead of this one (see ResilientTranslator)."""
+        return 0
+
+    def translate_lines(self, lines):
+        """
+        Translates a list of lines and returns one translation per line.
+        Default: join lines into one block for better context and speed, then split.
+        """
+        return self.translate_lines_checked(lines)[0]
+
+    def translate_lines_checked(self, lines):
+        """
+        translate_lines() plus whether the result is known to line up with lines. The default
+        join/split path is not when the provider merged or split lines and the result was padded or cut.
+        """
+        if self.aligned_lines:
+            return self.translate_lines(lines), True
+        if not lines:
+            return [], True
+
+        translated_block = self.translate("\n".join(lines)) or ""
+        translated_lines = translated_block.split("\n")
+        aligned = len(translated_lines) == len(lines)
+
+        # Ensure we have a match for each line; pad if necessary
+        if len(translated_lines) < len(lines):
+            translated_lines.extend([""] * (len(lines) - len(translated_lines)))
+        return translated_lines[:len(lines)], aligned
+
+    def translate_stream(self, lines):
+        """
+        Yields (index, translation) pairs as soon as each line is translated.
+        Default: per-chunk completion, i.e. lines are translated in chunks of stream_chunk_lines
+        and every line of a finished chunk is yielded before the next request starts.
+        """
+        for start in range(0, len(lines), self.stream_chunk_lines):
+            chunk = lines[start:start + self.stream_chunk_lines]
+            for offset, translated in enumerate(self.translate_lines(chunk)[:len(chunk)]):
+                yield start + offset, translated
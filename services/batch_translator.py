@@ -0,0 +1,212 @@
+import asyncio
+import re
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from services.base_translator import BaseTranslator, TranslationError
+from utils.async_runtime import runtime
+from utils.tracing import tracer
+
+# Every source line is sent as "[[n]] text"; providers are asked to keep the markers verbatim.
+# Full-width brackets are accepted because some engines "translate" the punctuation.
+MARKER_RE = re.compile(r"[\[［]{2}\s*(\d+)\s*[\]］]{2}")
+
+def encode_lines(lines):
+    return "\n".join(f"[[{index}]] {line}" for index, line in enumerate(lines))
+
+def decode_lines(text, count):
+    """Returns {index: translation} for every marker found in a provider response."""
+    matches = [m for m in MARKER_RE.finditer(text or "") if int(m.group(1)) < count]
+    decoded = {}
+    for i, match in enumerate(matches):
+        end = matches[i + 1].start() if i + 1 < len(matches) else len(text)
+        decoded.setdefault(int(match.group(1)), " ".join(text[match.end():end].split()))
+    return decoded
+
+def plan_chunks(lines, max_chars=1200, max_lines=24):
+    """Splits lines into (start, chunk) pairs bounded by a character and a line budget."""
+    chunks, start, size = [], 0, 0
+    for index, line in enumerate(lines):
+        cost = len(line) + 8  # marker + newline
+        if index > start and (size + cost > max_chars or index - start >= max_lines):
+            chunks.append((start, lines[start:index]))
+            start, size = index, 0
+        size += cost
+    if start < len(lines):
+        chunks.append((start, lines[start:]))
+    return chunks
+
+class BatchTranslator(BaseTranslator):
+    """
+    Translates many lines as budgeted chunks sent concurrently to a wrapped provider.
+    Lines carry explicit [[n]] markers, so every translation maps back to its source line;
+    only lines whose marker went missing are retried (then translated one by one).
+    Chunks for a native_async provider run as coroutines on the shared event loop instead of pool threads.
+    """
+
+    aligned_lines = True
+
+    def __init__(self, translator, max_chars=1200, max_lines=24, max_parallel=4, retries=1):
+        self.translator = translator
+        self.max_chars = max_chars
+        self.max_lines = max_lines
+        self.max_parallel = max_parallel
+        self.retries = retries
+        self.name = translator.name
+        self.source_lang = translator.source_lang
+        self.target_lang = translator.target_lang
+        self.native_async = translator.native_async
+        self.stats = {"requests": 0, "retried_lines": 0, "single_line_fallbacks": 0}
+
+    def translate(self, text: str) -> str:
+        return "\n".join(self.translate_lines(text.split("\n")))
+
+    def with_source(self, source_lang):
+        clone = super().with_source(source_lang)
+        if clone is not self:
+            clone.translator = self.translator.with_source(source_lang)
+        return clone
+
+    def failover_count(self):
+        return self.translator.failover_count()
+
+    def _request(self, lines):
+        """One marked request. Returns {index: translation}; provider errors propagate."""
+        self.stats["requests"] += 1
+        with tracer.span(f"request:{self.name}", lines=len(lines)):
+            response = self.translator.translate(encode_lines(lines))
+        return decode_lines(response, len(lines))
+
+    def _repair(self, lines, decoded):
+        """Fills in lines missing from decoded: marked retries first, then single-line requests."""
+        for _ in range(self.retries):
+            missing = [i for i in range(len(lines)) if i not in decoded]
+            if not missing:
+                break
+            self.stats["retried_lines"] += len(missing)
+            retried = self._request([lines[i] for i in missing])
+            for position, value in retried.items():
+                decoded[missing[position]] = value
+
+        for i in range(len(lines)):
+            if i not in decoded:
+                self.stats["single_line_fallbacks"] += 1
+                decoded[i] = self.translator.translate(lines[i])
+
+    def _translate_chunk(self, lines):
+        """Returns translations aligned with lines. Runs on a pool thread."""
+        decoded = self._request(lines)
+        self._repair(lines, decoded)
+        return [decoded[i] for i in range(len(lines))]
+
+    async def _request_async(self, lines):
+        self.stats["requests"] += 1
+        with tracer.span(f"request:{self.name}", lines=len(lines)):
+            response = await self.translator.translate_async(encode_lines(lines))
+        return decode_lines(response, len(lines))
+
+    async def _repair_async(self, lines, decoded):
+        for _ in range(self.retries):
+            missing = [i for i in range(len(lines)) if i not in decoded]
+            if not missing:
+                break
+            self.stats["retried_lines"] += len(missing)
+            retried = await self._request_async([lines[i] for i in missing])
+            for position, value in retried.items():
+                decoded[missing[position]] = value
+
+        for i in range(len(lines)):
+            if i not in decoded:
+                self.stats["single_line_fallbacks"] += 1
+                decoded[i] = await self.translator.translate_async(lines[i])
+
+    async def _translate_chunk_async(self, lines, slots):
+        """_translate_chunk() on the event loop; slots bounds the requests in flight to max_parallel."""
+        async with slots:
+            decoded = await self._request_async(lines)
+            await self._repair_async(lines, decoded)
+        return [decoded[i] for i in range(len(lines))]
+
+    def _submit_chunks(self, chunks):
+        """Schedules every chunk on the shared loop; returns {future: start}."""
+        slots = asyncio.Semaphore(min(self.max_parallel, len(chunks)))
+        return {runtime.submit(self._translate_chunk_async(chunk, slots)): start for start, chunk in chunks}
+
+    def _stream_chunk(self, lines):
+        """
+        Token-streams one marked request through the provider's stream_text():
+        a line is complete as soon as the next marker arrives.
+        """
+        buffer, decoded = "", {}
+        for delta in self.translator.stream_text(encode_lines(lines)):
+            buffer += delta
+            matches = [m for m in MARKER_RE.finditer(buffer) if int(m.group(1)) < len(lines)]
+            for match, following in zip(matches, matches[1:]):
+                index = int(match.group(1))
+                if index not in decoded:
+                    decoded[index] = " ".join(buffer[match.end():following.start()].split())
+                    yield index, decoded[index]
+        for index, value in decode_lines(buffer, len(lines)).items():
+            if index not in decoded:
+                decoded[index] = value
+                yield index, value
+
+        streamed = set(decoded)
+        self._repair(lines, decoded)
+        for index in range(len(lines)):
+            if index not in streamed:
+                yield index, decoded[index]
+
+    def translate_lines(self, lines):
+        results = [""] * len(lines)
+        for index, value in self.translate_stream(lines):
+            results[index] = value
+        return results
+
+    def translate_stream(self, lines):
+        """
+        Yields (index, translation) pairs: per finished chunk, in completion order.
+        A capture that fits in one chunk is token-streamed when the provider supports it.
+        When a chunk fails, the other chunks are still yielded and the first TranslationError is raised at the end.
+        """
+        chunks = plan_chunks(list(lines), self.max_chars, self.max_lines)
+        if not chunks:
+            return
+        if len(chunks) == 1 and hasattr(self.translator, "stream_text"):
+            yield from self._stream_chunk(chunks[0][1])
+            return
+        failure = None
+        if len(chunks) == 1 or self.max_parallel <= 1:
+            for start, chunk in chunks:
+                try:
+                    translated = self._translate_chunk(chunk)
+                except TranslationError as e:
+                    failure = failure or e
+                    continue
+                for offset, value in enumerate(translated):
+                    yield start + offset, value
+        else:
+            pool = None
+            if self.native_async:
+                futures = self._submit_chunks(chunks)
+            else:
+                pool = ThreadPoolExecutor(max_workers=min(self.max_parallel, len(chunks)))
+                futures = {pool.submit(self._translate_chunk, chunk): start for start, chunk in chunks}
+            try:
+                for future in as_completed(futures):
+                    try:
+                        translated = future.result()
+                    except TranslationError as e:
+                        failure = failure or e
+                        continue
+                    for offset, value in enumerate(translated):
+                        yield futures[future] + offset, value
+            finally:
+                # A consumer that stops early (superseded capture) must not leave requests running
+                if pool is None:
+                    runtime.cancel(futures)
+                else:
+                    for future in futures:
+                        future.cancel()
+                if pool is not None:
+                    pool.shutdown(wait=True)
+        if failure is not None:
+            raise failure
@@ -0,0 +1,271 @@
+import io
+import json
+import mmap
+import os
+import shutil
+import struct
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from PIL import Image, features
+from services.drawing_service import OverlayScene
+
+# Lossless, so spilled captures re-display pixel for pixel under their OCR boxes.
+# WebP at its fastest setting encodes ~2x faster than PNG level 1 and is smaller; PNG when Pillow lacks WebP.
+if features.check("webp"):
+    IMAGE_FORMAT, IMAGE_EXTENSION, IMAGE_OPTIONS = "WEBP", "webp", {"lossless": True, "quality": 0, "method": 0}
+else:
+    IMAGE_FORMAT, IMAGE_EXTENSION, IMAGE_OPTIONS = "PNG", "png", {"compress_level": 1}
+
+class HistoryEntry:
+    """
+    One finished capture: its overlay scene (image, line boxes, translations, font) and the OCR text.
+    regions: the region boxes of a multi-region capture, None for a single region.
+    """
+    __slots__ = ('scene', 'original_texts', 'timestamp', 'regions', 'nbytes')
+
+    def __init__(self, scene, original_texts=(), timestamp=None, regions=None):
+        self.scene = scene
+        self.original_texts = list(original_texts)
+        self.timestamp = timestamp if timestamp is not None else time.time()
+        self.regions = [tuple(box) for box in regions] if regions else None
+        image = scene.image
+        text = sum(len(t) for t in self.original_texts) + sum(len(t) for t in scene.translated_texts)
+        # Decoded pixels dominate; ~100 bytes per line for the box dict and list slots
+        self.nbytes = image.width * image.height * len(image.getbands()) + 2 * text + 100 * len(scene.lines_metadata)
+
+    @property
+    def original_text(self):
+        return "\n".join(self.original_texts)
+
+    @property
+    def translated_text(self):
+        return "\n".join(self.scene.translated_texts)
+
+class DiskStore:
+    """
+    Spilled history entries: one lossless image file per entry, the rest (boxes, texts, font, time) as
+    JSON appended to meta.bin, and a fixed-record index.bin memory-mapped so a lookup is one slice.
+    Record i describes history position i; a zero image length means not spilled (or already dropped).
+    When the images exceed max_bytes the oldest ones are deleted.
+    Files go to a fresh directory inside `directory`, so several instances can share one cache directory;
+    close() removes only that one. Not thread-safe: CaptureHistory serializes access.
+    """
+    HEADER = struct.Struct("<4sI")  # magic, record size
+    RECORD = struct.Struct("<QII")  # meta offset, meta length, image length
+    MAGIC = b"STH1"
+
+    def __init__(self, directory, max_bytes=1024 * 1024 * 1024, capacity=1024):
+        os.makedirs(directory, exist_ok=True)
+        # Session store: screenshots are not kept on disk past the session that took them
+        self.directory = tempfile.mkdtemp(prefix="session-", dir=directory)
+        self.max_bytes = max_bytes
+        self._meta = open(os.path.join(self.directory, "meta.bin"), "a+b")
+        self._index_file = open(os.path.join(self.directory, "index.bin"), "w+b")
+        self._capacity = 0
+        self._index = None
+        self._grow(capacity)
+        self._index[:self.HEADER.size] = self.HEADER.pack(self.MAGIC, self.RECORD.size)
+        self._stored = OrderedDict()  # position -> image bytes on disk, oldest first
+        self.bytes = 0
+        self.stats = {"writes": 0, "reads": 0, "dropped": 0}
+
+    def _grow(self, capacity):
+        if self._index is not None:
+            self._index.close()
+        self._index_file.truncate(self.HEADER.size + capacity * self.RECORD.size)
+        self._index = mmap.mmap(self._index_file.fileno(), 0)
+        self._capacity = capacity
+
+    def _record_at(self, position):
+        return self.HEADER.size + position * self.RECORD.size
+
+    def _image_path(self, position):
+        return os.path.join(self.directory, f"{position:08d}.{IMAGE_EXTENSION}")
+
+    @staticmethod
+    def encode(entry):
+        """(image file bytes, meta bytes) for write(). The slow part of a spill; needs no store and no lock."""
+        buffer = io.BytesIO()
+        scene = entry.scene
+        image = scene.image if scene.image.mode in ("RGB", "RGBA", "L") else scene.image.convert("RGB")
+        image.save(buffer, IMAGE_FORMAT, **IMAGE_OPTIONS)
+        meta = json.dumps({
+            "boxes": [metadata['box'] for metadata in scene.lines_metadata],
+            "original": entry.original_texts,
+            "translated": list(scene.translated_texts),
+            "font": scene.font_family,
+            "time": entry.timestamp,
+            "regions": entry.regions,
+            "line_regions": [metadata.get('region') for metadata in scene.lines_metadata] if entry.regions else None,
+        }, ensure_ascii=False).encode("utf-8")
+        return buffer.getvalue(), meta
+
+    def write(self, position, entry, encoded=None):
+        """Stores an entry at a history position; encoded: its encode() result when already computed."""
+        image_data, meta = encoded or self.encode(entry)
+        with open(self._image_path(position), "wb") as f:
+            f.write(image_data)
+        self._meta.seek(0, os.SEEK_END)
+        offset = self._meta.tell()
+        self._meta.write(meta)
+        self._meta.flush()
+
+        while position >= self._capacity:
+            self._grow(self._capacity * 2)
+        self.bytes -= self._stored.pop(position, 0)
+        self._index[self._record_at(position):self._record_at(position + 1)] = self.RECORD.pack(offset, len(meta), len(image_data))
+        self._stored[position] = len(image_data)
+        self.bytes += len(image_data)
+        self.stats["writes"] += 1
+        while self.bytes > self.max_bytes and len(self._stored) > 1:
+            self._drop(next(iter(self._stored)))
+
+    def _drop(self, position):
+        self.bytes -= self._stored.pop(position)
+        self._index[self._record_at(position):self._record_at(position + 1)] = self.RECORD.pack(0, 0, 0)
+        try:
+            os.remove(self._image_path(position))
+        except OSError:
+            pass
+        self.stats["dropped"] += 1
+
+    def read(self, position):
+        """Rebuilds the entry at this position, or None if it was never spilled or has been dropped."""
+        if position >= self._capacity:
+            return None
+        offset, length, image_length = self.RECORD.unpack_from(self._index, self._record_at(position))
+        if not image_length:
+            return None
+        self._meta.seek(offset)
+        meta = json.loads(self._meta.read(length).decode("utf-8"))
+        with Image.open(self._image_path(position)) as image:
+            image.load()
+        lines = [{'original': original, 'box': tuple(box)} for original, box in zip(meta["original"], meta["boxes"])]
+        for line, region in zip(lines, meta.get("line_regions") or ()):
+            line['region'] = region
+        self.stats["reads"] += 1
+        return HistoryEntry(OverlayScene(image, lines, meta["translated"], meta["font"]), meta["original"], meta["time"],
+                            meta.get("regions"))
+
+    def close(self):
+        self._index.close()
+        self._index_file.close()
+        self._meta.close()
+        shutil.rmtree(self.directory, ignore_errors=True)
+
+class CaptureHistory:
+    """
+    Every finished capture of the session, addressable by position (0 = oldest).
+    Recent entries stay in memory up to max_bytes (decoded pixels counted); older ones are spilled
+    to a DiskStore and decoded again on demand, so stepping back never reruns OCR or translation.
+    The disk store is created on the first spill; without a directory old entries are simply dropped.
+    Spills are encoded after _lock is released (evicted entries stay readable meanwhile), so get() from
+    the UI never waits for a full-screen image encode.
+    """
+
+    def __init__(self, max_bytes=256 * 1024 * 1024, directory=None, max_disk_bytes=1024 * 1024 * 1024):
+        self.max_bytes = max_bytes
+        self.directory = directory
+        self.max_disk_bytes = max_disk_bytes
+        self._memory = OrderedDict()  # position -> HistoryEntry, oldest first
+        self._count = 0
+        self._disk = None
+        self._spilling = {}  # position -> evicted HistoryEntry not yet written to disk
+        self._lock = threading.Lock()
+        self._disk_lock = threading.Lock()  # the DiskStore; taken before _lock when both are needed
+        self.bytes = 0
+        self.stats = {"added": 0, "memory_hits": 0, "disk_hits": 0, "spilled": 0, "misses": 0}
+
+    def __len__(self):
+        return self._count
+
+    def add(self, entry):
+        """Appends a capture and returns its position."""
+        with self._lock:
+            position = self._count
+            self._count += 1
+            evicted = self._store(position, entry)
+            self.stats["added"] += 1
+        self._spill(evicted)
+        return position
+
+    def replace(self, position, entry):
+        """Updates a capture in place (e.g. retranslated with another provider or font)."""
+        with self._lock:
+            if not 0 <= position < self._count:
+                raise IndexError(position)
+            evicted = self._store(position, entry)
+        self._spill(evicted)
+
+    def _store(self, position, entry):
+        """Keeps entry in memory under _lock; returns the evicted [(position, entry)] to pass to _spill()."""
+        evicted = []
+        previous = self._memory.pop(position, None)
+        if previous is not None:
+            self.bytes -= previous.nbytes
+        self._memory[position] = entry
+        self.bytes += entry.nbytes
+        # The entry just stored always stays, even when it alone exceeds the budget
+        while self.bytes > self.max_bytes and len(self._memory) > 1:
+            oldest, old_entry = self._memory.popitem(last=False)
+            self.bytes -= old_entry.nbytes
+            if self.directory is not None:
+                self._spilling[oldest] = old_entry
+                evicted.append((oldest, old_entry))
+        return evicted
+
+    def _spill(self, evicted):
+        """Writes evicted entries to disk. Called without _lock held."""
+        for position, entry in evicted:
+            try:
+                encoded = DiskStore.encode(entry)
+                with self._disk_lock:
+                    with self._lock:
+                        # A later eviction of the same position (after replace()) carries newer content
+                        current = self._spilling.get(position) is entry
+                    if current:
+                        if self._disk is None:
+                            self._disk = DiskStore(self.directory, self.max_disk_bytes)
+                        self._disk.write(position, entry, encoded)
+                        with self._lock:
+                            self.stats["spilled"] += 1
+            except Exception as e:
+                print(f"Capture history: cannot spill to disk ({e})")
+            with self._lock:
+                if self._spilling.get(position) is entry:
+                    del self._spilling[position]
+
+    def get(self, position):
+        """The entry at this position (from memory, or decoded from disk), or None if it is gone."""
+        with self._lock:
+            entry = self._memory.get(position) or self._spilling.get(position)
+            if entry is not None:
+                self.stats["memory_hits"] += 1
+                return entry
+            if not 0 <= position < self._count:
+                self.stats["misses"] += 1
+                return None
+        with self._disk_lock:
+            entry = self._disk.read(position) if self._disk is not None else None
+        with self._lock:
+            self.stats["disk_hits" if entry is not None else "misses"] += 1
+        return entry
+
+    def in_memory(self, position):
+        with self._lock:
+            return position in self._memory
+
+    @property
+    def disk_bytes(self):
+        return self._disk.bytes if self._disk is not None else 0
+
+    def close(self):
+        with self._disk_lock, self._lock:
+            self._memory.clear()
+            self._spilling.clear()
+            self.bytes = 0
+            if self._disk is not None:
+                self._disk.close()
+                self._disk = None
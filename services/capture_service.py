@@ -0,0 +1,138 @@
+import threading
+import time
+from collections import deque
+from PIL import Image
+from utils.tracing import tracer
+
+class FramePool:
+    """
+    Preallocated RGB frames with explicit ownership: acquire() hands out a free frame (or a new one),
+    release() returns it for reuse, detach() lets the caller keep it for good (e.g. shown in the UI).
+    A frame is only decoded into again after it was released, never while someone may still use it.
+    """
+
+    def __init__(self, max_frames=4):
+        self.max_frames = max_frames
+        self._free = []  # released pooled frames
+        self._in_use = {}  # id(frame) -> frame, pooled frames handed out
+        self._lock = threading.Lock()
+        self.stats = {"reused": 0, "allocated": 0, "unpooled": 0}
+
+    def acquire(self, width, height):
+        with self._lock:
+            for i, frame in enumerate(self._free):
+                if frame.size == (width, height):
+                    del self._free[i]
+                    self._in_use[id(frame)] = frame
+                    self.stats["reused"] += 1
+                    return frame
+            if self._free and len(self._free) + len(self._in_use) >= self.max_frames:
+                self._free.pop(0)  # a free frame of another size makes room
+            frame = Image.new("RGB", (width, height))
+            if len(self._free) + len(self._in_use) < self.max_frames:
+                self._in_use[id(frame)] = frame
+                self.stats["allocated"] += 1
+            else:
+                self.stats["unpooled"] += 1
+            return frame
+
+    def release(self, frame):
+        """Returns a frame the caller no longer uses; it will be decoded into again."""
+        with self._lock:
+            if self._in_use.pop(id(frame), None) is not None:
+                self._free.append(frame)
+
+    def detach(self, frame):
+        """The caller keeps this frame: the pool forgets it and will never overwrite it."""
+        with self._lock:
+            self._in_use.pop(id(frame), None)
+
+class CaptureService:
+    """
+    Screen capture owned by the controller: one grabber kept open for the whole session,
+    BGRA decoded in one pass, into pooled frames for callers that release them (watch mode),
+    and the last region (or region set) remembered so it can be re-captured without showing CaptureOverlay.
+    The grabber is anything with grab(monitor) -> object with .raw (BGRA bytes), .width, .height
+    (an mss instance by default; tests pass a fake).
+    """
+
+    def __init__(self, grabber=None, pool=None, history=256):
+        self._grabber = grabber
+        self._lock = threading.Lock()
+        self.pool = pool or FramePool()
+        self.last_region = None
+        self.last_regions = None  # region set of the last grab_regions(), None after a single-region grab
+        self._latencies = deque(maxlen=history)
+        self.stats = {"grabs": 0, "errors": 0}
+
+    def _get_grabber(self):
+        if self._grabber is None:
+            import mss
+            self._grabber = mss.mss()
+        return self._grabber
+
+    def grab(self, monitor, pooled=False):
+        """
+        Grabs a region ({'top', 'left', 'width', 'height'}) as an RGB PIL Image owned by the caller.
+        pooled=True decodes into a pool frame instead; the caller must release() or detach() it.
+        """
+        started = time.perf_counter_ns()
+        with self._lock:
+            try:
+                shot = self._get_grabber().grab(monitor)
+            except Exception:
+                self.stats["errors"] += 1
+                raise
+            if pooled:
+                frame = self.pool.acquire(shot.width, shot.height)
+                # Decodes into the frame's existing storage (Image.frombytes would allocate a new one)
+                frame.frombytes(shot.raw, "raw", "BGRX")
+            else:
+                frame = Image.frombytes("RGB", (shot.width, shot.height), shot.raw, "raw", "BGRX")
+            self.last_region = dict(monitor)
+            self.last_regions = None
+            self.stats["grabs"] += 1
+        finished = time.perf_counter_ns()
+        self._latencies.append((finished - started) / 1e6)
+        tracer.record("capture", started, finished, pixels=shot.width * shot.height)
+        return frame
+
+    def grab_regions(self, regions):
+        """
+        Grabs several regions with one grab of their bounding box.
+        Returns (image, boxes): the bounding-box image and each region's box inside it.
+        """
+        from services.region_layout import bounding_region, region_boxes
+
+        bounds = bounding_region(regions)
+        image = self.grab(bounds)
+        self.last_regions = [dict(region) for region in regions]
+        return image, region_boxes(regions, bounds)
+
+    def release(self, frame):
+        self.pool.release(frame)
+
+    def detach(self, frame):
+        self.pool.detach(frame)
+
+    def recapture_last(self):
+        """Grabs the last region again; None if nothing was captured yet."""
+        return self.grab(self.last_region) if self.last_region else None
+
+    def latency(self):
+        """Grab latency summary in milliseconds over the recent history."""
+        samples = sorted(self._latencies)
+        if not samples:
+            return {"count": 0}
+        return {
+            "count": len(samples),
+            "last_ms": self._latencies[-1],
+            "p50_ms": samples[len(samples) // 2],
+            "p95_ms": samples[min(len(samples) - 1, int(len(samples) * 0.95))],
+        }
+
+    def close(self):
+        with self._lock:
+            if self._grabber is not None and hasattr(self._grabber, "close"):
+                self._grabber.close()
+            self._grabber = None
@@ -1,5 +1,21 @@
-from PIL import ImageDraw, ImageFont
-from utils import helpers as utils
+from PIL import ImageDraw
+from services.font_manager import font_manager
+
+def draw_line_patches(draw, lines_metadata):
+    """Pass 1: draws the background "patch" behind every line."""
+    for metadata in lines_metadata:
+        x_min, y_min, x_max, y_max = metadata['box']
+        draw.rectangle([x_min-2, y_min-2, x_max+2, y_max+2], fill="white")
+
+def draw_line_text(draw, metadata, translated_text, fonts=font_manager):
+    """Pass 2 (one line): draws a translated line fitted (and wrapped if needed) into its box."""
+    x_min, y_min, x_max, y_max = metadata['box']
+    translated_text = translated_text.strip()
+
+    font, size, lines = fonts.fit(translated_text, x_max - x_min, y_max - y_min)
+    line_height = fonts.line_height(size) if len(lines) > 1 else 0
+    for i, line in enumerate(lines):
+        draw.text((x_min, y_min + i * line_height), line, fill="black", font=font)
 
 def draw_translation_overlay(image, lines_metadata, translated_texts):
     """
@@ -8,38 +24,30 @@ def draw_translation_overlay(image, lines_metadata, translated_texts):
     Pass 2: Draw all text.
     """
     draw = ImageDraw.Draw(image)
-    font_path = utils.get_font_path()
-    
+
     # PASS 1: Draw all background "patches"
-    for metadata in lines_metadata:
-        x_min, y_min, x_max, y_max = metadata['box']
-        draw.rectangle([x_min-2, y_min-2, x_max+2, y_max+2], fill="white")
+    draw_line_patches(draw, lines_metadata)
 
     # PASS 2: Draw all translated text on top of the patches
     for i, metadata in enumerate(lines_metadata):
         if i >= len(translated_texts): break
-        
-        x_min, y_min, x_max, y_max = metadata['box']
-        box_w = x_max - x_min
-        box_h = y_max - y_min
-        
-        translated_text = translated_texts[i].strip()
-        
-        # Robust font size calculation
-        font_size = max(12, int(box_h * 0.9))
-        try:
-            font = ImageFont.truetype(font_path, font_size) if font_path else ImageFont.load_default()
-        except:
-            font = ImageFont.load_default()
-        
-        # Auto-shrink logic
-        text_bbox = draw.textbbox((0, 0), translated_text, font=font)
-        text_w = text_bbox[2] - text_bbox[0]
-        if text_w > box_w and box_w > 0:
-            font_size = max(10, int(font_size * (box_w / text_w)))
-            try:
-                font = ImageFont.truetype(font_path, font_size) if font_path else ImageFont.load_default()
-            except:
-                font = ImageFont.load_default()
-
-        draw.text((x_min, y_min), translated_text, fill="black", font=font)
+        draw_line_text(draw, metadata, translated_texts[i])
+
+class OverlayScene:
+    """
+    A translated capture as data: the untouched screenshot plus line boxes and translations.
+    The UI paints it as a vector layer; render() produces a flattened PIL image (exports, tests).
+    font_family picks the Qt font of the painted layer (None: the widget font).
+    """
+    __slots__ = ('image', 'lines_metadata', 'translated_texts', 'font_family')
+
+    def __init__(self, image, lines_metadata=(), translated_texts=(), font_family=None):
+        self.image = image
+        self.lines_metadata = lines_metadata
+        self.translated_texts = translated_texts
+        self.font_family = font_family
+
+    def render(self):
+        image = self.image.copy()
+        draw_translation_overlay(image, self.lines_metadata, self.translated_texts)
+        return image
@@ -0,0 +1,170 @@
+import threading
+from collections import OrderedDict
+from PIL import ImageFont
+from utils import helpers as utils
+
+def wrap_text(text, size, width, measure):
+    """Greedy wrap on spaces (or between characters for unspaced scripts such as CJK). measure(text, size) -> width."""
+    if measure(text, size) <= width:
+        return [text]
+    tokens, sep = (text.split(" "), " ") if " " in text else (list(text), "")
+    lines, current = [], tokens[0]
+    for token in tokens[1:]:
+        candidate = current + sep + token
+        if measure(candidate, size) <= width:
+            current = candidate
+        else:
+            lines.append(current)
+            current = token
+    lines.append(current)
+    return lines
+
+def _fits(text, size, box_w, box_h, measure, line_height):
+    if measure(text, size) <= box_w:
+        # One line always "fits" vertically: its start size is derived from the box height
+        return [text]
+    if 2 * line_height(size) > box_h:
+        return None  # no room for a second line, don't bother wrapping
+    lines = wrap_text(text, size, box_w, measure)
+    if len(lines) * line_height(size) > box_h:
+        return None
+    if any(measure(line, size) > box_w for line in lines):
+        return None
+    return lines
+
+def fit_text(text, box_w, box_h, measure, line_height, min_size=10):
+    """
+    The overlay's text fitting policy, shared by the PIL renderer (FontManager) and the Qt layer
+    (ui.overlay_view), each passing its own measure(text, size) and line_height(size).
+    Returns (size, lines): the largest pixel size whose (wrapped) text fits in the box.
+    """
+    high = max(12, int(box_h * 0.9))
+    if box_w <= 0 or not text:
+        return high, [text]
+
+    width = measure(text, high)
+    if width <= box_w:
+        return high, [text]
+
+    # Bisection between min_size and high, seeded with the proportional single-line size
+    low, best = min_size, None
+    guess = max(min_size, min(high - 1, int(high * box_w / width)))
+    fitted = _fits(text, guess, box_w, box_h, measure, line_height)
+    if fitted is not None:
+        low, best = guess, fitted
+    else:
+        high = guess
+    while low < high - 1:
+        mid = (low + high) // 2
+        fitted = _fits(text, mid, box_w, box_h, measure, line_height)
+        if fitted is not None:
+            low, best = mid, fitted
+        else:
+            high = mid
+    if best is None:
+        # Nothing fits: overflow on one line at min_size rather than spill into the next line's box
+        best = _fits(text, low, box_w, box_h, measure, line_height) or [text]
+    return low, best
+
+class FontManager:
+    """
+    Shared font/text-layout cache for overlay rendering.
+    - the font path is probed once;
+    - loaded faces are kept per (path, size) in an LRU (a CJK .ttc costs milliseconds to open);
+    - text widths are cached per (size, text) and finished layouts per (text, box),
+      so re-rendered and repeated lines cost nothing;
+    - fit() finds the largest size that fits a box by bisection, wrapping when that helps.
+    """
+
+    def __init__(self, font_path=None, max_faces=32, max_extents=16384, max_layouts=4096, min_size=10):
+        self._font_path = font_path
+        self._path_resolved = font_path is not None
+        self.max_faces = max_faces
+        self.max_extents = max_extents
+        self.max_layouts = max_layouts
+        self.min_size = min_size
+        self._faces = OrderedDict()
+        self._extents = OrderedDict()
+        self._layouts = OrderedDict()
+        self._lock = threading.Lock()
+        self.stats = {"face_loads": 0, "face_hits": 0, "measures": 0, "measure_hits": 0}
+
+    @property
+    def font_path(self):
+        if not self._path_resolved:
+            self._font_path = utils.get_font_path()
+            self._path_resolved = True
+        return self._font_path
+
+    def _load(self, size):
+        path = self.font_path
+        try:
+            return ImageFont.truetype(path, size) if path else ImageFont.load_default(size=size)
+        except Exception:
+            return ImageFont.load_default()
+
+    def font(self, size):
+        key = (self.font_path, size)
+        with self._lock:
+            face = self._faces.get(key)
+            if face is not None:
+                self._faces.move_to_end(key)
+                self.stats["face_hits"] += 1
+                return face
+        face = self._load(size)
+        with self._lock:
+            self.stats["face_loads"] += 1
+            self._faces[key] = face
+            while len(self._faces) > self.max_faces:
+                self._faces.popitem(last=False)
+        return face
+
+    def text_width(self, text, size):
+        key = (self.font_path, size, text)
+        with self._lock:
+            width = self._extents.get(key)
+            if width is not None:
+                self._extents.move_to_end(key)
+                self.stats["measure_hits"] += 1
+                return width
+        width = self.font(size).getlength(text)
+        with self._lock:
+            self.stats["measures"] += 1
+            self._extents[key] = width
+            while len(self._extents) > self.max_extents:
+                self._extents.popitem(last=False)
+        return width
+
+    def line_height(self, size):
+        ascent, descent = self.font(size).getmetrics()
+        return ascent + descent
+
+    def wrap(self, text, size, width):
+        return wrap_text(text, size, width, self.text_width)
+
+    def _layout(self, text, box_w, box_h):
+        return fit_text(text, box_w, box_h, self.text_width, self.line_height, self.min_size)
+
+    def fit(self, text, box_w, box_h):
+        """Returns (font, size, lines): the largest size whose (wrapped) text fits in the box."""
+        key = (self.font_path, text, box_w, box_h)
+        with self._lock:
+            layout = self._layouts.get(key)
+            if layout is not None:
+                self._layouts.move_to_end(key)
+        if layout is None:
+            layout = self._layout(text, box_w, box_h)
+            with self._lock:
+                self._layouts[key] = layout
+                while len(self._layouts) > self.max_layouts:
+                    self._layouts.popitem(last=False)
+        size, lines = layout
+        return self.font(size), size, lines
+
+    def clear(self):
+        with self._lock:
+            self._faces.clear()
+            self._extents.clear()
+            self._layouts.clear()
+
+font_manager = FontManager()
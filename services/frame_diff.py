@@ -0,0 +1,47 @@
+import numpy as np
+
+class FrameDiffer:
+    """
+    Detects which tiles of a frame changed since the previous frame using per-pixel deltas.
+    Small deltas (compression noise, cursor blink anti-aliasing) are ignored via the thresholds.
+    """
+
+    def __init__(self, tile_size=32, pixel_threshold=24, min_changed_pixels=4):
+        self.tile_size = tile_size
+        self.pixel_threshold = pixel_threshold
+        self.min_changed_pixels = min_changed_pixels
+        self._previous = None
+
+    def reset(self):
+        self._previous = None
+
+    def diff(self, image):
+        """
+        Returns a boolean mask (tile_rows x tile_cols) of changed tiles.
+        The first frame (or a frame of a different size) is reported as fully changed.
+        """
+        gray = np.asarray(image.convert("L"), dtype=np.int16)
+        previous, self._previous = self._previous, gray
+
+        height, width = gray.shape
+        ts = self.tile_size
+        rows, cols = -(-height // ts), -(-width // ts)
+        if previous is None or previous.shape != gray.shape:
+            return np.ones((rows, cols), dtype=bool)
+
+        changed = np.abs(gray - previous) > self.pixel_threshold
+        padded = np.zeros((rows * ts, cols * ts), dtype=np.int32)
+        padded[:height, :width] = changed
+        counts = padded.reshape(rows, ts, cols, ts).sum(axis=(1, 3))
+        return counts >= self.min_changed_pixels
+
+def changed_bands(mask, tile_size, height):
+    """Merges changed tile rows into full-width pixel bands [(y0, y1), ...]."""
+    bands = []
+    for row in np.flatnonzero(mask.any(axis=1)):
+        y0, y1 = int(row) * tile_size, min(height, (int(row) + 1) * tile_size)
+        if bands and bands[-1][1] >= y0:
+            bands[-1] = (bands[-1][0], y1)
+        else:
+            bands.append((y0, y1))
+    return bands
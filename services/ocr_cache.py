@@ -0,0 +1,95 @@
+import hashlib
+import threading
+from collections import OrderedDict
+import numpy as np
+from PIL import Image
+
+def difference_hash(image, hash_size=16):
+    """Perceptual dHash: compares neighbouring pixels of a hash_size x hash_size grayscale thumbnail."""
+    thumb = np.asarray(image.convert("L").resize((hash_size + 1, hash_size), Image.Resampling.BILINEAR), dtype=np.int16)
+    bits = (thumb[:, :-1] > thumb[:, 1:]).ravel()
+    return int.from_bytes(np.packbits(bits).tobytes(), "big")
+
+def exact_hash(image):
+    digest = hashlib.blake2b(image.tobytes(), digest_size=16)
+    digest.update(f"{image.mode}{image.size}".encode())
+    return digest.hexdigest()
+
+class OCRCache:
+    """
+    Bounded LRU of OCR results keyed by image fingerprint.
+    By default only an identical image (exact content hash) is a hit: a thumbnail hash cannot see a
+    changed counter or a few edited characters, and serving their stale text is worse than re-running OCR.
+    With tolerance > 0, a same-sized image whose perceptual hash is within `tolerance` bits is a candidate,
+    accepted only if no pixel differs from the cached capture by more than `noise` gray levels
+    (compression or dithering noise, never a glyph change).
+    """
+
+    def __init__(self, max_entries=64, max_bytes=32 * 1024 * 1024, tolerance=0, hash_size=16, noise=8):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.tolerance = tolerance
+        self.hash_size = hash_size
+        self.noise = noise
+        self._entries = OrderedDict()  # exact hash -> (size, phash, data, nbytes, grayscale pixels or None)
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.stats = {"exact_hits": 0, "perceptual_hits": 0, "misses": 0, "evictions": 0}
+
+    def fingerprint(self, image):
+        return exact_hash(image), difference_hash(image, self.hash_size)
+
+    def _pixels(self, image):
+        return np.asarray(image.convert("L"), dtype=np.int16)
+
+    def get(self, image, fingerprint=None, perceptual=True):
+        """
+        Returns a copy of the cached OCR result for this image, or None.
+        perceptual=False restricts the lookup to exact hits (e.g. frames watched for changes).
+        """
+        key, phash = fingerprint or self.fingerprint(image)
+        pixels = None
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self.stats["exact_hits"] += 1
+            elif self.tolerance > 0 and perceptual:
+                for candidate_key, candidate in self._entries.items():
+                    if candidate[0] == image.size and (candidate[1] ^ phash).bit_count() <= self.tolerance:
+                        pixels = self._pixels(image) if pixels is None else pixels
+                        if np.abs(candidate[4] - pixels).max() > self.noise:
+                            continue
+                        key, entry = candidate_key, candidate
+                        self.stats["perceptual_hits"] += 1
+                        break
+
+            if entry is None:
+                self.stats["misses"] += 1
+                return None
+            self._entries.move_to_end(key)
+            return entry[2].copy()
+
+    def put(self, image, data, fingerprint=None):
+        if data is None:
+            return
+        key, phash = fingerprint or self.fingerprint(image)
+        # Perceptual candidates are confirmed against the cached pixels, so those are kept (and counted) too
+        pixels = self._pixels(image) if self.tolerance > 0 else None
+        nbytes = data.nbytes + (pixels.nbytes if pixels is not None else 0)
+        if nbytes > self.max_bytes:
+            return
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._bytes -= previous[3]
+            self._entries[key] = (image.size, phash, data.copy(), nbytes, pixels)
+            self._bytes += nbytes
+            while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self._bytes -= evicted[3]
+                self.stats["evictions"] += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
@@ -0,0 +1,148 @@
+import numpy as np
+
+COLUMNS = ('text', 'left', 'top', 'width', 'height', 'conf', 'block_num', 'line_num')
+_INT_COLUMNS = ('left', 'top', 'width', 'height', 'block_num', 'line_num')
+
+def _clean_text(value):
+    # Tesseract emits '' for non-word levels; DataFrames carry NaN instead
+    if value is None or (isinstance(value, float) and value != value):
+        return ""
+    return str(value).strip()
+
+class OcrResult:
+    """
+    Column-oriented OCR words (one NumPy array per column), shared by every OCR backend.
+    Replaces the pandas DataFrames the services used to return: same column names,
+    a fraction of the overhead, and vectorized line aggregation via lines().
+    """
+    __slots__ = COLUMNS
+
+    def __init__(self, text=(), left=(), top=(), width=(), height=(), conf=(), block_num=(), line_num=()):
+        self.text = np.asarray(text, dtype=object)
+        self.left = np.asarray(left, dtype=np.int32)
+        self.top = np.asarray(top, dtype=np.int32)
+        self.width = np.asarray(width, dtype=np.int32)
+        self.height = np.asarray(height, dtype=np.int32)
+        self.conf = np.asarray(conf, dtype=np.float32)
+        self.block_num = np.asarray(block_num, dtype=np.int32)
+        self.line_num = np.asarray(line_num, dtype=np.int32)
+
+    @classmethod
+    def from_columns(cls, data):
+        """
+        Builds a result from any column mapping (Tesseract's Output.DICT, a DataFrame, ...),
+        dropping entries without text.
+        """
+        if data is None:
+            return cls()
+        text = np.array([_clean_text(t) for t in data['text']], dtype=object)
+        keep = text != ""
+        columns = {'text': text[keep]}
+        for name in _INT_COLUMNS:
+            columns[name] = np.asarray(data[name], dtype=np.float64)[keep].astype(np.int32)
+        conf = data['conf'] if 'conf' in data else np.full(len(text), -1)
+        columns['conf'] = np.asarray(conf, dtype=np.float32)[keep]
+        return cls(**columns)
+
+    @classmethod
+    def from_tsv(cls, tsv):
+        """
+        Parses Tesseract TSV output (with or without the header row):
+        level page_num block_num par_num line_num word_num left top width height conf text
+        """
+        columns = {name: [] for name in COLUMNS}
+        for row in tsv.splitlines():
+            fields = row.split('\t')
+            if len(fields) < 12 or not fields[0].isdigit():
+                continue
+            columns['block_num'].append(int(fields[2]))
+            columns['line_num'].append(int(fields[4]))
+            columns['left'].append(int(fields[6]))
+            columns['top'].append(int(fields[7]))
+            columns['width'].append(int(fields[8]))
+            columns['height'].append(int(fields[9]))
+            columns['conf'].append(float(fields[10]))
+            columns['text'].append(fields[11])
+        return cls.from_columns(columns)
+
+    @classmethod
+    def from_dataframe(cls, df):
+        return cls.from_columns(df)
+
+    @classmethod
+    def concat(cls, results):
+        results = [r for r in results if r is not None and not r.empty]
+        if not results:
+            return cls()
+        return cls(**{name: np.concatenate([getattr(r, name) for r in results]) for name in COLUMNS})
+
+    def __len__(self):
+        return len(self.text)
+
+    def __getitem__(self, column):
+        return getattr(self, column)
+
+    @property
+    def empty(self):
+        return len(self.text) == 0
+
+    @property
+    def nbytes(self):
+        return sum(getattr(self, name).nbytes for name in _INT_COLUMNS + ('conf',)) + sum(len(t) for t in self.text)
+
+    def copy(self):
+        return OcrResult(**{name: getattr(self, name).copy() for name in COLUMNS})
+
+    def select(self, mask):
+        return OcrResult(**{name: getattr(self, name)[mask] for name in COLUMNS})
+
+    def offset(self, dx=0, dy=0):
+        """Returns a copy with boxes shifted, e.g. from crop space back to the full image."""
+        result = self.copy()
+        result.left += dx
+        result.top += dy
+        return result
+
+    def scale(self, factor):
+        """Returns a copy with boxes scaled by factor (e.g. 1 / preprocessing scale)."""
+        result = self.copy()
+        for name in ('left', 'top', 'width', 'height'):
+            setattr(result, name, np.rint(getattr(result, name) * factor).astype(np.int32))
+        return result
+
+    def lines(self):
+        """
+        Groups words by (block_num, line_num).
+        Returns (original_texts, lines_metadata) with one {'original', 'box'} entry per non-empty line.
+        """
+        if self.empty:
+            return [], []
+
+        # lexsort is stable, so words keep reading order inside each line
+        order = np.lexsort((self.line_num, self.block_num))
+        block, line = self.block_num[order], self.line_num[order]
+        starts = np.flatnonzero(np.r_[True, (block[1:] != block[:-1]) | (line[1:] != line[:-1])])
+
+        left, top = self.left[order], self.top[order]
+        x_min = np.minimum.reduceat(left, starts).tolist()
+        y_min = np.minimum.reduceat(top, starts).tolist()
+        x_max = np.maximum.reduceat(left + self.width[order], starts).tolist()
+        y_max = np.maximum.reduceat(top + self.height[order], starts).tolist()
+
+        words = self.text[order].tolist()
+        ends = starts[1:].tolist() + [len(words)]
+        original_texts, lines_metadata = [], []
+        for i, (start, end) in enumerate(zip(starts.tolist(), ends)):
+            line_text = " ".join(words[start:end]).strip()
+            if not line_text: continue
+            original_texts.append(line_text)
+            lines_metadata.append({
+                'original': line_text,
+                'box': (x_min[i], y_min[i], x_max[i], y_max[i])
+            })
+        return original_texts, lines_metadata
+
+    def to_dataframe(self):
+        """Compatibility adapter for code that still expects the old DataFrame output."""
+        import pandas as pd
+        return pd.DataFrame({name: getattr(self, name) for name in COLUMNS})
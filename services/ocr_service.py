@@ -1,5 +1,14 @@
+import threading
+from collections import OrderedDict
 import pytesseract
+from services.ocr_cache import OCRCache
+from services.ocr_result import OcrResult
+from services.tiled_ocr import TiledOCR
+from services.preprocess import Preprocessor
+from services.script_detection import ScriptDetector, DEFAULT_LANGUAGES
+from services.text_regions import TextRegionDetector
 from utils import helpers as utils
+from utils.tracing import tracer
 
 # Set tesseract cmd
 pytesseract.pytesseract.tesseract_cmd = utils.get_tesseract_cmd()
@@ -12,24 +21,142 @@ try:
 except ImportError:
     HAS_WINDOWS_OCR = False
 
+# Resident in-process Tesseract (optional 'tesserocr' binding)
+try:
+    from services.tesserocr_ocr import TesserocrOCR
+    HAS_TESSEROCR = True
+except ImportError:
+    HAS_TESSEROCR = False
+
+# 'auto' tries Windows OCR -> resident Tesseract -> Tesseract CLI; the others pin one engine
+STRATEGIES = ('auto', 'windows', 'tesserocr', 'tesseract')
+
+# Resident engines kept per language set (each holds its traineddata in memory)
+MAX_LANGUAGE_ENGINES = 3
+
+# Tesseract language code -> Windows OCR (BCP-47) language tag
+WINDOWS_LANGUAGE_TAGS = {
+    "eng": "en-US", "rus": "ru", "ell": "el", "ara": "ar", "heb": "he", "hin": "hi",
+    "tha": "th", "chi_sim": "zh-Hans", "jpn": "ja", "kor": "ko",
+}
+
 class OCRService:
-    def __init__(self):
+    def __init__(self, cache=None, strategy='auto', tiled_ocr=None, preprocessor=None, languages=None, detector=None,
+                 regions=None):
+        if strategy not in STRATEGIES:
+            raise ValueError(f"Unknown OCR strategy '{strategy}', expected one of {STRATEGIES}")
+        self.strategy = strategy
+        # 'auto': an OSD pre-pass picks the language set per capture; anything else (e.g. 'eng+jpn') is used as is
+        self.languages = languages or utils.get_ocr_languages()
+        self.detector = detector if detector is not None else (ScriptDetector() if self.languages == 'auto' else None)
+        self._engines = OrderedDict()  # (kind, languages) -> resident engine
+        # Repeat captures (and retranslations of the same image) skip the OCR stage entirely
+        self.cache = cache if cache is not None else OCRCache()
+        # Large captures are split into tiles and OCRed on a process pool (Tesseract CLI path)
+        self.tiled_ocr = tiled_ocr if tiled_ocr is not None else TiledOCR()
+        # Grayscale / contrast / x-height normalization before recognition
+        self.preprocessor = preprocessor if preprocessor is not None else Preprocessor()
+        # Tesseract only sees the boxes that look like text (pictures, video and empty space are skipped)
+        self.regions = regions if regions is not None else TextRegionDetector(enabled=utils.get_text_regions_enabled())
         self.windows_provider = None
-        if HAS_WINDOWS_OCR:
+        self.tesserocr_provider = None
+        self._engines_lock = threading.Lock()
+        if HAS_WINDOWS_OCR and strategy in ('auto', 'windows'):
             try:
                 self.windows_provider = WindowsOCR()
                 print("OCR Strategy: Used Windows Native OCR")
             except Exception as e:
                 print(f"Failed to initialize Windows OCR: {e}")
+        if HAS_TESSEROCR and strategy in ('auto', 'tesserocr'):
+            try:
+                self.tesserocr_provider = TesserocrOCR()
+                print("OCR Strategy: Resident Tesseract engine (tesserocr) available")
+            except Exception as e:
+                print(f"Failed to initialize tesserocr: {e}")
 
-    def perform_ocr(self, image):
+    def preprocess(self, image):
+        """Returns (processed image, scale) ready for recognition."""
+        return self.preprocessor.process(image)
+
+    def perform_ocr(self, image, prepare=None, perceptual=True):
         """
         Extracts words and their locations from an image.
-        Strategy: Try Windows Native OCR first -> Fallback to Tesseract.
+        Results are served from the OCR cache when an identical (or, if the cache allows it, a near-identical) image was seen before.
+        prepare() may supply the preprocess() output (e.g. memoized by core.pipeline); it is only called on a cache miss.
+        perceptual=False accepts exact cache hits only.
+        """
+        fingerprint = self.cache.fingerprint(image)
+        data = self.cache.get(image, fingerprint, perceptual=perceptual)
+        if data is not None:
+            return data
+
+        if prepare is not None:
+            processed, scale = prepare()
+        else:
+            with tracer.span("preprocess"):
+                processed, scale = self.preprocess(image)
+        with tracer.span("script"):
+            languages = self.languages_for(processed)
+        with tracer.span("recognize"):
+            data = self._recognize(processed, languages)
+        if data is not None and scale != 1.0:
+            # Map boxes back to the original capture for draw_translation_overlay
+            data = data.scale(1.0 / scale)
+        self.cache.put(image, data, fingerprint)
+        return data
+
+    def languages_for(self, image):
+        """Tesseract language set to recognize this (preprocessed) image with."""
+        if self.detector is None:
+            return DEFAULT_LANGUAGES if self.languages == 'auto' else self.languages
+        return self.detector.detect(image)
+
+    def _engine(self, kind, languages, factory):
+        """
+        Resident engine for a language set, created once on first use (under the lock, so concurrent misses
+        do not each load the traineddata). The least recently used one is dropped, not closed: another thread
+        may be about to run it, and it is freed once unreferenced.
+        """
+        key = (kind, languages)
+        with self._engines_lock:
+            engine = self._engines.get(key)
+            if engine is not None:
+                self._engines.move_to_end(key)
+                return engine
+            engine = self._engines[key] = factory()
+            while len(self._engines) > MAX_LANGUAGE_ENGINES:
+                self._engines.popitem(last=False)
+            return engine
+
+    def _windows_engine(self, languages):
+        # The user-profile engine already covers the default set; others get an engine for the detected language
+        if languages == DEFAULT_LANGUAGES:
+            return self.windows_provider
+        tag = WINDOWS_LANGUAGE_TAGS.get(languages.split("+")[0])
+        if tag is None:
+            return self.windows_provider
+        try:
+            return self._engine("windows", languages, lambda: WindowsOCR(language=tag))
+        except Exception as e:
+            print(f"Windows OCR has no '{tag}' engine ({e}), using the profile languages.")
+            return self.windows_provider
+
+    def _tesserocr_engine(self, languages):
+        if languages == DEFAULT_LANGUAGES:
+            return self.tesserocr_provider
+        try:
+            return self._engine("tesserocr", languages, lambda: TesserocrOCR(lang=languages))
+        except Exception as e:
+            print(f"tesserocr cannot load '{languages}' ({e}), using '{DEFAULT_LANGUAGES}'.")
+            return self.tesserocr_provider
+
+    def _recognize(self, image, languages=DEFAULT_LANGUAGES):
+        """
+        Strategy: Try Windows Native OCR first -> resident Tesseract -> Tesseract CLI.
         """
         # Strategy 1: Windows Native OCR
         if self.windows_provider:
-            data = self.windows_provider.perform_ocr(image)
+            data = self._windows_engine(languages).perform_ocr(image)
             if data is not None and not data.empty:
                 return data
             # If Windows OCR returns None/Empty (unexpected failure), fall through to Tesseract? 
@@ -38,21 +165,47 @@ class OCRService:
             if data is None: 
                 print("Windows OCR failed (None), falling back to Tesseract.")
             else:
-                return data # Return empty dataframe if nothing found
+                return data # Return empty result if nothing found
 
-        # Strategy 2: Tesseract (Fallback)
+        # Tesseract paths: [] means no text anywhere, None means one full-page pass
+        with tracer.span("regions"):
+            regions = self.regions.detect(image)
+        if regions is not None and not regions:
+            return OcrResult()
+
+        # Strategy 2: Resident Tesseract engine (no process spawn / model reload per capture)
+        if self.tesserocr_provider:
+            engine = self._tesserocr_engine(languages)
+            data = engine.perform_ocr(image) if regions is None else engine.perform_ocr_regions(image, regions)
+            if data is not None:
+                return data
+            print("tesserocr failed (None), falling back to Tesseract CLI.")
+
+        # Strategy 3: Tesseract CLI (Fallback)
         try:
+            if regions is not None:
+                return self.tiled_ocr.perform_ocr_regions(image, regions, tesseract_cmd=pytesseract.pytesseract.tesseract_cmd, lang=languages)
+            if self.tiled_ocr.should_tile(image):
+                return self.tiled_ocr.perform_ocr(image, tesseract_cmd=pytesseract.pytesseract.tesseract_cmd, lang=languages)
+
             # Get detailed OCR data (including bounding boxes)
             # Use PSM 3 (Auto segmentation) to handle multiple text blocks/columns correctly
-            data = pytesseract.image_to_data(image, lang='eng', config='--psm 3', output_type=pytesseract.Output.DATAFRAME)
-            
-            # Filter out empty text detections and cast to string
-            if data is not None and not data.empty:
-                data = data[data.text.notna()]
-                data['text'] = data['text'].astype(str)
-                data = data[data['text'].str.strip() != ""]
-            
-            return data
+            data = pytesseract.image_to_data(image, lang=languages, config='--psm 3', output_type=pytesseract.Output.DICT)
+
+            # Empty text detections (page/block/paragraph levels) are dropped while building the result
+            return OcrResult.from_columns(data)
         except Exception as e:
             print(f"OCR Service (Tesseract) Error: {e}")
             return None
+
+def extract_lines(data):
+    """
+    Groups OCR words into lines.
+    Returns (original_texts, lines_metadata) where each metadata entry holds the line text and its bounding box.
+    """
+    if data is None:
+        return [], []
+    if not isinstance(data, OcrResult):
+        # DataFrame / dict adapter for callers that still produce the old output
+        data = OcrResult.from_columns(data)
+    return data.lines()
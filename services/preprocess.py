@@ -0,0 +1,126 @@
+import numpy as np
+from PIL import Image
+
+# ITU-R BT.601 luma weights
+_LUMA = np.array([0.299, 0.587, 0.114], dtype=np.float32)
+
+def to_grayscale(image):
+    if image.mode == "L":
+        return np.asarray(image, dtype=np.float32)
+    return np.asarray(image.convert("RGB"), dtype=np.float32) @ _LUMA
+
+def normalize_contrast(gray, low_pct=0.1, high_pct=99.9):
+    """Stretches the [low_pct, high_pct] percentile range to 0..255 (anti-aliased / washed-out text)."""
+    low, high = np.percentile(gray, (low_pct, high_pct))
+    if high - low < 32:
+        # Sparse text: the percentiles only saw background, fall back to the full range
+        low, high = gray.min(), gray.max()
+    if high - low < 1:
+        return gray
+    return np.clip((gray - low) * (255.0 / (high - low)), 0, 255)
+
+def otsu_threshold(gray):
+    """Otsu's threshold computed from the 256-bin histogram."""
+    return otsu_from_histogram(np.bincount(gray.astype(np.uint8).ravel(), minlength=256))
+
+def otsu_from_histogram(hist):
+    """Otsu's threshold for a 256-bin histogram (e.g. PIL's Image.histogram() of an 'L' image)."""
+    hist = np.asarray(hist, dtype=np.float64)
+    weight_bg = np.cumsum(hist)
+    weight_fg = weight_bg[-1] - weight_bg
+    mean_cum = np.cumsum(hist * np.arange(256))
+    with np.errstate(divide="ignore", invalid="ignore"):
+        mean_bg = mean_cum / weight_bg
+        mean_fg = (mean_cum[-1] - mean_cum) / weight_fg
+        between = weight_bg * weight_fg * (mean_bg - mean_fg) ** 2
+    return int(np.nanargmax(between)) if np.isfinite(between).any() else 127
+
+def estimate_text_height(ink):
+    """Median height (px) of horizontal runs of rows that contain ink, i.e. the typical line height."""
+    rows = ink.sum(axis=1) >= 2
+    if not rows.any():
+        return None
+    edges = np.flatnonzero(np.diff(np.r_[0, rows.astype(np.int8), 0]))
+    heights = edges[1::2] - edges[0::2]
+    heights = heights[heights >= 3]  # ignore rules, underlines and noise
+    return float(np.median(heights)) if heights.size else None
+
+def _runs(mask):
+    """Runs of True along each row of a 2-D mask: (lengths, flat mask of the row-padded array), in row-major order."""
+    padded = np.zeros((mask.shape[0], mask.shape[1] + 2), dtype=bool)
+    padded[:, 1:-1] = mask
+    flat = padded.ravel()
+    edges = np.flatnonzero(np.diff(flat.astype(np.int8)))
+    return edges[1::2] - edges[0::2], flat
+
+def estimate_glyph_height(ink, min_stems=12, agreement=0.6):
+    """
+    Typical height (px) of vertical glyph strokes, roughly the x-height: ink runs down one column that are at
+    least twice as long as the ink is wide along them (stems of n, m, l, d...). Solid panels, pictures and rules
+    are not thin and tall, and line layout (columns, staggered lines) does not enter. None when there are too
+    few stems or they disagree, i.e. no clear text to measure.
+    """
+    height, width = ink.shape
+    # Width of the horizontal ink run every pixel belongs to
+    lengths, flat = _runs(ink)
+    run_width = np.zeros(flat.size, dtype=np.int32)
+    run_width[flat] = np.repeat(lengths, lengths)
+    run_width = run_width.reshape(height, width + 2)[:, 1:-1]
+
+    runs, flat_t = _runs(ink.T)
+    if not runs.size:
+        return None
+    widths_t = np.zeros((width, height + 2), dtype=np.int32)
+    widths_t[:, 1:-1] = run_width.T
+    mean_width = np.add.reduceat(widths_t.ravel()[flat_t], np.r_[0, np.cumsum(runs)[:-1]]) / runs
+    stems = runs[(runs >= 3) & (2 * mean_width <= runs)]
+    if stems.size < min_stems:
+        return None
+    median = float(np.median(stems))
+    if np.mean((stems >= median / 2) & (stems <= median * 2)) < agreement:
+        return None
+    return median
+
+class Preprocessor:
+    """
+    Prepares screen captures for OCR: grayscale, contrast normalization, dark-mode inversion,
+    resolution normalization to a target x-height and optional binarization.
+    process() returns the scale applied so boxes can be mapped back to the original image.
+    """
+
+    def __init__(self, target_x_height=12, min_scale=0.5, max_scale=3.0, binarize=True, enabled=True):
+        self.target_x_height = target_x_height
+        self.min_scale = min_scale
+        self.max_scale = max_scale
+        self.binarize = binarize
+        self.enabled = enabled
+
+    def process(self, image):
+        if not self.enabled or image.size[0] < 2 or image.size[1] < 2:
+            return image, 1.0
+
+        gray = normalize_contrast(to_grayscale(image))
+        threshold = otsu_threshold(gray)
+        # Tesseract expects dark text on a light background
+        if (gray > threshold).mean() < 0.5:
+            gray = 255.0 - gray
+            threshold = 255 - threshold
+
+        scale = 1.0
+        # Measured on glyph strokes, not line bands: panels or pictures beside the text must not
+        # change its scale. No estimate (no clear text): the capture keeps its own resolution.
+        x_height = estimate_glyph_height(gray < threshold)
+        if x_height:
+            scale = float(np.clip(self.target_x_height / x_height, self.min_scale, self.max_scale))
+            if 0.8 <= scale <= 1.25:
+                scale = 1.0  # close enough; resampling would cost more than it gains
+
+        result = Image.fromarray(gray.astype(np.uint8), "L")
+        if scale != 1.0:
+            size = (max(1, round(image.size[0] * scale)), max(1, round(image.size[1] * scale)))
+            result = result.resize(size, Image.Resampling.LANCZOS if scale < 1 else Image.Resampling.BICUBIC)
+
+        if self.binarize:
+            pixels = np.asarray(result)
+            result = Image.fromarray(np.where(pixels > otsu_threshold(pixels), 255, 0).astype(np.uint8), "L")
+        return result, scale
@@ -0,0 +1,56 @@
+"""
+Several screen regions captured as one job: one grab of their bounding box, per-region OCR on crops
+of that grab, and all lines translated together. Region sets can be saved as a layout (JSON) and
+captured again without drawing them.
+
+Regions are monitor dicts ({'top', 'left', 'width', 'height'}, screen coordinates); boxes are
+(x0, y0, x1, y1) tuples in the coordinates of the bounding-box grab.
+"""
+import json
+import os
+
+LAYOUT_VERSION = 1
+KEYS = ("top", "left", "width", "height")
+
+def bounding_region(regions):
+    """The smallest monitor dict containing every region."""
+    left = min(region["left"] for region in regions)
+    top = min(region["top"] for region in regions)
+    right = max(region["left"] + region["width"] for region in regions)
+    bottom = max(region["top"] + region["height"] for region in regions)
+    return {"top": top, "left": left, "width": right - left, "height": bottom - top}
+
+def region_boxes(regions, bounds=None):
+    """Each region as a box inside the grab of bounds (default: their bounding region)."""
+    bounds = bounds or bounding_region(regions)
+    return [(region["left"] - bounds["left"], region["top"] - bounds["top"],
+             region["left"] - bounds["left"] + region["width"], region["top"] - bounds["top"] + region["height"])
+            for region in regions]
+
+def region_of(box, boxes):
+    """Index of the region box holding the centre of a line box, or None."""
+    x = (box[0] + box[2]) / 2
+    y = (box[1] + box[3]) / 2
+    for index, (x0, y0, x1, y1) in enumerate(boxes):
+        if x0 <= x < x1 and y0 <= y < y1:
+            return index
+    return None
+
+def save_layout(path, regions):
+    """Writes a region set as a reusable layout."""
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    layout = {"version": LAYOUT_VERSION, "regions": [{key: int(region[key]) for key in KEYS} for region in regions]}
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(layout, f, indent=2)
+
+def load_layout(path):
+    """Reads a saved region set. Raises OSError when missing, ValueError when malformed."""
+    with open(path, encoding="utf-8") as f:
+        layout = json.load(f)
+    try:
+        regions = [{key: int(region[key]) for key in KEYS} for region in layout["regions"]]
+    except (KeyError, TypeError) as e:
+        raise ValueError(f"invalid layout {path}: {e}") from e
+    if not regions or any(region["width"] <= 0 or region["height"] <= 0 for region in regions):
+        raise ValueError(f"invalid layout {path}: empty region")
+    return regions
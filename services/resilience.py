@@ -0,0 +1,310 @@
+"""
+Client-side protection for translation providers: a token bucket that paces requests below the
+provider's quota, retries with exponential backoff that honours Retry-After, and a circuit breaker
+that stops calling a failing provider and fails over to another one.
+"""
+import asyncio
+import email.utils
+import random
+import threading
+import time
+
+from services.base_translator import BaseTranslator, TranslationError, RateLimitedError, CircuitOpenError
+
+def parse_retry_after(value):
+    """Retry-After header (delta-seconds or HTTP-date) -> seconds, or None when absent/invalid."""
+    if value is None:
+        return None
+    value = str(value).strip()
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        when = email.utils.parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if when is None:
+        return None
+    return max(0.0, when.timestamp() - time.time())
+
+class TokenBucket:
+    """
+    Allows `rate` requests per second with bursts up to `capacity`. acquire() blocks until a token is free.
+    Adaptive: penalize() (called on a 429) halves the rate, which then recovers by 10% per successful request.
+    """
+
+    def __init__(self, rate, capacity=None, min_rate=0.2, clock=time.monotonic, sleep=time.sleep):
+        self.max_rate = float(rate)
+        self.rate = float(rate)
+        self.min_rate = min(min_rate, self.rate)
+        self.capacity = float(capacity or max(1.0, rate))
+        self.tokens = self.capacity
+        self.clock = clock
+        self.sleep = sleep
+        self._updated = clock()
+        self._lock = threading.Lock()
+
+    def _refill(self):
+        now = self.clock()
+        self.tokens = min(self.capacity, self.tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def reserve(self):
+        """Takes a token and returns how long the caller must wait before using it."""
+        with self._lock:
+            self._refill()
+            self.tokens -= 1
+            return 0.0 if self.tokens >= 0 else -self.tokens / self.rate
+
+    def acquire(self):
+        wait = self.reserve()
+        if wait > 0:
+            self.sleep(wait)
+        return wait
+
+    def penalize(self, retry_after=None):
+        with self._lock:
+            self._refill()
+            self.rate = max(self.min_rate, self.rate / 2)
+            if retry_after:
+                # Nobody gets a token before the server said we may come back
+                self.tokens = min(self.tokens, -retry_after * self.rate)
+
+    def reward(self):
+        with self._lock:
+            self.rate = min(self.max_rate, self.rate * 1.1)
+
+class CircuitBreaker:
+    """
+    closed -> open after `failure_threshold` consecutive failures; open -> half-open after `reset_timeout`
+    seconds, letting one trial request through; its outcome closes or re-opens the circuit.
+    """
+
+    def __init__(self, failure_threshold=5, reset_timeout=30.0, clock=time.monotonic):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.clock = clock
+        self.state = "closed"
+        self.failures = 0
+        self._opened_at = 0.0
+        self._trial_running = False
+        self._lock = threading.Lock()
+
+    def allow(self):
+        with self._lock:
+            if self.state == "closed":
+                return True
+            if self.state == "open" and self.clock() - self._opened_at >= self.reset_timeout:
+                self.state = "half-open"
+                self._trial_running = False
+            if self.state == "half-open" and not self._trial_running:
+                self._trial_running = True
+                return True
+            return False
+
+    def retry_in(self):
+        """Seconds until the next trial request is allowed (0 when closed)."""
+        if self.state == "closed":
+            return 0.0
+        return max(0.0, self.reset_timeout - (self.clock() - self._opened_at))
+
+    def record_success(self):
+        with self._lock:
+            self.state = "closed"
+            self.failures = 0
+            self._trial_running = False
+
+    def release_trial(self):
+        """Frees the half-open trial slot when the trial ended without an outcome (e.g. it was cancelled)."""
+        with self._lock:
+            if self.state == "half-open":
+                self._trial_running = False
+
+    def record_failure(self):
+        with self._lock:
+            self.failures += 1
+            if self.state == "half-open" or self.failures >= self.failure_threshold:
+                self.state = "open"
+                self._opened_at = self.clock()
+                self._trial_running = False
+
+class ProviderGuard:
+    """Rate limiter and circuit breaker of one provider, shared by every wrapper around it."""
+
+    def __init__(self, rate=None, burst=None, failure_threshold=5, reset_timeout=30.0,
+                 clock=time.monotonic, sleep=time.sleep):
+        self.bucket = TokenBucket(rate, burst, clock=clock, sleep=sleep) if rate else None
+        self.breaker = CircuitBreaker(failure_threshold, reset_timeout, clock=clock)
+        self.stats = {"calls": 0, "retries": 0, "rate_limited": 0, "failures": 0, "rejected": 0, "throttled_s": 0.0}
+
+class ResilientTranslator(BaseTranslator):
+    """
+    Wraps a provider with its ProviderGuard: paced calls, up to `max_retries` retries of retryable errors
+    (exponential backoff with full jitter, or the server's Retry-After when longer), and failover to
+    `fallback` while the primary's circuit is open or after its retries are exhausted.
+    Errors are raised as TranslationError subclasses, never returned as text.
+    """
+
+    def __init__(self, translator, guard=None, fallback=None, fallback_guard=None, max_retries=3,
+                 base_delay=0.5, max_delay=20.0, sleep=time.sleep):
+        self.translator = translator
+        self.guard = guard or ProviderGuard()
+        self.fallback = fallback
+        self.fallback_guard = fallback_guard or (ProviderGuard() if fallback is not None else None)
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.sleep = sleep
+        self.name = translator.name
+        self.source_lang = translator.source_lang
+        self.target_lang = translator.target_lang
+        self.stream_chunk_lines = translator.stream_chunk_lines
+        self.native_async = translator.native_async
+        self.stats = {"failovers": 0}
+
+    def with_source(self, source_lang):
+        clone = super().with_source(source_lang)
+        if clone is not self:
+            clone.translator = self.translator.with_source(source_lang)
+            clone.fallback = self.fallback.with_source(source_lang) if self.fallback is not None else None
+        return clone
+
+    def _delay(self, attempt, error):
+        delay = random.uniform(0, min(self.max_delay, self.base_delay * 2 ** attempt))
+        if error.retry_after is not None:
+            delay = max(delay, min(error.retry_after, self.max_delay))
+        return delay
+
+    def _admit(self, translator, guard):
+        """Raises CircuitOpenError when the circuit is open, so the provider is not called."""
+        if not guard.breaker.allow():
+            guard.stats["rejected"] += 1
+            raise CircuitOpenError(f"{translator.name} is unavailable, retry in {guard.breaker.retry_in():.0f} s",
+                                   provider=translator.name, retry_after=guard.breaker.retry_in())
+
+    def _failed(self, translator, guard, error, attempt):
+        """Books a TranslationError; returns the backoff before the next attempt, or raises it when final."""
+        error.provider = error.provider or translator.name
+        if isinstance(error, RateLimitedError):
+            guard.stats["rate_limited"] += 1
+            if guard.bucket is not None:
+                guard.bucket.penalize(error.retry_after)
+        if not error.retryable or attempt >= self.max_retries:
+            guard.stats["failures"] += 1
+            guard.breaker.record_failure()
+            raise error
+        guard.stats["retries"] += 1
+        return self._delay(attempt, error)
+
+    def _succeeded(self, guard):
+        guard.breaker.record_success()
+        if guard.bucket is not None:
+            guard.bucket.reward()
+
+    def _call(self, translator, guard, call):
+        """Runs call(translator) under guard. Raises CircuitOpenError without calling when the circuit is open."""
+        self._admit(translator, guard)
+        attempt = 0
+        try:
+            while True:
+                if guard.bucket is not None:
+                    guard.stats["throttled_s"] += guard.bucket.acquire()
+                guard.stats["calls"] += 1
+                try:
+                    result = call(translator)
+                except TranslationError as e:
+                    self.sleep(self._failed(translator, guard, e, attempt))
+                    attempt += 1
+                    continue
+                except Exception:
+                    guard.breaker.record_failure()
+                    raise
+                self._succeeded(guard)
+                return result
+        finally:
+            # No-op once the outcome was recorded; otherwise (interrupted) the next call may try again
+            guard.breaker.release_trial()
+
+    async def _call_async(self, translator, guard, call):
+        """_call() for a coroutine call(translator): pacing and backoff wait on the event loop."""
+        self._admit(translator, guard)
+        attempt = 0
+        try:
+            while True:
+                if guard.bucket is not None:
+                    wait = guard.bucket.reserve()
+                    if wait > 0:
+                        guard.stats["throttled_s"] += wait
+                        await asyncio.sleep(wait)
+                guard.stats["calls"] += 1
+                try:
+                    result = await call(translator)
+                except TranslationError as e:
+                    await asyncio.sleep(self._failed(translator, guard, e, attempt))
+                    attempt += 1
+                    continue
+                except Exception:
+                    guard.breaker.record_failure()
+                    raise
+                self._succeeded(guard)
+                return result
+        finally:
+            # A cancelled trial (superseded capture) raises CancelledError, which records no outcome
+            guard.breaker.release_trial()
+
+    def _can_fail_over(self, error):
+        if self.fallback is None or not (error.retryable or isinstance(error, CircuitOpenError)):
+            return False
+        self.stats["failovers"] += 1
+        print(f"Translation failover: {self.name} -> {self.fallback.name} ({error})")
+        return True
+
+    def _with_failover(self, call):
+        try:
+            return self._call(self.translator, self.guard, call)
+        except TranslationError as e:
+            if not self._can_fail_over(e):
+                raise
+            return self._call(self.fallback, self.fallback_guard, call)
+
+    async def _with_failover_async(self, call):
+        try:
+            return await self._call_async(self.translator, self.guard, call)
+        except TranslationError as e:
+            if not self._can_fail_over(e):
+                raise
+            return await self._call_async(self.fallback, self.fallback_guard, call)
+
+    def failover_count(self):
+        return self.stats["failovers"]
+
+    def translate(self, text: str) -> str:
+        return self._with_failover(lambda translator: translator.translate(text))
+
+    async def translate_async(self, text: str) -> str:
+        return await self._with_failover_async(lambda translator: translator.translate_async(text))
+
+    def stream_text(self, text):
+        """
+        Token deltas from the primary. The request is retried (or failed over) only until the first delta
+        arrives; an error mid-stream is raised, as the partial output has already been consumed.
+        A provider without stream_text answers in a single delta.
+        """
+        def start(translator):
+            if not hasattr(translator, "stream_text"):
+                return iter([translator.translate(text)]), None
+            stream = translator.stream_text(text)
+            # Pull the first delta inside the guarded call so connection errors and 429s are retried
+            return stream, next(stream, None)
+
+        stream, first = self._with_failover(start)
+        if first is not None:
+            yield first
+        yield from stream
+
+    def warm_up(self):
+        self.translator.warm_up()
+
+    def close(self):
+        self.translator.close()
@@ -0,0 +1,166 @@
+"""
+Script detection, so each capture is recognized with only the traineddata it needs
+(a single extra language pack roughly doubles Tesseract's time; all of them at once is far worse).
+
+Before OCR: Tesseract's orientation-and-script detection (OSD) picks the language set.
+After OCR: the recognized text's Unicode scripts give the translator its source language.
+"""
+import threading
+from bisect import bisect_right
+from collections import Counter
+from utils import helpers as utils
+
+# Tesseract OSD script name -> (Tesseract language set, translator source language)
+# English stays in every set: UI text mixes in Latin labels, numbers and units
+SCRIPT_LANGUAGES = {
+    "Latin": ("eng", None),  # English, French, ... cannot be told apart by script: providers auto-detect
+    "Cyrillic": ("rus+eng", "ru"),
+    "Greek": ("ell+eng", "el"),
+    "Arabic": ("ara+eng", "ar"),
+    "Hebrew": ("heb+eng", "iw"),
+    "Devanagari": ("hin+eng", "hi"),
+    "Thai": ("tha+eng", "th"),
+    "Han": ("chi_sim+eng", "zh-CN"),
+    "Japanese": ("jpn+eng", "ja"),
+    "Katakana": ("jpn+eng", "ja"),
+    "Hiragana": ("jpn+eng", "ja"),
+    "Hangul": ("kor+eng", "ko"),
+    "Korean": ("kor+eng", "ko"),
+}
+DEFAULT_LANGUAGES = "eng"
+
+# (first code point, last code point, script), sorted
+_RANGES = sorted([
+    (0x00C0, 0x024F, "Latin"),
+    (0x0370, 0x03FF, "Greek"),
+    (0x0400, 0x052F, "Cyrillic"),
+    (0x0590, 0x05FF, "Hebrew"),
+    (0x0600, 0x06FF, "Arabic"),
+    (0x0900, 0x097F, "Devanagari"),
+    (0x0E00, 0x0E7F, "Thai"),
+    (0x1100, 0x11FF, "Hangul"),
+    (0x3040, 0x309F, "Hiragana"),
+    (0x30A0, 0x30FF, "Katakana"),
+    (0x3400, 0x4DBF, "Han"),
+    (0x4E00, 0x9FFF, "Han"),
+    (0xAC00, 0xD7AF, "Hangul"),
+    (0xFF66, 0xFF9F, "Katakana"),
+])
+_STARTS = [start for start, _, _ in _RANGES]
+
+def char_script(char):
+    """Script of one character, or None for digits, punctuation and unknown blocks."""
+    if char.isascii():
+        return "Latin" if char.isalpha() else None
+    code = ord(char)
+    index = bisect_right(_STARTS, code) - 1
+    if index >= 0 and code <= _RANGES[index][1]:
+        return _RANGES[index][2]
+    return None
+
+def detect_text_script(texts, min_share=0.15):
+    """
+    Dominant script of recognized text. Kana anywhere among Han characters means Japanese.
+    A non-Latin script wins as soon as it holds min_share of the letters (Latin labels are common in any UI).
+    """
+    counts = Counter(script for text in texts for script in map(char_script, text) if script)
+    if not counts:
+        return None
+    kana = counts.pop("Hiragana", 0) + counts.pop("Katakana", 0)
+    if kana:
+        counts["Japanese"] = kana + counts.pop("Han", 0)
+    letters = sum(counts.values())
+    others = [(count, script) for script, count in counts.items() if script != "Latin"]
+    if others:
+        count, script = max(others)
+        if count >= min_share * letters:
+            return script
+    return "Latin"
+
+def detect_text_language(texts):
+    """Translator source language for the recognized text, or None (let the provider auto-detect)."""
+    script = detect_text_script(texts)
+    return SCRIPT_LANGUAGES.get(script, (None, None))[1]
+
+class ScriptDetector:
+    """
+    OSD pre-pass on the (preprocessed) capture. Uses a resident tesserocr OSD engine when the binding is
+    installed, else the Tesseract CLI. Language packs that are not installed are dropped from the result.
+    osd(image) -> (script name, confidence) can be injected (tests, other engines).
+    """
+
+    def __init__(self, min_confidence=2.0, osd=None, installed=None):
+        self.min_confidence = min_confidence
+        self._osd = osd
+        self._installed = set(installed) if installed is not None else None
+        self._api = None
+        self._lock = threading.Lock()
+        self.stats = {"detections": 0, "fallbacks": 0}
+
+    def installed_languages(self):
+        if self._installed is None:
+            try:
+                try:
+                    import tesserocr
+                    tessdata = utils.get_tessdata_dir()
+                    self._installed = set((tesserocr.get_languages(tessdata) if tessdata else tesserocr.get_languages())[1])
+                except ImportError:
+                    import pytesseract
+                    self._installed = set(pytesseract.get_languages(config=''))
+            except Exception as e:
+                print(f"Script detection: cannot list Tesseract languages ({e})")
+                self._installed = set()
+        return self._installed
+
+    def _detect_osd(self, image):
+        if self._osd is not None:
+            return self._osd(image)
+        try:
+            from tesserocr import PyTessBaseAPI, PSM
+        except ImportError:
+            import pytesseract
+            osd = pytesseract.image_to_osd(image, output_type=pytesseract.Output.DICT)
+            return osd.get('script'), float(osd.get('script_conf', 0))
+        with self._lock:
+            if self._api is None:
+                kwargs = {'lang': 'osd', 'psm': PSM.OSD_ONLY}
+                tessdata = utils.get_tessdata_dir()
+                if tessdata:
+                    kwargs['path'] = tessdata
+                self._api = PyTessBaseAPI(**kwargs)
+            self._api.SetImage(image)
+            osd = self._api.DetectOrientationScript()
+        if not osd:
+            return None, 0.0
+        return osd.get('script_name'), float(osd.get('script_conf', 0))
+
+    def languages_for(self, script):
+        """Tesseract language set for an OSD script name, restricted to the installed packs."""
+        languages = SCRIPT_LANGUAGES.get(script, (DEFAULT_LANGUAGES, None))[0]
+        installed = self.installed_languages()
+        kept = [lang for lang in languages.split("+") if lang in installed]
+        return "+".join(kept) if kept else DEFAULT_LANGUAGES
+
+    def detect(self, image):
+        """Returns the Tesseract language string for this image ('eng' when unsure)."""
+        installed = self.installed_languages()
+        if self._osd is None and ("osd" not in installed or not installed - {"eng", "osd", "equ", "snum"}):
+            # Nothing to choose between (or no OSD model): skip the pre-pass entirely
+            return DEFAULT_LANGUAGES
+        self.stats["detections"] += 1
+        try:
+            script, confidence = self._detect_osd(image)
+        except Exception as e:
+            # Too little text for OSD, no osd.traineddata, no tesseract...
+            print(f"Script detection skipped: {str(e)[:80]}")
+            script, confidence = None, 0.0
+        if not script or confidence < self.min_confidence:
+            self.stats["fallbacks"] += 1
+            return DEFAULT_LANGUAGES
+        return self.languages_for(script)
+
+    def close(self):
+        with self._lock:
+            if self._api is not None:
+                self._api.End()
+                self._api = None
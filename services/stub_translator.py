@@ -0,0 +1,40 @@
+import asyncio
+import time
+from services.base_translator import BaseTranslator
+
+class StubTranslatorProvider(BaseTranslator):
+    """
+    Offline provider for benchmarks and tests: "translates" by upper-casing every line
+    (so [[n]] markers survive) after a configurable request latency.
+    latency is paid once per request, per_line_latency once per line in it.
+    translate_async() waits on the event loop instead of a thread.
+    """
+    name = "stub"
+    native_async = True
+
+    def __init__(self, latency=0.0, per_line_latency=0.0):
+        self.latency = latency
+        self.per_line_latency = per_line_latency
+        self.requests = 0
+
+    def _delay(self, text):
+        self.requests += 1
+        return self.latency + self.per_line_latency * (text.count("\n") + 1)
+
+    def translate(self, text: str) -> str:
+        delay = self._delay(text)
+        if delay > 0:
+            time.sleep(delay)
+        return text.upper()
+
+    async def translate_async(self, text: str) -> str:
+        delay = self._delay(text)
+        if delay > 0:
+            await asyncio.sleep(delay)
+        return text.upper()
+
+    def warm_up(self):
+        pass
+
+    def close(self):
+        pass
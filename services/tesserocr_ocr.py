@@ -0,0 +1,61 @@
+import threading
+from PIL import Image
+from tesserocr import PyTessBaseAPI, PSM
+from services.ocr_result import OcrResult
+from services.text_regions import crop_regions, merge_regions
+from utils import helpers as utils
+
+class TesserocrOCR:
+    """
+    In-process Tesseract via the tesserocr binding.
+    The engine (and its traineddata) stays loaded between captures, so there is no temp file,
+    no process spawn and no model reload per capture as with pytesseract.
+    """
+
+    def __init__(self, lang='eng', psm=PSM.AUTO):
+        # PSM.AUTO matches the CLI's '--psm 3' used by the pytesseract path
+        self.psm = psm
+        kwargs = {'lang': lang, 'psm': psm}
+        tessdata = utils.get_tessdata_dir()
+        if tessdata:
+            kwargs['path'] = tessdata
+        self.api = PyTessBaseAPI(**kwargs)
+        # A TessBaseAPI instance is not re-entrant
+        self._lock = threading.Lock()
+
+    def perform_ocr(self, image: Image.Image) -> OcrResult:
+        """
+        Recognizes the image and returns an OcrResult with the same word/box layout as
+        `tesseract ... tsv` (block_num/line_num numbering included).
+        """
+        try:
+            with self._lock:
+                self.api.SetImage(image)
+                self.api.Recognize()
+                tsv = self.api.GetTSVText(0)
+            return OcrResult.from_tsv(tsv)
+        except Exception as e:
+            print(f"Tesserocr Error: {e}")
+            return None
+
+    def perform_ocr_regions(self, image, regions):
+        """Recognizes only the given text regions [(box, psm)], switching the page segmentation mode per box."""
+        try:
+            results = []
+            with self._lock:
+                try:
+                    for crop, (_, psm) in zip(crop_regions(image, regions), regions):
+                        self.api.SetPageSegMode(psm)
+                        self.api.SetImage(crop)
+                        self.api.Recognize()
+                        results.append(OcrResult.from_tsv(self.api.GetTSVText(0)))
+                finally:
+                    self.api.SetPageSegMode(self.psm)
+            return merge_regions(regions, results)
+        except Exception as e:
+            print(f"Tesserocr Error: {e}")
+            return None
+
+    def close(self):
+        with self._lock:
+            self.api.End()
@@ -0,0 +1,179 @@
+"""
+Cheap text-region proposals, so Tesseract only sees the parts of a capture that contain text.
+
+Text is dense in short alternating ink/background runs in both directions (strokes), while photos,
+gradients, flat panels and rules are not: after binarization they give no transitions, or edges with
+a long run on one side, or far more noise than glyphs do. Stroke edges are counted per cell, text
+cells are grown into lines, and a recursive XY-cut splits the cell mask into boxes along empty gaps.
+"""
+import numpy as np
+from PIL import ImageOps
+from services.preprocess import estimate_text_height, otsu_from_histogram
+from services.ocr_result import OcrResult
+
+# Tesseract page segmentation modes used per box
+PSM_SINGLE_BLOCK = 6
+PSM_SINGLE_LINE = 7
+
+def _cell_sums(mask, cell):
+    """Sums a boolean mask over cell x cell blocks (the ragged right/bottom edge is padded)."""
+    height, width = mask.shape
+    rows, cols = -(-height // cell), -(-width // cell)
+    padded = np.zeros((rows * cell, cols * cell), dtype=np.uint16)
+    padded[:height, :width] = mask
+    return padded.reshape(rows, cell, cols, cell).sum(axis=(1, 3))
+
+def _stroke_edges(ink, max_run):
+    """
+    Ink/background transitions along each row whose runs on both sides are at most max_run pixels:
+    the alternating short strokes and gaps of glyphs. Shape and panel borders have a long run on
+    at least one side, flat areas have no transitions at all.
+    """
+    transitions = ink[:, 1:] != ink[:, :-1]
+    flat = np.flatnonzero(transitions)
+    row = flat // transitions.shape[1]
+    gap = np.diff(flat)
+    short = (gap <= max_run) & (row[1:] == row[:-1])
+    keep = np.zeros(len(flat), dtype=bool)
+    keep[1:-1] = short[:-1] & short[1:]
+    edges = np.zeros(transitions.size, dtype=bool)
+    edges[flat[keep]] = True
+    return edges.reshape(transitions.shape)
+
+def _runs(profile):
+    """[(start, end), ...] of the non-zero runs of a 1-D profile."""
+    edges = np.flatnonzero(np.diff(np.r_[0, (profile > 0).astype(np.int8), 0]))
+    return list(zip(edges[0::2].tolist(), edges[1::2].tolist()))
+
+def _split(runs, min_gap):
+    """Merges runs separated by fewer than min_gap empty cells."""
+    merged = []
+    for start, end in runs:
+        if merged and start - merged[-1][1] < min_gap:
+            merged[-1] = (merged[-1][0], end)
+        else:
+            merged.append((start, end))
+    return merged
+
+def xy_cut(mask, min_gap=(2, 2)):
+    """
+    Recursive XY-cut of a boolean cell mask: alternately splits along empty rows and empty columns
+    (gaps of at least min_gap = (rows, cols) cells) until no cut is left.
+    Returns [(x0, y0, x1, y1), ...] in cell coordinates, in reading order.
+    """
+    boxes = []
+    stack = [(0, 0, mask.shape[1], mask.shape[0])]
+    while stack:
+        x0, y0, x1, y1 = stack.pop()
+        block = mask[y0:y1, x0:x1]
+        bands = _split(_runs(block.sum(axis=1)), min_gap[0])
+        if len(bands) > 1:
+            stack.extend((x0, y0 + top, x1, y0 + bottom) for top, bottom in reversed(bands))
+            continue
+        if not bands:
+            continue
+        top, bottom = bands[0]
+        columns = _split(_runs(block[top:bottom].sum(axis=0)), min_gap[1])
+        if len(columns) > 1:
+            stack.extend((x0 + left, y0 + top, x0 + right, y0 + bottom) for left, right in reversed(columns))
+            continue
+        left, right = columns[0]
+        boxes.append((x0 + left, y0 + top, x0 + right, y0 + bottom))
+    return boxes
+
+def crop_regions(image, regions):
+    """
+    Crops each region, flipped to dark text on a light background per box: a capture can mix light
+    and dark panels, which a single page-level inversion cannot serve.
+    """
+    crops = []
+    for box, _ in regions:
+        crop = image.crop(box)
+        gray = crop if crop.mode == "L" else crop.convert("L")
+        if np.asarray(gray).mean() < 128:
+            crop = ImageOps.invert(gray)
+        crops.append(crop)
+    return crops
+
+def merge_regions(regions, results):
+    """
+    Combines per-box OCR results into one result in image coordinates.
+    Blocks are renumbered per box so (block_num, line_num) stays unique across boxes.
+    """
+    merged = []
+    next_block = 1
+    for (box, _), result in zip(regions, results):
+        if result is None or result.empty:
+            continue
+        result = result.offset(box[0], box[1])
+        blocks = sorted(set(result.block_num.tolist()))
+        mapping = {block: next_block + i for i, block in enumerate(blocks)}
+        result.block_num[:] = [mapping[block] for block in result.block_num.tolist()]
+        next_block += len(blocks)
+        merged.append(result)
+    return OcrResult.concat(merged)
+
+class TextRegionDetector:
+    """
+    Proposes text boxes on a preprocessed capture (dark text on light background, x-height normalized,
+    which is what OCRService recognizes), each with the page segmentation mode to OCR it with.
+    detect() returns None when restricting OCR is not worth it (text almost everywhere, or a layout
+    too fragmented for per-box passes), so the caller runs one full-page pass instead.
+    """
+
+    def __init__(self, cell=16, max_run=16, min_edges=8, max_density=0.6, min_gap=2, margin=12, max_coverage=0.6,
+                 max_regions=24, min_pixels=100_000, enabled=True):
+        self.cell = cell
+        self.max_run = max_run  # longest stroke or gap (px) inside a glyph run
+        self.min_edges = min_edges  # stroke edges across a cell (half of that vertically)
+        self.max_density = max_density  # transitions per pixel above this: dithering / noise texture, not glyphs
+        self.min_gap = min_gap  # empty cells that separate two boxes
+        self.margin = margin
+        self.max_coverage = max_coverage
+        self.max_regions = max_regions
+        self.min_pixels = min_pixels
+        self.enabled = enabled
+
+    def text_cells(self, ink):
+        """Boolean cell mask of likely text, grown horizontally so words of a line join up."""
+        area = self.cell * self.cell
+        across = _cell_sums(_stroke_edges(ink, self.max_run), self.cell)
+        down = _cell_sums(_stroke_edges(ink.T, self.max_run), self.cell).T
+        density = _cell_sums(ink[:, 1:] != ink[:, :-1], self.cell) / area
+        cells = (across >= self.min_edges) & (down >= self.min_edges / 2) & (density <= self.max_density)
+        # Close the gaps between letters and words (a few cells); isolated specks stay alone
+        grown = cells.copy()
+        for shift in (1, 2):
+            grown[:, shift:] |= cells[:, :-shift]
+            grown[:, :-shift] |= cells[:, shift:]
+        return grown
+
+    def detect(self, image):
+        """Returns [((x0, y0, x1, y1), psm), ...] in image pixels, [] for a capture without text, or None."""
+        width, height = image.size
+        if not self.enabled or width * height < self.min_pixels:
+            return None
+        gray = image if image.mode == "L" else image.convert("L")
+        ink = np.asarray(gray) <= otsu_from_histogram(gray.histogram())
+        boxes = xy_cut(self.text_cells(ink), (self.min_gap, self.min_gap))
+
+        regions, covered = [], 0
+        for x0, y0, x1, y1 in boxes:
+            if (x1 - x0) * (y1 - y0) < 3:
+                continue  # one or two stray cells: an icon edge or noise
+            box = (max(0, x0 * self.cell - self.margin), max(0, y0 * self.cell - self.margin),
+                   min(width, x1 * self.cell + self.margin), min(height, y1 * self.cell + self.margin))
+            regions.append((box, self.psm_for(ink[box[1]:box[3], box[0]:box[2]])))
+            covered += (box[2] - box[0]) * (box[3] - box[1])
+        if len(regions) > self.max_regions or covered > self.max_coverage * width * height:
+            return None
+        return regions
+
+    def psm_for(self, ink):
+        """Single-line mode for boxes no taller than ~1.5 text lines, uniform-block mode otherwise."""
+        if ink.mean() > 0.5:
+            ink = ~ink  # text is the minority of a text box, whatever the theme
+        line_height = estimate_text_height(ink)
+        if line_height is None or ink.shape[0] - 2 * self.margin <= 1.5 * line_height:
+            return PSM_SINGLE_LINE
+        return PSM_SINGLE_BLOCK
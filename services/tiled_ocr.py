@@ -0,0 +1,134 @@
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from PIL import Image
+from services.ocr_result import OcrResult
+from services.text_regions import crop_regions, merge_regions
+
+# Words whose box comes this close to an interior tile edge were cut by the tile
+EDGE_MARGIN = 2
+
+def plan_tiles(width, height, tile_height=768, max_tile_width=2560, overlap=64):
+    """
+    Splits an image into overlapping tiles [(x0, y0, x1, y1), ...].
+    Tiles are full-width horizontal bands so text lines stay whole; only ultra-wide
+    images are also split horizontally.
+    """
+    def spans(length, size):
+        if length <= size:
+            return [(0, length)]
+        step = size - overlap
+        starts = list(range(0, length - overlap, step))
+        return [(start, min(start + size, length)) for start in starts]
+
+    return [(x0, y0, x1, y1) for y0, y1 in spans(height, tile_height) for x0, x1 in spans(width, max_tile_width)]
+
+def merge_tiles(tiles, results, size, overlap=64):
+    """
+    Merges per-tile OCR results into one result in full-image coordinates.
+    Each word is kept by exactly one tile (the one whose core region, i.e. the tile minus half
+    the overlap on interior sides, contains the word centre), and words cut by an interior tile
+    edge are dropped. Blocks are renumbered per tile so (block_num, line_num) stays unique.
+    """
+    width, height = size
+    half = overlap / 2
+    merged = []
+    next_block = 1
+    for (x0, y0, x1, y1), result in zip(tiles, results):
+        if result is None or result.empty:
+            continue
+        result = result.offset(x0, y0)
+
+        core_x0 = x0 + half if x0 > 0 else 0
+        core_y0 = y0 + half if y0 > 0 else 0
+        core_x1 = x1 - half if x1 < width else width
+        core_y1 = y1 - half if y1 < height else height
+        right, bottom = result.left + result.width, result.top + result.height
+        cx, cy = result.left + result.width / 2, result.top + result.height / 2
+
+        keep = (cx >= core_x0) & (cx < core_x1) & (cy >= core_y0) & (cy < core_y1)
+        if x0 > 0: keep &= result.left > x0 + EDGE_MARGIN
+        if y0 > 0: keep &= result.top > y0 + EDGE_MARGIN
+        if x1 < width: keep &= right < x1 - EDGE_MARGIN
+        if y1 < height: keep &= bottom < y1 - EDGE_MARGIN
+        result = result.select(keep)
+        if result.empty:
+            continue
+
+        blocks = sorted(set(result.block_num.tolist()))
+        mapping = {block: next_block + i for i, block in enumerate(blocks)}
+        result.block_num[:] = [mapping[block] for block in result.block_num.tolist()]
+        next_block += len(blocks)
+        merged.append(result)
+    return OcrResult.concat(merged)
+
+def _ocr_tile(job):
+    """Process-pool worker: OCRs one tile with the Tesseract CLI."""
+    # One tile per core already; keep each tesseract process from spawning its own OpenMP threads
+    os.environ.setdefault('OMP_THREAD_LIMIT', '1')
+    return _ocr_image(job)
+
+def _ocr_image(job):
+    import pytesseract
+    mode, size, pixels, tesseract_cmd, lang, config = job
+    pytesseract.pytesseract.tesseract_cmd = tesseract_cmd
+    tile = Image.frombytes(mode, size, pixels)
+    data = pytesseract.image_to_data(tile, lang=lang, config=config, output_type=pytesseract.Output.DICT)
+    return OcrResult.from_columns(data)
+
+class TiledOCR:
+    """
+    Splits large captures into overlapping tiles and OCRs them concurrently on a process pool
+    sized to the core count. Used by OCRService for Tesseract on full-screen / ultra-wide captures.
+    """
+
+    def __init__(self, workers=None, min_pixels=2_000_000, tile_height=768, max_tile_width=2560, overlap=64):
+        self.workers = workers or os.cpu_count() or 1
+        self.min_pixels = min_pixels
+        self.tile_height = tile_height
+        self.max_tile_width = max_tile_width
+        self.overlap = overlap
+        self._pool = None
+        self._lock = threading.Lock()
+
+    def should_tile(self, image):
+        width, height = image.size
+        return self.workers > 1 and width * height >= self.min_pixels
+
+    def _get_pool(self):
+        with self._lock:
+            if self._pool is None:
+                # 'spawn': forking a process that runs Qt and worker threads is unsafe
+                self._pool = ProcessPoolExecutor(max_workers=self.workers, mp_context=multiprocessing.get_context('spawn'))
+            return self._pool
+
+    def perform_ocr(self, image, tesseract_cmd='tesseract', lang='eng', config='--psm 3'):
+        tiles = plan_tiles(*image.size, tile_height=self.tile_height, max_tile_width=self.max_tile_width, overlap=self.overlap)
+        if image.mode not in ('RGB', 'L'):
+            image = image.convert('RGB')
+        jobs = []
+        for box in tiles:
+            tile = image.crop(box)
+            jobs.append((tile.mode, tile.size, tile.tobytes(), tesseract_cmd, lang, config))
+        results = list(self._get_pool().map(_ocr_tile, jobs))
+        return merge_tiles(tiles, results, image.size, self.overlap)
+
+    def perform_ocr_regions(self, image, regions, tesseract_cmd='tesseract', lang='eng'):
+        """
+        OCRs only the text regions [((x0, y0, x1, y1), psm), ...] proposed by TextRegionDetector,
+        each with its own page segmentation mode, concurrently on the pool when there are several.
+        """
+        jobs = [(crop.mode, crop.size, crop.tobytes(), tesseract_cmd, lang, f'--psm {psm}')
+                for crop, (_, psm) in zip(crop_regions(image, regions), regions)]
+        if self.workers > 1 and len(jobs) > 1:
+            results = list(self._get_pool().map(_ocr_tile, jobs))
+        else:
+            results = [_ocr_image(job) for job in jobs]
+        return merge_regions(regions, results)
+
+    def close(self):
+        with self._lock:
+            if self._pool is not None:
+                self._pool.shutdown(cancel_futures=True)
+                self._pool = None
@@ -0,0 +1,176 @@
+import os
+import sqlite3
+import threading
+from collections import OrderedDict
+from services.base_translator import BaseTranslator
+
+def normalize_line(text):
+    """Collapses whitespace so OCR jitter (double spaces, stray tabs) maps to one key."""
+    return " ".join(str(text).split())
+
+class TranslationMemory:
+    """
+    Line-level translation memory.
+    Front: in-process LRU. Back: persistent SQLite store shared across sessions.
+    Keys are (provider, source_lang, target_lang, normalized_line).
+    """
+
+    def __init__(self, db_path=None, capacity=4096):
+        self.db_path = db_path
+        self.capacity = capacity
+        self._lru = OrderedDict()
+        self._lock = threading.Lock()
+        self._conn = None
+        self.stats = {"hits": 0, "disk_hits": 0, "misses": 0, "evictions": 0}
+
+    def _connect(self):
+        if self._conn is None and self.db_path:
+            folder = os.path.dirname(self.db_path)
+            if folder:
+                os.makedirs(folder, exist_ok=True)
+            # Accessed from worker threads; all access is serialized by self._lock
+            self._conn = sqlite3.connect(self.db_path, check_same_thread=False)
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS translations ("
+                "provider TEXT, source_lang TEXT, target_lang TEXT, source_text TEXT, translated TEXT, "
+                "PRIMARY KEY (provider, source_lang, target_lang, source_text))"
+            )
+        return self._conn
+
+    def _remember(self, key, value):
+        self._lru[key] = value
+        self._lru.move_to_end(key)
+        while len(self._lru) > self.capacity:
+            self._lru.popitem(last=False)
+            self.stats["evictions"] += 1
+
+    def get_many(self, keys):
+        """Returns {key: translation} for every key found in memory or on disk."""
+        found = {}
+        with self._lock:
+            pending = []
+            for key in keys:
+                if key in self._lru:
+                    self._lru.move_to_end(key)
+                    found[key] = self._lru[key]
+                    self.stats["hits"] += 1
+                else:
+                    pending.append(key)
+
+            conn = self._connect()
+            for key in pending:
+                row = None
+                if conn is not None:
+                    row = conn.execute(
+                        "SELECT translated FROM translations WHERE provider=? AND source_lang=? AND target_lang=? AND source_text=?",
+                        key
+                    ).fetchone()
+                if row is not None:
+                    found[key] = row[0]
+                    self._remember(key, row[0])
+                    self.stats["hits"] += 1
+                    self.stats["disk_hits"] += 1
+                else:
+                    self.stats["misses"] += 1
+        return found
+
+    def put_many(self, items):
+        """Stores {key: translation} in the LRU and the persistent store."""
+        if not items:
+            return
+        with self._lock:
+            for key, value in items.items():
+                self._remember(key, value)
+            conn = self._connect()
+            if conn is not None:
+                with conn:
+                    conn.executemany(
+                        "INSERT OR REPLACE INTO translations VALUES (?, ?, ?, ?, ?)",
+                        [key + (value,) for key, value in items.items()]
+                    )
+
+    def close(self):
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+class CachedTranslator(BaseTranslator):
+    """
+    Wraps any BaseTranslator with a TranslationMemory.
+    Duplicate lines within one request are collapsed and only cache misses are sent upstream.
+    """
+
+    def __init__(self, translator, memory):
+        self.translator = translator
+        self.memory = memory
+        self.name = translator.name
+        self.source_lang = translator.source_lang
+        self.target_lang = translator.target_lang
+        self.aligned_lines = translator.aligned_lines
+
+    def with_source(self, source_lang):
+        clone = super().with_source(source_lang)
+        if clone is not self:
+            clone.translator = self.translator.with_source(source_lang)
+        return clone
+
+    def failover_count(self):
+        return self.translator.failover_count()
+
+    def _key(self, line):
+        return (self.name, self.source_lang, self.target_lang, line)
+
+    def translate(self, text: str) -> str:
+        return "\n".join(self.translate_lines(text.split("\n")))
+
+    def translate_lines(self, lines):
+        normalized = [normalize_line(line) for line in lines]
+        unique = [line for line in dict.fromkeys(normalized) if line]
+
+        found = self.memory.get_many([self._key(line) for line in unique])
+        results = {key[3]: value for key, value in found.items()}
+        misses = [line for line in unique if line not in results]
+
+        if misses:
+            failovers = self.translator.failover_count()
+            translated, aligned = self.translator.translate_lines_checked(misses)
+            for line, value in zip(misses, translated):
+                results[line] = value
+            # Never persist padded or cut batches (values may be shifted), failed-over results (they would be
+            # keyed under the primary provider) or empty lines; provider errors raise before this point
+            if aligned and self.translator.failover_count() == failovers:
+                self.memory.put_many({self._key(line): value for line, value in zip(misses, translated) if value})
+
+        return [results.get(line, "") for line in normalized]
+
+    def translate_stream(self, lines):
+        """Yields cached lines immediately, then streams only the misses from the wrapped provider."""
+        normalized = [normalize_line(line) for line in lines]
+        positions = {}
+        for index, line in enumerate(normalized):
+            positions.setdefault(line, []).append(index)
+
+        unique = [line for line in positions if line]
+        found = self.memory.get_many([self._key(line) for line in unique])
+        for key, value in found.items():
+            for index in positions[key[3]]:
+                yield index, value
+
+        misses = [line for line in unique if self._key(line) not in found]
+        translated = {}
+        if misses:
+            failovers = self.translator.failover_count()
+            try:
+                for miss_index, value in self.translator.translate_stream(misses):
+                    translated[misses[miss_index]] = value
+                    for index in positions[misses[miss_index]]:
+                        yield index, value
+            finally:
+                # Lines that arrived before a TranslationError are real translations: keep them,
+                # unless the wrapped stream cannot guarantee which line each value belongs to or a fallback answered
+                if self.translator.aligned_lines and self.translator.failover_count() == failovers:
+                    self.memory.put_many({self._key(line): value for line, value in translated.items() if value})
+
+        for index in positions.get("", []):
+            yield index, ""
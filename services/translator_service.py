@@ -1,45 +1,324 @@
+import copy
+import threading
+import requests
+from bs4 import BeautifulSoup
 from deep_translator import GoogleTranslator
-from openai import OpenAI
-from services.base_translator import BaseTranslator
+from deep_translator.validate import is_empty, is_input_valid
+from services.base_translator import BaseTranslator, TranslationError, RateLimitedError, ProviderUnavailableError
+from services.resilience import ProviderGuard, ResilientTranslator, parse_retry_after
 from utils import helpers as utils
+from utils.async_runtime import HAS_ASYNC_HTTP, http_module, runtime
+
+class PooledGoogleTranslator(GoogleTranslator):
+    """
+    GoogleTranslator variant that sends every request through one keep-alive requests.Session
+    (deep_translator calls requests.get, which opens a new connection per call).
+    """
+
+    def __init__(self, session, base_url=None, **kwargs):
+        super().__init__(**kwargs)
+        self.session = session
+        if base_url:
+            self._base_url = base_url
+
+    def _params(self, text):
+        """Query parameters for one request, or None when the text needs no request."""
+        is_input_valid(text, max_chars=5000)
+        text = text.strip()
+        if self._same_source_target() or is_empty(text):
+            return None
+        # Built per call instead of mutating self._url_params: the provider is shared across threads
+        params = dict(self._url_params, sl=self._source, tl=self._target)
+        params[self.payload_key] = text
+        return params
+
+    def _parse(self, status, headers, body):
+        """Maps a response to its translation, or raises the matching TranslationError."""
+        if status == 429:
+            raise RateLimitedError("rate limited", provider="google", status=status,
+                                   retry_after=parse_retry_after(headers.get("Retry-After")))
+        if status >= 500:
+            raise ProviderUnavailableError(f"server error {status}", provider="google", status=status,
+                                           retry_after=parse_retry_after(headers.get("Retry-After")))
+        if status >= 400:
+            raise TranslationError(f"request failed with {status}", provider="google", status=status)
+
+        soup = BeautifulSoup(body, "html.parser")
+        element = soup.find(self._element_tag, self._element_query) or soup.find(self._element_tag, self._alt_element_query)
+        if not element:
+            raise TranslationError("no translation in response", provider="google", status=status)
+        return element.get_text(strip=True)
+
+    def translate(self, text: str, **kwargs) -> str:
+        params = self._params(text)
+        if params is None:
+            return text.strip()
+        try:
+            response = self.session.get(self._base_url, params=params, proxies=self.proxies, timeout=10)
+        except (requests.Timeout, requests.ConnectionError) as e:
+            raise ProviderUnavailableError(f"connection failed ({e.__class__.__name__})", provider="google") from e
+        return self._parse(response.status_code, response.headers, response.text)
+
+    async def translate_async(self, text: str) -> str:
+        """translate() through the event loop's shared HTTP client (no thread held while waiting)."""
+        params = self._params(text)
+        if params is None:
+            return text.strip()
+        httpx = http_module()
+        try:
+            response = await runtime.http_client().get(self._base_url, params=params, timeout=10)
+        except httpx.TransportError as e:
+            raise ProviderUnavailableError(f"connection failed ({e.__class__.__name__})", provider="google") from e
+        return self._parse(response.status_code, response.headers, response.text)
 
 class GoogleTranslatorProvider(BaseTranslator):
-    def __init__(self):
-        self.translator = GoogleTranslator(source='auto', target='zh-CN')
+    name = "google"
+    native_async = HAS_ASYNC_HTTP
+
+    def __init__(self, base_url=None):
+        self.session = requests.Session()
+        self.translator = PooledGoogleTranslator(self.session, base_url=base_url, source=self.source_lang, target=self.target_lang)
 
     def translate(self, text: str) -> str:
         try:
             result = self.translator.translate(text)
-            return result if result is not None else ""
+        except TranslationError:
+            raise
+        except Exception as e:
+            # deep_translator validation errors and anything unexpected
+            raise TranslationError(str(e), provider=self.name) from e
+        return result if result is not None else ""
+
+    async def translate_async(self, text: str) -> str:
+        if not self.native_async:
+            return await super().translate_async(text)
+        try:
+            result = await self.translator.translate_async(text)
+        except TranslationError:
+            raise
         except Exception as e:
-            return f"Google Error: {str(e)[:20]}"
+            raise TranslationError(str(e), provider=self.name) from e
+        return result if result is not None else ""
+
+    def with_source(self, source_lang):
+        clone = super().with_source(source_lang)
+        if clone is not self:
+            # Same session; only the request's sl= parameter changes
+            clone.translator = copy.copy(self.translator)
+            clone.translator._source = source_lang
+        return clone
+
+    def warm_up(self):
+        """Opens the keep-alive connection (DNS + TCP + TLS) before the first capture."""
+        self.session.head(self.translator._base_url, timeout=5)
+
+    def close(self):
+        self.session.close()
+
+LANGUAGE_NAMES = {
+    "en": "English", "ru": "Russian", "el": "Greek", "ar": "Arabic", "iw": "Hebrew", "hi": "Hindi",
+    "th": "Thai", "zh-CN": "Chinese (Simplified)", "ja": "Japanese", "ko": "Korean",
+}
+
+def system_prompt(source_lang="auto", target_lang="zh-CN"):
+    source = LANGUAGE_NAMES.get(source_lang)
+    target = LANGUAGE_NAMES.get(target_lang, target_lang)
+    task = f"Translate {source} text to {target}." if source else f"Translate the text to {target}."
+    return f"You are a professional translator. {task} IMPORTANT: Preserve the number of lines and line breaks exactly as they are in the source text. Do not omit any lines. When a line starts with a marker such as [[0]], copy the marker unchanged to the start of its translation."
 
 class OpenAITranslatorProvider(BaseTranslator):
-    def __init__(self, api_key: str):
-        self.client = OpenAI(api_key=api_key)
+    name = "openai"
+    native_async = HAS_ASYNC_HTTP
+
+    def __init__(self, api_key: str, base_url=None):
+        from openai import OpenAI  # heavy import, only paid when OpenAI is actually selected
+
+        # The client owns an HTTP connection pool; keeping the provider alive keeps the pool warm.
+        # Retries are done by ResilientTranslator (which honours Retry-After), not by the SDK.
+        self.client = OpenAI(api_key=api_key, base_url=base_url, max_retries=0, timeout=30)
+        self.api_key = api_key
+        self.base_url = base_url
+        self._async_client = None
+
+    def _async(self):
+        """AsyncOpenAI on the runtime's shared HTTP client; rebuilt if the runtime was restarted."""
+        from openai import AsyncOpenAI
+
+        http_client = runtime.http_client()
+        if self._async_client is None or self._async_client._client is not http_client:
+            self._async_client = AsyncOpenAI(api_key=self.api_key, base_url=self.base_url, max_retries=0,
+                                             timeout=30, http_client=http_client)
+        return self._async_client
+
+    def _error(self, e):
+        """Maps an openai SDK exception to a TranslationError."""
+        import openai
+
+        response = getattr(e, "response", None)
+        status = getattr(e, "status_code", None)
+        retry_after = parse_retry_after(response.headers.get("retry-after")) if response is not None else None
+        message = str(e)[:200]
+        if isinstance(e, openai.RateLimitError) or status == 429:
+            return RateLimitedError(message, provider=self.name, status=status, retry_after=retry_after)
+        if isinstance(e, (openai.APIConnectionError, openai.APITimeoutError)) or (status or 0) >= 500:
+            return ProviderUnavailableError(message, provider=self.name, status=status, retry_after=retry_after)
+        return TranslationError(message, provider=self.name, status=status)
 
     def translate(self, text: str) -> str:
         try:
             response = self.client.chat.completions.create(
                 model="gpt-3.5-turbo",
                 messages=[
-                    {"role": "system", "content": "You are a professional translator. Translate English text to Chinese (Simplified). IMPORTANT: Preserve the number of lines and line breaks exactly as they are in the source text. Do not omit any lines."},
+                    {"role": "system", "content": system_prompt(self.source_lang, self.target_lang)},
                     {"role": "user", "content": text}
                 ]
             )
-            content = response.choices[0].message.content
-            return content.strip() if content else ""
         except Exception as e:
-            return f"GPT Error: {str(e)[:20]}"
+            raise self._error(e) from e
+        content = response.choices[0].message.content
+        return content.strip() if content else ""
 
-class TranslatorFactory:
-    @staticmethod
-    def get_translator(provider_name: str) -> BaseTranslator:
+    async def translate_async(self, text: str) -> str:
+        if not self.native_async:
+            return await super().translate_async(text)
+        try:
+            response = await self._async().chat.completions.create(
+                model="gpt-3.5-turbo",
+                messages=[
+                    {"role": "system", "content": system_prompt(self.source_lang, self.target_lang)},
+                    {"role": "user", "content": text}
+                ]
+            )
+        except Exception as e:
+            raise self._error(e) from e
+        content = response.choices[0].message.content
+        return content.strip() if content else ""
+
+    def stream_text(self, text):
+        """Yields the response as raw token deltas. Raises TranslationError on failure."""
+        try:
+            stream = self.client.chat.completions.create(
+                model="gpt-3.5-turbo",
+                stream=True,
+                messages=[
+                    {"role": "system", "content": system_prompt(self.source_lang, self.target_lang)},
+                    {"role": "user", "content": text}
+                ]
+            )
+            for chunk in stream:
+                if chunk.choices:
+                    yield chunk.choices[0].delta.content or ""
+        except Exception as e:
+            raise self._error(e) from e
+
+    def translate_stream(self, lines):
+        """Token streaming: yields each line as soon as its terminating newline arrives."""
+        index, buffer = 0, ""
+        for delta in self.stream_text("\n".join(lines)):
+            buffer += delta
+            while "\n" in buffer and index < len(lines):
+                line, buffer = buffer.split("\n", 1)
+                yield index, line.strip()
+                index += 1
+        if index < len(lines) and buffer.strip():
+            yield index, buffer.strip()
+            index += 1
+        # Provider merged or dropped lines: keep one entry per line
+        for missing in range(index, len(lines)):
+            yield missing, ""
+
+    def warm_up(self):
+        """Opens the pooled connection with a cheap authenticated request."""
+        self.client.models.list()
+
+    def close(self):
+        self.client.close()
+
+# Client-side pacing per provider: (requests per second, burst). Unlisted providers are not paced.
+PROVIDER_LIMITS = {
+    'google': (5.0, 10),
+    'openai': (3.0, 5),
+}
+
+class ProviderRegistry:
+    """
+    Creates each provider once and reuses it (and its connection pool) across captures.
+    A provider is rebuilt only when its configuration (e.g. the API key) changes. Replaced providers are
+    dropped, not closed: a capture may still be mid-request on one, and its client closes once unreferenced.
+    Rate limiters and circuit breakers live here too, so their state spans captures and callers.
+    """
+
+    def __init__(self):
+        self._providers = {}  # name -> (config, provider)
+        self._guards = {}  # name -> ProviderGuard
+        self._lock = threading.Lock()
+
+    def _resolve(self, provider_name):
+        if provider_name == 'stub':
+            return 'stub', (utils.get_stub_latency(),)
         if provider_name == 'openai':
             api_key = utils.get_openai_api_key()
             if api_key:
-                return OpenAITranslatorProvider(api_key)
+                return 'openai', (api_key,)
+            print("Warning: OpenAI API key not found, falling back to Google.")
+        return 'google', ()
+
+    def get(self, provider_name: str) -> BaseTranslator:
+        name, config = self._resolve(provider_name)
+        with self._lock:
+            cached = self._providers.get(name)
+            if cached and cached[0] == config:
+                return cached[1]
+
+            if name == 'stub':
+                from services.stub_translator import StubTranslatorProvider
+                provider = StubTranslatorProvider(*config)
+            elif name == 'openai':
+                provider = OpenAITranslatorProvider(*config)
             else:
-                print("Warning: OpenAI API key not found, falling back to Google.")
-        
-        return GoogleTranslatorProvider()
+                provider = GoogleTranslatorProvider(*config)
+            self._providers[name] = (config, provider)
+            return provider
+
+    def guard(self, name):
+        with self._lock:
+            guard = self._guards.get(name)
+            if guard is None:
+                rate, burst = PROVIDER_LIMITS.get(name, (None, None))
+                guard = self._guards[name] = ProviderGuard(rate, burst)
+            return guard
+
+    def _fallback_name(self, name):
+        if name == 'google' and utils.get_openai_api_key():
+            return 'openai'
+        if name == 'openai':
+            return 'google'
+        return None
+
+    def resilient(self, provider_name: str) -> BaseTranslator:
+        """The provider wrapped with its rate limiter, retries, circuit breaker and failover to the other provider."""
+        primary = self.get(provider_name)
+        fallback_name = self._fallback_name(primary.name)
+        fallback = self.get(fallback_name) if fallback_name else None
+        return ResilientTranslator(primary, self.guard(primary.name), fallback,
+                                   self.guard(fallback_name) if fallback_name else None)
+
+    def warm_up(self, provider_name: str):
+        """Builds the provider and opens its connection. Safe to call from a background thread."""
+        try:
+            self.get(provider_name).warm_up()
+        except Exception as e:
+            print(f"Provider warm-up failed ({provider_name}): {e}")
+
+    def invalidate(self, provider_name=None):
+        with self._lock:
+            names = [provider_name] if provider_name else list(self._providers)
+            for name in names:
+                self._providers.pop(name, None)
+
+registry = ProviderRegistry()
+
+class TranslatorFactory:
+    @staticmethod
+    def get_translator(provider_name: str) -> BaseTranslator:
+        return registry.resilient(provider_name)
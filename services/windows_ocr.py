@@ -1,22 +1,28 @@
-import asyncio
-import pandas as pd
 from PIL import Image
 import winsdk.windows.media.ocr as ocr
 import winsdk.windows.graphics.imaging as imaging
 import winsdk.windows.storage.streams as streams
 from winsdk.windows.globalization import Language
+from services.ocr_result import OcrResult, COLUMNS
+from utils.async_runtime import runtime
 
 class WindowsOCR:
-    def __init__(self):
+    def __init__(self, language=None):
+        if language:
+            # Engine for one detected language (BCP-47 tag); its pack must be installed in Windows
+            self.engine = ocr.OcrEngine.try_create_from_language(Language(language))
+            if not self.engine:
+                raise RuntimeError(f"Windows OCR language '{language}' is not installed")
+            return
         self.engine = ocr.OcrEngine.try_create_from_user_profile_languages()
         if not self.engine:
             # Fallback for systems with non-standard locales, force English
             self.engine = ocr.OcrEngine.try_create_from_language(Language("en-US"))
             
-    def perform_ocr(self, image: Image.Image) -> pd.DataFrame:
+    def perform_ocr(self, image: Image.Image) -> OcrResult:
         """
-        Executes Windows Native OCR and returns a DataFrame compatible with Tesseract output.
-        Required Columns: ['text', 'left', 'top', 'width', 'height', 'conf', 'block_num', 'line_num']
+        Executes Windows Native OCR and returns an OcrResult compatible with Tesseract output.
+        Columns: ['text', 'left', 'top', 'width', 'height', 'conf', 'block_num', 'line_num']
         """
         try:
             # Convert PIL Image to SoftwareBitmap
@@ -32,14 +38,14 @@ class WindowsOCR:
             pixel_data = image.tobytes("raw", "BGRA")
             
             # Use raw buffer to create bitmap
-            # We need to run the async OCR operation
-            result = asyncio.run(self._recognize_async(pixel_data, width, height))
+            # The async OCR operation runs on the session's shared event loop (no loop per capture)
+            result = runtime.run(self._recognize_async(pixel_data, width, height))
             
             if not result:
-                return pd.DataFrame()
+                return OcrResult()
             
-            # Parse results into DataFrame
-            data_list = []
+            # Parse results into columns
+            columns = {name: [] for name in COLUMNS}
             
             # Windows OCR structure: Result -> Lines -> Words
             # We map Line Index -> line_num
@@ -48,19 +54,16 @@ class WindowsOCR:
             for line_idx, line in enumerate(result.lines):
                 for word in line.words:
                     bbox = word.bounding_rect
-                    data_list.append({
-                        'text': word.text,
-                        'left': int(bbox.x),
-                        'top': int(bbox.y),
-                        'width': int(bbox.width),
-                        'height': int(bbox.height),
-                        'conf': 100, # Windows OCR doesn't expose confidence per word easily, assume High
-                        'block_num': 1,
-                        'line_num': line_idx + 1
-                    })
+                    columns['text'].append(word.text)
+                    columns['left'].append(int(bbox.x))
+                    columns['top'].append(int(bbox.y))
+                    columns['width'].append(int(bbox.width))
+                    columns['height'].append(int(bbox.height))
+                    columns['conf'].append(100) # Windows OCR doesn't expose confidence per word easily, assume High
+                    columns['block_num'].append(1)
+                    columns['line_num'].append(line_idx + 1)
             
-            df = pd.DataFrame(data_list)
-            return df
+            return OcrResult.from_columns(columns)
             
         except Exception as e:
             print(f"Windows OCR Error: {e}")
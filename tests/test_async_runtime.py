@@ -0,0 +1,126 @@
+import asyncio
+import threading
+import time
+import unittest
+from services.base_translator import BaseTranslator, ProviderUnavailableError
+from services.batch_translator import BatchTranslator
+from services.resilience import ProviderGuard, ResilientTranslator
+from services.stub_translator import StubTranslatorProvider
+from utils.async_runtime import AsyncRuntime, runtime
+
+class FlakyAsyncTranslator(BaseTranslator):
+    name = "flaky"
+    native_async = True
+
+    def __init__(self, failures):
+        self.failures = failures
+        self.calls = 0
+
+    def translate(self, text):
+        raise AssertionError("the async path must not call translate()")
+
+    async def translate_async(self, text):
+        self.calls += 1
+        if self.calls <= self.failures:
+            raise ProviderUnavailableError("server error 503", status=503)
+        return text.upper()
+
+class TestAsyncRuntime(unittest.TestCase):
+    def setUp(self):
+        self.runtime = AsyncRuntime(lag_interval=0.02)
+        self.addCleanup(self.runtime.close)
+
+    def test_one_loop_serves_every_caller(self):
+        async def current():
+            return asyncio.get_running_loop(), threading.current_thread().name
+
+        seen = [self.runtime.run(current()) for _ in range(3)]
+        worker = threading.Thread(target=lambda: seen.append(self.runtime.run(current())))
+        worker.start()
+        worker.join()
+        self.assertEqual(len(set(seen)), 1)
+        self.assertEqual(seen[0][1], "async-runtime")
+
+    def test_run_from_the_loop_is_refused(self):
+        async def nested():
+            with self.assertRaises(RuntimeError):
+                self.runtime.run(asyncio.sleep(0))
+            return True
+
+        self.assertTrue(self.runtime.run(nested()))
+
+    def test_offloaded_work_keeps_the_loop_responsive(self):
+        async def blocking_and_ticks():
+            ticks = 0
+
+            async def ticker():
+                nonlocal ticks
+                while True:
+                    await asyncio.sleep(0.005)
+                    ticks += 1
+
+            task = asyncio.create_task(ticker())
+            await self.runtime.offload(time.sleep, 0.1)
+            task.cancel()
+            return ticks
+
+        self.assertGreater(self.runtime.run(blocking_and_ticks()), 5)
+        self.assertEqual(self.runtime.stats["offloaded"], 1)
+
+    def test_loop_lag_is_measured(self):
+        self.runtime.run(asyncio.sleep(0.05))
+        self.runtime.loop.call_soon_threadsafe(time.sleep, 0.15)  # a blocking call on the loop
+        time.sleep(0.3)
+        self.assertGreaterEqual(self.runtime.stats["lag_ms_max"], 100)
+
+    def test_close_stops_the_thread_and_allows_restart(self):
+        self.runtime.run(asyncio.sleep(0))
+        thread = self.runtime._thread
+        self.runtime.close()
+        self.assertFalse(thread.is_alive())
+        self.assertFalse(self.runtime.running)
+        self.assertEqual(self.runtime.run(asyncio.sleep(0, result=7)), 7)
+
+class TestAsyncTranslation(unittest.TestCase):
+    def test_chunks_overlap_on_the_loop_without_threads(self):
+        stub = StubTranslatorProvider(latency=0.1)
+        batch = BatchTranslator(stub, max_lines=2, max_parallel=4)
+        lines = [f"line {i}" for i in range(8)]
+        runtime.run(asyncio.sleep(0))  # loop already running, as in the app
+        threads = threading.active_count()
+        start = time.perf_counter()
+        self.assertEqual(batch.translate_lines(lines), [line.upper() for line in lines])
+        elapsed = time.perf_counter() - start
+        self.assertEqual(stub.requests, 4)
+        self.assertLess(elapsed, 0.3)  # 4 requests of 100 ms in flight together
+        self.assertEqual(threading.active_count(), threads)  # no pool threads for the chunks
+
+    def test_early_stop_cancels_pending_chunks(self):
+        stub = StubTranslatorProvider(latency=0.1)
+        batch = BatchTranslator(stub, max_lines=1, max_parallel=2)
+        stream = batch.translate_stream([f"line {i}" for i in range(8)])
+        next(stream)
+        stream.close()
+        time.sleep(0.3)
+        self.assertLessEqual(stub.requests, 4)
+
+    def test_resilient_async_retries_on_the_loop(self):
+        flaky = FlakyAsyncTranslator(failures=2)
+        translator = ResilientTranslator(flaky, ProviderGuard(rate=50), max_retries=3, base_delay=0.01,
+                                         sleep=lambda seconds: self.fail("blocking sleep on the async path"))
+        self.assertTrue(translator.native_async)
+        self.assertEqual(runtime.run(translator.translate_async("hello")), "HELLO")
+        self.assertEqual(translator.guard.stats["retries"], 2)
+        self.assertEqual(translator.guard.breaker.state, "closed")
+
+    def test_sync_provider_runs_on_the_executor(self):
+        class SyncTranslator(BaseTranslator):
+            name = "sync"
+
+            def translate(self, text):
+                return threading.current_thread().name
+
+        self.assertTrue(runtime.run(SyncTranslator().translate_async("x")).startswith("async-offload"))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,118 @@
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import unittest
+from PIL import Image
+from core.batch_pipeline import iter_inputs, run_batch
+from services.base_translator import BaseTranslator
+from services.ocr_result import OcrResult
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+class FakeOCR:
+    """One word per 50 px of image width, on a single line."""
+
+    def perform_ocr(self, image):
+        count = image.width // 50
+        return OcrResult.from_columns({
+            'text': [f"word{i}" for i in range(count)], 'block_num': [1] * count, 'line_num': [1] * count,
+            'left': [i * 50 for i in range(count)], 'top': [5] * count,
+            'width': [40] * count, 'height': [12] * count, 'conf': [90] * count
+        })
+
+def fake_ocr_factory(strategy):
+    # Module-level so it can be pickled into the spawned OCR workers
+    return FakeOCR()
+
+class BlindOCR:
+    """An engine that failed: perform_ocr returns None, like OCRService without a working engine."""
+
+    def perform_ocr(self, image):
+        return None
+
+def blind_ocr_factory(strategy):
+    return BlindOCR()
+
+class DyingOCR:
+    def perform_ocr(self, image):
+        os._exit(1)  # the process dies mid-run, without its sentinel
+
+def dying_ocr_factory(strategy):
+    return DyingOCR()
+
+def broken_ocr_factory(strategy):
+    raise RuntimeError("no OCR engine")
+
+class UpperTranslator(BaseTranslator):
+    name = "upper"
+
+    def translate(self, text):
+        return text.upper()
+
+class TestBatchPipeline(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.inputs = os.path.join(self.tmp.name, "frames")
+        os.makedirs(os.path.join(self.inputs, "scene2"))
+        for name, width in (("a.png", 100), ("b.jpg", 150), ("scene2/c.png", 50), ("notes.txt", 0)):
+            path = os.path.join(self.inputs, name)
+            if width:
+                Image.new("RGB", (width, 30), "gray").save(path)
+            else:
+                open(path, "w").close()
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_inputs_are_images_in_sorted_order(self):
+        names = [name for _, name in iter_inputs([self.inputs])]
+        self.assertEqual(names, ["a.png", "b.jpg", os.path.join("scene2", "c.png")])
+
+    def test_pipeline_writes_overlays_and_sidecars(self):
+        output = os.path.join(self.tmp.name, "out")
+        summary = run_batch([self.inputs], output, ocr_workers=2, render_workers=1, queue_size=1,
+                            image_format=".png", ocr_factory=fake_ocr_factory, translator=UpperTranslator())
+
+        self.assertEqual((summary["images"], summary["lines"], summary["errors"]), (3, 3, 0))
+        self.assertGreater(summary["images_per_s"], 0)
+        for stem in ("a", "b", os.path.join("scene2", "c")):
+            self.assertTrue(os.path.exists(os.path.join(output, stem + ".png")))
+        with open(os.path.join(output, "b.json"), encoding="utf-8") as f:
+            record = json.load(f)
+        self.assertEqual(record["lines"], [{"original": "word0 word1 word2", "translated": "WORD0 WORD1 WORD2", "box": [0, 5, 140, 17]}])
+
+    def test_failed_ocr_is_an_error_not_an_empty_image(self):
+        summary = run_batch([self.inputs], os.path.join(self.tmp.name, "out"), ocr_workers=1, render_workers=1,
+                            ocr_factory=blind_ocr_factory, translator=UpperTranslator())
+        self.assertEqual((summary["images"], summary["errors"]), (0, 3))
+
+    def test_workers_failing_at_setup_do_not_hang_the_batch(self):
+        summary = run_batch([self.inputs], os.path.join(self.tmp.name, "out"), ocr_workers=2, render_workers=1,
+                            queue_size=1, ocr_factory=broken_ocr_factory, translator=UpperTranslator())
+        self.assertEqual(summary["images"], 0)
+        self.assertEqual(summary["errors"], 2)
+
+    def test_worker_dying_mid_run_does_not_hang_the_batch(self):
+        summary = run_batch([self.inputs], os.path.join(self.tmp.name, "out"), ocr_workers=1, render_workers=1,
+                            ocr_factory=dying_ocr_factory, translator=UpperTranslator())
+        self.assertEqual(summary["images"], 0)
+        self.assertGreater(summary["errors"], 0)
+
+    def test_unknown_ocr_strategy_is_rejected_before_spawning(self):
+        with self.assertRaises(ValueError):
+            run_batch([self.inputs], os.path.join(self.tmp.name, "out"), ocr_strategy="bogus",
+                      ocr_factory=fake_ocr_factory, translator=UpperTranslator())
+        result = subprocess.run([sys.executable, "batch_translate.py", self.inputs, "-o", self.tmp.name, "--ocr", "bogus"],
+                                cwd=ROOT, capture_output=True, text=True, timeout=30)
+        self.assertEqual(result.returncode, 2)
+        self.assertIn("invalid choice", result.stderr)
+
+    def test_headless_import_does_not_load_qt(self):
+        code = "import sys, core.batch_pipeline; print('PyQt6' in sys.modules)"
+        result = subprocess.run([sys.executable, "-c", code], cwd=ROOT, capture_output=True, text=True, check=True)
+        self.assertEqual(result.stdout.strip(), "False")
+
+if __name__ == '__main__':
+    unittest.main()
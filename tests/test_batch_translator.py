@@ -0,0 +1,106 @@
+import threading
+import time
+import unittest
+from services.base_translator import BaseTranslator, RateLimitedError
+from services.batch_translator import BatchTranslator, decode_lines, encode_lines, plan_chunks
+from services.translation_memory import TranslationMemory, CachedTranslator
+
+class MarkerTranslator(BaseTranslator):
+    """
+    Keeps markers, upper-cases text. Lines listed in drop_once are dropped on first sight.
+    fail=True rejects every request; lines listed in fail_on reject the requests containing them.
+    """
+    name = "fake"
+
+    def __init__(self, drop_once=(), delay=0.0, fail=False, fail_on=()):
+        self.drop_once = set(drop_once)
+        self.delay = delay
+        self.fail = fail
+        self.fail_on = set(fail_on)
+        self.requests = []
+        self.active = 0
+        self.max_active = 0
+        self._lock = threading.Lock()
+
+    def translate(self, text):
+        with self._lock:
+            self.requests.append(text)
+            self.active += 1
+            self.max_active = max(self.max_active, self.active)
+        try:
+            time.sleep(self.delay)
+            if self.fail or any(line.endswith(f"] {word}") for line in text.split("\n") for word in self.fail_on):
+                raise RateLimitedError("quota", provider=self.name, status=429)
+            out = []
+            for line in text.split("\n"):
+                marker, _, body = line.partition("] ")
+                if body in self.drop_once:
+                    self.drop_once.discard(body)  # dropped by the provider
+                else:
+                    out.append(f"{marker}] {body.upper()}" if body else line.upper())
+            return "\n".join(out)
+        finally:
+            with self._lock:
+                self.active -= 1
+
+class StreamingMarkerTranslator(MarkerTranslator):
+    def stream_text(self, text):
+        response = self.translate(text)
+        for i in range(0, len(response), 3):
+            yield response[i:i + 3]
+
+class TestBatchTranslator(unittest.TestCase):
+    def test_markers_round_trip(self):
+        self.assertEqual(encode_lines(["a", "b"]), "[[0]] a\n[[1]] b")
+        self.assertEqual(decode_lines("[[0]] 你好 ［［1］］世界\n[[7]] stray", 2), {0: "你好", 1: "世界 [[7]] stray"})
+
+    def test_chunks_respect_char_and_line_budgets(self):
+        lines = ["x" * 40] * 10
+        chunks = plan_chunks(lines, max_chars=100, max_lines=24)
+        self.assertEqual([len(chunk) for _, chunk in chunks], [2, 2, 2, 2, 2])
+        self.assertEqual([start for start, _ in chunks], [0, 2, 4, 6, 8])
+        self.assertEqual([len(chunk) for _, chunk in plan_chunks(["a"] * 10, max_lines=4)], [4, 4, 2])
+
+    def test_misaligned_lines_are_retried_and_stay_aligned(self):
+        provider = MarkerTranslator(drop_once={"beta"})
+        batch = BatchTranslator(provider)
+        self.assertEqual(batch.translate_lines(["alpha", "beta", "gamma"]), ["ALPHA", "BETA", "GAMMA"])
+        self.assertEqual(provider.requests[1], "[[0]] beta")
+        self.assertEqual(batch.stats["retried_lines"], 1)
+
+    def test_chunks_run_concurrently_up_to_the_limit(self):
+        provider = MarkerTranslator(delay=0.05)
+        batch = BatchTranslator(provider, max_lines=2, max_parallel=3)
+        lines = [f"line {i}" for i in range(12)]
+        start = time.perf_counter()
+        self.assertEqual(batch.translate_lines(lines), [line.upper() for line in lines])
+        self.assertLess(time.perf_counter() - start, 6 * 0.05)
+        self.assertEqual(provider.max_active, 3)
+
+    def test_errors_are_raised_and_not_cached(self):
+        memory = TranslationMemory(None)
+        translator = CachedTranslator(BatchTranslator(MarkerTranslator(fail=True)), memory)
+        with self.assertRaises(RateLimitedError) as raised:
+            translator.translate_lines(["a", "b"])
+        self.assertEqual((raised.exception.provider, raised.exception.status), ("fake", 429))
+        self.assertEqual(memory.get_many([translator._key("a")]), {})
+
+    def test_failed_chunk_does_not_discard_the_others(self):
+        memory = TranslationMemory(None)
+        translator = CachedTranslator(BatchTranslator(MarkerTranslator(fail_on={"line 5"}), max_lines=2), memory)
+        lines = [f"line {i}" for i in range(8)]
+        received = {}
+        with self.assertRaises(RateLimitedError):
+            for index, value in translator.translate_stream(lines):
+                received[index] = value
+        self.assertEqual(sorted(received), [0, 1, 2, 3, 6, 7])
+        # Lines that did translate are remembered; the failed chunk is not
+        self.assertEqual(len(memory.get_many([translator._key(line) for line in lines])), 6)
+
+    def test_single_chunk_is_token_streamed(self):
+        provider = StreamingMarkerTranslator(drop_once={"two"})
+        batch = BatchTranslator(provider)
+        self.assertEqual(sorted(batch.translate_stream(["one", "two", "three"])), [(0, "ONE"), (1, "TWO"), (2, "THREE")])
+
+if __name__ == '__main__':
+    unittest.main()
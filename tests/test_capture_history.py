@@ -0,0 +1,148 @@
+import gc
+import os
+import tempfile
+import threading
+import tracemalloc
+import unittest
+import weakref
+from unittest.mock import patch
+from PIL import Image, ImageDraw
+from services.capture_history import CaptureHistory, DiskStore, HistoryEntry
+from services.drawing_service import OverlayScene
+
+def capture(n, size=(64, 48)):
+    image = Image.new("RGB", size, (n % 256, 80, 160))
+    ImageDraw.Draw(image).text((4, 4), str(n), fill="white")
+    lines = [{'original': f"line {n}", 'box': (4, 4, 40, 16)}]
+    return HistoryEntry(OverlayScene(image, lines, [f"translated {n}"], "Serif"), [f"line {n}"])
+
+class TestCaptureHistory(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.directory = os.path.join(self.tmp.name, "history")
+
+    def history(self, **kwargs):
+        history = CaptureHistory(directory=self.directory, **kwargs)
+        self.addCleanup(history.close)
+        return history
+
+    def test_recent_entries_are_served_from_memory(self):
+        history = self.history(max_bytes=10 * capture(0).nbytes)
+        entry = capture(0)
+        self.assertEqual(history.add(entry), 0)
+        self.assertIs(history.get(0), entry)
+        self.assertEqual(history.stats["spilled"], 0)
+
+    def test_spilled_entries_redisplay_exactly(self):
+        history = self.history(max_bytes=3 * capture(0).nbytes)
+        originals = [capture(n) for n in range(10)]
+        for entry in originals:
+            history.add(entry)
+        self.assertFalse(history.in_memory(0))
+        self.assertTrue(history.in_memory(9))
+
+        restored = history.get(2)
+        self.assertEqual(history.stats["disk_hits"], 1)
+        self.assertEqual(restored.scene.image.tobytes(), originals[2].scene.image.tobytes())  # lossless
+        self.assertEqual(restored.scene.lines_metadata, originals[2].scene.lines_metadata)
+        self.assertEqual(restored.translated_text, "translated 2")
+        self.assertEqual(restored.original_text, "line 2")
+        self.assertEqual(restored.scene.font_family, "Serif")
+        self.assertEqual(restored.timestamp, originals[2].timestamp)
+
+    def test_memory_budget_holds_across_thousands_of_captures(self):
+        budget = 20 * capture(0).nbytes
+        history = self.history(max_bytes=budget)
+        alive = []
+        tracemalloc.start()
+        try:
+            for n in range(3000):
+                entry = capture(n)
+                alive.append(weakref.ref(entry.scene.image))
+                history.add(entry)
+                self.assertLessEqual(history.bytes, budget)
+                if n == 100:
+                    gc.collect()
+                    baseline = tracemalloc.get_traced_memory()[0]
+            gc.collect()
+            grown = tracemalloc.get_traced_memory()[0] - baseline
+        finally:
+            tracemalloc.stop()
+        # Spilled images are really released, not just unaccounted
+        self.assertLessEqual(sum(1 for ref in alive if ref() is not None), 20)
+        # Python-side bookkeeping per spilled capture stays small (position -> size on disk)
+        self.assertLess(grown, 3000 * 400)
+        self.assertEqual(len(history), 3000)
+        self.assertEqual(history.get(1500).translated_text, "translated 1500")
+
+    def test_disk_budget_drops_the_oldest_captures(self):
+        history = self.history(max_bytes=1, max_disk_bytes=5 * 1024)
+        for n in range(50):
+            history.add(capture(n))
+        self.assertLessEqual(history.disk_bytes, 5 * 1024)
+        self.assertIsNone(history.get(0))
+        self.assertIsNotNone(history.get(48))
+        self.assertIsNotNone(history.get(49))
+
+    def test_replace_updates_a_spilled_capture(self):
+        history = self.history(max_bytes=2 * capture(0).nbytes)
+        for n in range(5):
+            history.add(capture(n))
+        history.replace(0, capture(100))
+        self.assertEqual(history.get(0).translated_text, "translated 100")
+        with self.assertRaises(IndexError):
+            history.replace(5, capture(0))
+
+    def test_index_grows_and_store_is_removed_on_close(self):
+        store = DiskStore(self.directory, capacity=2)
+        for position in range(5):
+            store.write(position, capture(position))
+        self.assertEqual(store.read(4).original_text, "line 4")
+        self.assertIsNone(store.read(7))
+        store.close()
+        self.assertFalse(os.path.exists(store.directory))
+        self.assertTrue(os.path.isdir(self.directory))
+
+    def test_instances_sharing_a_cache_directory_keep_their_files(self):
+        first = DiskStore(self.directory)
+        first.write(0, capture(0))
+        second = DiskStore(self.directory)
+        second.write(0, capture(1))
+        second.close()
+        self.assertEqual(first.read(0).original_text, "line 0")
+        first.close()
+
+    def test_spill_encodes_outside_the_lock(self):
+        history = self.history(max_bytes=capture(0).nbytes)
+        history.add(capture(0))
+        encoding, release = threading.Event(), threading.Event()
+        encode = DiskStore.encode
+
+        def slow_encode(entry):
+            encoding.set()
+            release.wait(5)
+            return encode(entry)
+
+        with patch.object(DiskStore, "encode", side_effect=slow_encode):
+            adding = threading.Thread(target=history.add, args=(capture(1),))
+            adding.start()
+            self.assertTrue(encoding.wait(5))
+            # The evicted entry is still served, and the UI does not wait for the encode
+            self.assertEqual(history.get(0).original_text, "line 0")
+            self.assertEqual(history.get(1).original_text, "line 1")
+            release.set()
+            adding.join()
+        self.assertFalse(history.in_memory(0))
+        self.assertEqual(history.get(0).original_text, "line 0")
+        self.assertEqual(history.stats["disk_hits"], 1)
+
+    def test_without_directory_old_entries_are_dropped(self):
+        history = CaptureHistory(max_bytes=2 * capture(0).nbytes)
+        for n in range(4):
+            history.add(capture(n))
+        self.assertIsNone(history.get(0))
+        self.assertIsNotNone(history.get(3))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,101 @@
+import unittest
+from types import SimpleNamespace
+from services.capture_service import CaptureService, FramePool
+
+class FakeGrabber:
+    """mss-like grabber: BGRA pixels whose blue channel counts the grabs."""
+
+    def __init__(self):
+        self.calls = []
+        self.fail = False
+
+    def grab(self, monitor):
+        if self.fail:
+            raise OSError("display gone")
+        self.calls.append(dict(monitor))
+        count = len(self.calls)
+        pixel = bytes((count, 20, 30, 255))  # B, G, R, X
+        return SimpleNamespace(raw=bytearray(pixel * monitor["width"] * monitor["height"]),
+                               width=monitor["width"], height=monitor["height"])
+
+REGION = {"top": 5, "left": 7, "width": 16, "height": 8}
+
+class TestCaptureService(unittest.TestCase):
+    def setUp(self):
+        self.grabber = FakeGrabber()
+        self.service = CaptureService(self.grabber)
+
+    def test_grab_converts_bgra_to_rgb(self):
+        image = self.service.grab(REGION)
+        self.assertEqual((image.mode, image.size), ("RGB", (16, 8)))
+        self.assertEqual(image.getpixel((3, 3)), (30, 20, 1))
+
+    def test_recapture_last_reuses_region_without_overlay(self):
+        self.assertIsNone(self.service.recapture_last())
+        self.service.grab(REGION)
+        image = self.service.recapture_last()
+        self.assertEqual(self.grabber.calls, [REGION, REGION])
+        self.assertEqual(image.getpixel((0, 0)), (30, 20, 2))
+
+    def test_several_regions_share_one_grab(self):
+        regions = [REGION, {"top": 30, "left": 2, "width": 4, "height": 4}]
+        image, boxes = self.service.grab_regions(regions)
+        self.assertEqual(self.grabber.calls, [{"top": 5, "left": 2, "width": 21, "height": 29}])
+        self.assertEqual(image.size, (21, 29))
+        self.assertEqual(boxes, [(5, 0, 21, 8), (0, 25, 4, 29)])
+        self.assertEqual(self.service.last_regions, regions)
+        self.service.grab(REGION)
+        self.assertIsNone(self.service.last_regions)
+
+    def test_plain_grabs_are_owned_by_the_caller(self):
+        first = self.service.grab(REGION)
+        self.service.grab(REGION)
+        self.assertEqual(first.getpixel((0, 0)), (30, 20, 1))
+        self.assertEqual(self.service.pool.stats, {"reused": 0, "allocated": 0, "unpooled": 0})
+
+    def test_released_frames_are_reused_and_held_frames_are_not_overwritten(self):
+        held = self.service.grab(REGION, pooled=True)
+        for _ in range(5):
+            frame = self.service.grab(REGION, pooled=True)
+            self.service.release(frame)
+        # A frame that was never released keeps its pixels
+        self.assertEqual(held.getpixel((0, 0)), (30, 20, 1))
+        self.assertEqual(frame.getpixel((0, 0)), (30, 20, 6))
+        self.assertEqual(self.service.pool.stats["allocated"], 2)
+        self.assertEqual(self.service.pool.stats["reused"], 4)
+
+    def test_detached_frames_leave_the_pool(self):
+        kept = self.service.grab(REGION, pooled=True)
+        self.service.detach(kept)
+        self.service.release(kept)  # no effect once detached
+        self.service.grab(REGION, pooled=True)
+        self.assertEqual(kept.getpixel((0, 0)), (30, 20, 1))
+        self.assertEqual(self.service.pool.stats["reused"], 0)
+
+    def test_pool_is_bounded(self):
+        pool = FramePool(max_frames=2)
+        frames = [pool.acquire(4, 4) for _ in range(3)]
+        self.assertEqual(pool.stats, {"reused": 0, "allocated": 2, "unpooled": 1})
+        for frame in frames:
+            pool.release(frame)  # the unpooled frame is not kept
+        pool.acquire(4, 4)
+        pool.acquire(4, 4)
+        self.assertEqual(pool.stats, {"reused": 2, "allocated": 2, "unpooled": 1})
+        pool.acquire(4, 4)
+        self.assertEqual(pool.stats["unpooled"], 2)
+
+    def test_latency_stats_and_errors(self):
+        self.assertEqual(self.service.latency(), {"count": 0})
+        for _ in range(10):
+            self.service.grab(REGION)
+        latency = self.service.latency()
+        self.assertEqual(latency["count"], 10)
+        self.assertLessEqual(latency["p50_ms"], latency["p95_ms"])
+
+        self.grabber.fail = True
+        with self.assertRaises(OSError):
+            self.service.grab(REGION)
+        self.assertEqual(self.service.stats, {"grabs": 10, "errors": 1})
+
+if __name__ == '__main__':
+    unittest.main()
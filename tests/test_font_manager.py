@@ -0,0 +1,60 @@
+import unittest
+from unittest.mock import patch
+from PIL import Image, ImageDraw
+from services.drawing_service import draw_line_text
+from services.font_manager import FontManager
+
+class TestFontManager(unittest.TestCase):
+    def setUp(self):
+        self.fonts = FontManager(font_path="")  # Pillow's default FreeType font
+
+    def test_font_path_is_probed_once(self):
+        fonts = FontManager()
+        with patch('utils.helpers.get_font_path', return_value=None) as probe:
+            fonts.font(12)
+            fonts.font(14)
+            fonts.fit("hello", 100, 20)
+        self.assertEqual(probe.call_count, 1)
+
+    def test_faces_scale_with_distinct_sizes_not_lines(self):
+        image = Image.new("RGB", (400, 400), "white")
+        draw = ImageDraw.Draw(image)
+        for i in range(50):
+            draw_line_text(draw, {'box': (0, i * 8, 300, i * 8 + 20)}, "Same height line", self.fonts)
+        self.assertLessEqual(self.fonts.stats["face_loads"], 2)
+
+    def test_face_cache_is_bounded(self):
+        fonts = FontManager(font_path="", max_faces=3)
+        for size in range(10, 20):
+            fonts.font(size)
+        self.assertEqual(len(fonts._faces), 3)
+
+    def test_fit_picks_largest_size_that_fits(self):
+        text = "A fairly long translated sentence"
+        font, size, lines = self.fonts.fit(text, 200, 20)
+        self.assertEqual(lines, [text])
+        self.assertLessEqual(self.fonts.text_width(text, size), 200)
+        self.assertGreater(self.fonts.text_width(text, size + 1), 200)
+
+    def test_text_too_long_for_min_size_overflows_on_one_line(self):
+        self.assertEqual(self.fonts.fit("A fairly long translated sentence", 60, 20)[1:], (10, ["A fairly long translated sentence"]))
+
+    def test_tall_boxes_wrap_instead_of_shrinking(self):
+        font, size, lines = self.fonts.fit("word " * 12, 120, 120)
+        self.assertGreater(len(lines), 1)
+        self.assertTrue(all(self.fonts.text_width(line, size) <= 120 for line in lines))
+        self.assertLessEqual(len(lines) * self.fonts.line_height(size), 120)
+
+    def test_unspaced_text_wraps_between_characters(self):
+        lines = self.fonts.wrap("abcdefghijklmnopqrstuvwxyz", 20, 100)
+        self.assertGreater(len(lines), 1)
+        self.assertEqual("".join(lines), "abcdefghijklmnopqrstuvwxyz")
+
+    def test_repeated_layouts_are_cached(self):
+        self.fonts.fit("Quest Log", 80, 18)
+        measures = self.fonts.stats["measures"]
+        self.fonts.fit("Quest Log", 80, 18)
+        self.assertEqual(self.fonts.stats["measures"], measures)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,78 @@
+import unittest
+from unittest.mock import patch
+from services.ocr_result import OcrResult
+from PIL import Image, ImageDraw
+from services.ocr_cache import OCRCache
+from services.ocr_service import OCRService
+
+WORDS = {
+    'text': ['Hello'], 'block_num': [1], 'line_num': [1],
+    'left': [0], 'top': [0], 'width': [10], 'height': [10], 'conf': [90]
+}
+
+def make_result():
+    return OcrResult.from_columns(WORDS)
+
+def make_image(text='Inventory'):
+    image = Image.new('RGB', (200, 60), 'white')
+    ImageDraw.Draw(image).text((10, 20), text, fill='black')
+    return image
+
+class TestOCRCache(unittest.TestCase):
+    def test_exact_and_perceptual_hits(self):
+        cache = OCRCache(tolerance=8)
+        image = make_image()
+        cache.put(image, make_result())
+
+        self.assertEqual(list(cache.get(image.copy()).text), ['Hello'])
+        self.assertEqual(cache.stats['exact_hits'], 1)
+
+        # A single flipped pixel is "the same capture"
+        nearly = image.copy()
+        nearly.putpixel((199, 59), (250, 250, 250))
+        self.assertIsNotNone(cache.get(nearly))
+        self.assertEqual(cache.stats['perceptual_hits'], 1)
+
+    def test_small_text_change_is_never_a_hit(self):
+        # Same 16x16 dHash, different text: the pixel check rejects the candidate
+        before, after = make_image('HP 100/100'), make_image('HP 90/100')
+        for cache in (OCRCache(), OCRCache(tolerance=8)):
+            cache.put(before, make_result())
+            self.assertIsNone(cache.get(after))
+            self.assertEqual(cache.stats['perceptual_hits'], 0)
+
+    def test_exact_only_lookup(self):
+        cache = OCRCache(tolerance=8)
+        image = make_image()
+        cache.put(image, make_result())
+        nearly = image.copy()
+        nearly.putpixel((199, 59), (250, 250, 250))
+        self.assertIsNone(cache.get(nearly, perceptual=False))
+        self.assertIsNotNone(cache.get(image.copy(), perceptual=False))
+
+    def test_different_content_or_size_misses(self):
+        cache = OCRCache()
+        cache.put(make_image('Inventory'), make_result())
+        self.assertIsNone(cache.get(make_image('Settings and options')))
+        self.assertIsNone(cache.get(make_image().resize((100, 30))))
+        self.assertEqual(cache.stats['misses'], 2)
+
+    def test_bounded_entries(self):
+        cache = OCRCache(max_entries=2, tolerance=0)
+        for i in range(3):
+            cache.put(Image.new('RGB', (10, 10), (i, i, i)), make_result())
+        self.assertEqual(cache.stats['evictions'], 1)
+        self.assertIsNone(cache.get(Image.new('RGB', (10, 10), (0, 0, 0))))
+
+    @patch('services.ocr_service.pytesseract.image_to_data')
+    def test_repeat_capture_skips_ocr(self, mock_image_to_data):
+        mock_image_to_data.return_value = WORDS
+        service = OCRService()
+        image = make_image()
+        service.perform_ocr(image)
+        data = service.perform_ocr(image.copy())
+        self.assertEqual(mock_image_to_data.call_count, 1)
+        self.assertEqual(list(data.text), ['Hello'])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,42 @@
+import unittest
+import pandas as pd
+from services.ocr_result import OcrResult
+
+TESSERACT_DICT = {
+    'text': ['', 'Hello', 'World', '  ', 'Quest', 'Log'],
+    'block_num': [1, 1, 1, 1, 2, 2],
+    'line_num': [0, 1, 1, 1, 1, 1],
+    'left': [0, 10, 60, 0, 10, 70],
+    'top': [0, 5, 7, 0, 40, 38],
+    'width': [200, 40, 45, 0, 50, 30],
+    'height': [100, 12, 10, 0, 12, 14],
+    'conf': [-1, 95, 91, -1, 88, 90],
+}
+
+class TestOcrResult(unittest.TestCase):
+    def test_blank_entries_dropped(self):
+        result = OcrResult.from_columns(TESSERACT_DICT)
+        self.assertEqual(len(result), 4)
+        self.assertEqual(result.text.tolist(), ['Hello', 'World', 'Quest', 'Log'])
+
+    def test_lines_match_dataframe_grouping(self):
+        texts, metadata = OcrResult.from_columns(TESSERACT_DICT).lines()
+        self.assertEqual(texts, ['Hello World', 'Quest Log'])
+        self.assertEqual(metadata[0]['box'], (10, 5, 105, 17))
+        self.assertEqual(metadata[1]['box'], (10, 38, 100, 52))
+
+    def test_dataframe_adapter_round_trip(self):
+        result = OcrResult.from_dataframe(pd.DataFrame(TESSERACT_DICT))
+        df = result.to_dataframe()
+        self.assertEqual(list(df.text), ['Hello', 'World', 'Quest', 'Log'])
+        self.assertEqual(OcrResult.from_dataframe(df).lines(), result.lines())
+
+    def test_offset_and_scale(self):
+        result = OcrResult.from_columns(TESSERACT_DICT)
+        moved = result.offset(100, 200).scale(0.5)
+        self.assertEqual(moved.left.tolist()[0], 55)
+        self.assertEqual(moved.top.tolist()[0], 102)
+        self.assertEqual(result.left.tolist()[0], 10)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,75 @@
+import os
+import unittest
+from PIL import Image
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+from PyQt6.QtWidgets import QApplication
+from PyQt6.QtGui import QImage, QPainter, QColor
+from services.drawing_service import OverlayScene
+from ui.overlay_view import OverlayView, pil_to_pixmap
+
+class TestOverlayView(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.app = QApplication.instance() or QApplication([])
+
+    def setUp(self):
+        self.image = Image.new("RGB", (200, 100), (40, 90, 160))
+        self.lines = [{'box': (10, 10, 150, 30)}, {'box': (10, 50, 150, 70)}]
+
+    def paint(self, view):
+        target = QImage(200, 100, QImage.Format.Format_RGB32)
+        painter = QPainter(target)
+        view.paint_scene(painter)
+        painter.end()
+        return target
+
+    def test_pixmap_keeps_pixels(self):
+        pixmap = pil_to_pixmap(self.image)
+        self.assertEqual((pixmap.width(), pixmap.height()), (200, 100))
+        self.assertEqual(pixmap.toImage().pixelColor(5, 5), QColor(40, 90, 160))
+
+    def test_base_is_converted_once_per_capture(self):
+        view = OverlayView()
+        view.set_scene(OverlayScene(self.image, self.lines, ["", ""]))
+        view.set_scene(OverlayScene(self.image, self.lines, ["Hello", ""]))
+        view.set_scene(OverlayScene(self.image, self.lines, ["Hello", "World"]))
+        self.assertEqual(view.stats["base_conversions"], 1)
+
+        view.set_scene(OverlayScene(self.image.copy(), self.lines, ["Hello", "World"]))
+        self.assertEqual(view.stats["base_conversions"], 2)
+
+    def test_patches_and_text_are_painted_over_the_untouched_base(self):
+        view = OverlayView()
+        view.set_scene(OverlayScene(self.image, self.lines, ["Hello world", ""]))
+        painted = self.paint(view)
+
+        self.assertEqual(painted.pixelColor(5, 5), QColor(40, 90, 160))
+        self.assertEqual(painted.pixelColor(148, 60), QColor("white"))
+        first_line = [painted.pixelColor(x, y).lightness() for x in range(10, 150) for y in range(10, 30)]
+        self.assertLess(min(first_line), 128)
+        # The source screenshot itself is never drawn on
+        self.assertEqual(self.image.getpixel((20, 20)), (40, 90, 160))
+
+    def test_long_translations_wrap_inside_their_box(self):
+        view = OverlayView()
+        lines = [{'box': (10, 10, 90, 90)}]
+        text = "a rather long translated sentence that needs several lines"
+        view.set_scene(OverlayScene(self.image, lines, [text]))
+        size, wrapped = view._layout(text, 80, 80)
+        self.assertGreater(len(wrapped), 1)
+        self.assertGreater(size, 10)
+        self.assertTrue(all(view._font_metrics(size).horizontalAdvance(line) <= 80 for line in wrapped))
+
+        painted = self.paint(view)
+        # Nothing spills to the right of the patch (box + 2 px)
+        spill = [painted.pixelColor(x, y) for x in range(94, 200) for y in range(10, 90)]
+        self.assertTrue(all(color == QColor(40, 90, 160) for color in spill))
+
+    def test_scene_render_flattens_for_export(self):
+        flattened = OverlayScene(self.image, self.lines, ["Hello", "World"]).render()
+        self.assertEqual(flattened.getpixel((148, 60)), (255, 255, 255))
+        self.assertEqual(self.image.getpixel((148, 60)), (40, 90, 160))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,110 @@
+import unittest
+from PIL import Image
+from core.pipeline import PipelineRun, Stage, StagedPipeline, capture_stages
+from core.scheduler import CancellationToken, JobCancelled
+from services.base_translator import BaseTranslator, TranslationError
+from services.ocr_result import OcrResult
+
+class FakeOCRService:
+    """Two words on one line; cached results skip preprocessing, like OCRService."""
+
+    def __init__(self, cached=False):
+        self.cached = cached
+        self.calls = {"preprocess": 0, "ocr": 0}
+
+    def preprocess(self, image):
+        self.calls["preprocess"] += 1
+        return image, 1.0
+
+    def perform_ocr(self, image, prepare=None):
+        self.calls["ocr"] += 1
+        if not self.cached:
+            prepare()
+        return OcrResult.from_columns({
+            'text': ["Quest", "Log"], 'block_num': [1, 1], 'line_num': [1, 1], 'left': [0, 60], 'top': [5, 5],
+            'width': [50, 30], 'height': [12, 12], 'conf': [90, 90]
+        })
+
+class TaggingTranslator(BaseTranslator):
+    def __init__(self, name, fail=False):
+        self.name = name
+        self.fail = fail
+
+    def translate(self, text):
+        if self.fail:
+            raise TranslationError("down", provider=self.name)
+        return "\n".join(f"{self.name}:{line}" for line in text.split("\n"))
+
+class TestStagedPipeline(unittest.TestCase):
+    def setUp(self):
+        self.ocr = FakeOCRService()
+        self.translators = {"a": TaggingTranslator("a"), "b": TaggingTranslator("b"), "down": TaggingTranslator("down", fail=True)}
+        self.pipeline = StagedPipeline(capture_stages(lambda: self.ocr, self.translators.get), provider="a", font="Sans")
+        self.pipeline.set_input("capture", Image.new("RGB", (100, 20)))
+
+    def runs(self):
+        runs = dict(self.pipeline.stats["runs"])
+        self.pipeline.stats["runs"].clear()
+        return runs
+
+    def test_first_run_computes_every_stage(self):
+        scene = self.pipeline.get("render")
+        self.assertEqual(scene.translated_texts, ["a:Quest Log"])
+        self.assertEqual(scene.font_family, "Sans")
+        self.assertEqual(self.runs(), {"preprocess": 1, "ocr": 1, "layout": 1, "language": 1, "translate": 1, "render": 1})
+
+    def test_provider_switch_reruns_translate_and_render_only(self):
+        self.pipeline.get("render")
+        self.runs()
+        self.pipeline.set_params(provider="b")
+        self.assertFalse(self.pipeline.is_fresh("translate"))
+        self.assertTrue(self.pipeline.is_fresh("layout"))
+        self.assertEqual(self.pipeline.get("render").translated_texts, ["b:Quest Log"])
+        self.assertEqual(self.runs(), {"translate": 1, "render": 1})
+        self.assertEqual(self.ocr.calls, {"preprocess": 1, "ocr": 1})
+
+    def test_font_change_reruns_render_only(self):
+        self.pipeline.get("render")
+        self.runs()
+        self.pipeline.set_params(font="Serif")
+        self.assertEqual(self.pipeline.get("render").font_family, "Serif")
+        self.assertEqual(self.runs(), {"render": 1})
+        self.pipeline.get("render")
+        self.assertEqual(self.runs(), {})
+
+    def test_new_capture_invalidates_everything(self):
+        self.pipeline.get("render")
+        self.runs()
+        self.pipeline.set_input("capture", Image.new("RGB", (100, 20), "white"))
+        self.pipeline.get("render")
+        self.assertEqual(self.runs(), {"preprocess": 1, "ocr": 1, "layout": 1, "language": 1, "translate": 1, "render": 1})
+
+    def test_ocr_cache_hit_never_preprocesses(self):
+        self.ocr.cached = True
+        self.pipeline.get("layout")
+        self.assertEqual(self.ocr.calls, {"preprocess": 0, "ocr": 1})
+
+    def test_failed_stage_is_not_memoized(self):
+        self.pipeline.set_params(provider="down")
+        progress = []
+        with self.assertRaises(TranslationError):
+            self.pipeline.get("render", PipelineRun(on_progress=lambda stage, value: progress.append(stage)))
+        self.assertFalse(self.pipeline.is_fresh("translate"))
+        self.assertTrue(self.pipeline.is_fresh("layout"))
+        self.pipeline.set_params(provider="a")
+        self.assertEqual(self.pipeline.get("render").translated_texts, ["a:Quest Log"])
+
+    def test_cancelled_run_stops_before_the_next_stage(self):
+        token = CancellationToken(1)
+        token.cancel()
+        with self.assertRaises(JobCancelled):
+            self.pipeline.get("render", PipelineRun(token))
+        self.assertEqual(self.runs(), {})
+
+    def test_source_stage_requires_an_input(self):
+        pipeline = StagedPipeline([Stage("capture"), Stage("size", lambda p, run: p.get("capture", run).size, inputs=("capture",))])
+        with self.assertRaises(KeyError):
+            pipeline.get("size")
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,71 @@
+import unittest
+from unittest.mock import patch
+from PIL import Image, ImageDraw, ImageFont
+from services.ocr_result import OcrResult
+from services.ocr_service import OCRService
+from services.preprocess import Preprocessor
+
+def text_image(font_size, background='white', color='black', size=(600, 400)):
+    image = Image.new('RGB', size, background)
+    draw = ImageDraw.Draw(image)
+    font = ImageFont.load_default(size=font_size)
+    for i, y in enumerate(range(10, size[1] - font_size * 2, font_size * 2)):
+        draw.text((10, y), f"Quest log entry {i} gold and experience", fill=color, font=font)
+    return image
+
+class TestPreprocessor(unittest.TestCase):
+    def setUp(self):
+        self.preprocessor = Preprocessor(target_x_height=20)
+
+    def test_tiny_text_is_upscaled(self):
+        processed, scale = self.preprocessor.process(text_image(10))
+        self.assertGreater(scale, 1.25)
+        self.assertEqual(processed.size, (round(600 * scale), round(400 * scale)))
+        self.assertEqual(processed.mode, 'L')
+
+    def test_huge_text_is_downscaled(self):
+        _, scale = self.preprocessor.process(text_image(90, size=(1600, 1200)))
+        self.assertLess(scale, 0.8)
+
+    def test_scale_ignores_panels_and_pictures_beside_the_text(self):
+        preprocessor = Preprocessor()
+        _, alone = preprocessor.process(text_image(14, size=(900, 400)))
+        panel = text_image(14, size=(900, 400))
+        ImageDraw.Draw(panel).rectangle([650, 20, 880, 380], fill='black')
+        picture = text_image(14, size=(900, 400))
+        for k in range(6):
+            ImageDraw.Draw(picture).ellipse([650 + 20 * k, 30 + 40 * k, 800 + 10 * k, 150 + 40 * k], fill=(40 * k, 60, 90))
+        self.assertGreater(alone, 1.25)
+        self.assertEqual(preprocessor.process(panel)[1], alone)
+        self.assertAlmostEqual(preprocessor.process(picture)[1], alone, delta=0.5)
+
+    def test_no_clear_text_keeps_the_resolution(self):
+        shapes = Image.new('RGB', (600, 400), 'white')
+        for k in range(8):
+            ImageDraw.Draw(shapes).ellipse([60 * k, 30 * k, 60 * k + 200, 30 * k + 150], fill=(30 * k, 80, 120))
+        processed, scale = self.preprocessor.process(shapes)
+        self.assertEqual((scale, processed.size), (1.0, (600, 400)))
+
+    def test_dark_mode_is_inverted(self):
+        processed, _ = self.preprocessor.process(text_image(40, background=(30, 30, 30), color=(220, 220, 220)))
+        histogram = processed.histogram()
+        self.assertGreater(histogram[255], histogram[0], "Background should end up white")
+
+    def test_boxes_mapped_back_to_original_space(self):
+        class DoublingPreprocessor:
+            def process(self, image):
+                return image.resize((image.size[0] * 2, image.size[1] * 2)), 2.0
+
+        recognized = OcrResult.from_columns({
+            'text': ['Hello'], 'block_num': [1], 'line_num': [1],
+            'left': [20], 'top': [40], 'width': [100], 'height': [30], 'conf': [90]
+        })
+        service = OCRService(preprocessor=DoublingPreprocessor())
+        with patch.object(service, '_recognize', return_value=recognized) as mock_recognize:
+            data = service.perform_ocr(Image.new('RGB', (100, 100)))
+
+        self.assertEqual(mock_recognize.call_args[0][0].size, (200, 200))
+        self.assertEqual(data.lines()[1][0]['box'], (10, 20, 60, 35))
+
+if __name__ == '__main__':
+    unittest.main()
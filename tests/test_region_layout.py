@@ -0,0 +1,102 @@
+import os
+import tempfile
+import threading
+import time
+import unittest
+from PIL import Image
+from core.pipeline import StagedPipeline, capture_stages
+from services.batch_translator import BatchTranslator
+from services.capture_history import DiskStore, HistoryEntry
+from services.ocr_result import OcrResult
+from services.region_layout import bounding_region, load_layout, region_boxes, region_of, save_layout
+from services.stub_translator import StubTranslatorProvider
+
+REGIONS = [
+    {"top": 100, "left": 50, "width": 200, "height": 40},   # dialogue box
+    {"top": 20, "left": 400, "width": 120, "height": 80},   # quest log
+    {"top": 300, "left": 380, "width": 60, "height": 30},   # tooltip
+]
+
+class RegionOCRService:
+    """Recognizes one line per 20 px of crop height, named after the crop size; slow like a real engine."""
+
+    def __init__(self, delay=0.1):
+        self.delay = delay
+        self.active = 0
+        self.max_active = 0
+        self._lock = threading.Lock()
+
+    def perform_ocr(self, image, prepare=None):
+        with self._lock:
+            self.active += 1
+            self.max_active = max(self.max_active, self.active)
+        time.sleep(self.delay)
+        with self._lock:
+            self.active -= 1
+        width, height = image.size
+        lines = max(1, height // 20)
+        return OcrResult.from_columns({
+            'text': [f"w{width}h{height}-{n}" for n in range(lines)], 'block_num': [1] * lines,
+            'line_num': list(range(1, lines + 1)), 'left': [2] * lines, 'top': [20 * n + 2 for n in range(lines)],
+            'width': [width - 4] * lines, 'height': [14] * lines, 'conf': [90] * lines,
+        })
+
+class TestRegionLayout(unittest.TestCase):
+    def test_regions_map_into_one_bounding_grab(self):
+        bounds = bounding_region(REGIONS)
+        self.assertEqual(bounds, {"top": 20, "left": 50, "width": 470, "height": 310})
+        boxes = region_boxes(REGIONS)
+        self.assertEqual(boxes, [(0, 80, 200, 120), (350, 0, 470, 80), (330, 280, 390, 310)])
+        self.assertEqual(region_of((360, 10, 400, 30), boxes), 1)
+        self.assertIsNone(region_of((250, 200, 300, 220), boxes))
+
+    def test_layout_round_trip(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "layouts", "game.json")
+            save_layout(path, REGIONS)
+            self.assertEqual(load_layout(path), REGIONS)
+
+            with open(path, "w", encoding="utf-8") as f:
+                f.write('{"regions": [{"top": 1}]}')
+            with self.assertRaises(ValueError):
+                load_layout(path)
+            with self.assertRaises(OSError):
+                load_layout(os.path.join(tmp, "missing.json"))
+
+    def test_regions_are_ocred_concurrently_and_translated_in_one_request(self):
+        ocr = RegionOCRService(delay=0.1)
+        stub = StubTranslatorProvider()
+        boxes = region_boxes(REGIONS)
+        pipeline = StagedPipeline(capture_stages(lambda: ocr, lambda provider: BatchTranslator(stub), boxes),
+                                  provider="stub", font="Sans")
+        pipeline.set_input("capture", Image.new("RGB", (470, 310), "white"))
+
+        start = time.perf_counter()
+        scene = pipeline.get("render")
+        self.assertLess(time.perf_counter() - start, 0.25)  # three 100 ms OCR passes side by side
+        self.assertEqual(ocr.max_active, 3)
+        self.assertEqual(stub.requests, 1)  # every region's lines in one provider request
+
+        texts, metadata = pipeline.get("layout")
+        self.assertEqual(texts, ["w200h40-0", "w200h40-1", "w120h80-0", "w120h80-1", "w120h80-2", "w120h80-3", "w60h30-0"])
+        self.assertEqual([line['region'] for line in metadata], [0, 0, 1, 1, 1, 1, 2])
+        for line, translated in zip(metadata, scene.translated_texts):
+            x0, y0, x1, y1 = boxes[line['region']]
+            self.assertTrue(x0 <= line['box'][0] and y0 <= line['box'][1] and line['box'][2] <= x1 and line['box'][3] <= y1)
+            self.assertEqual(translated, line['original'].upper())
+
+    def test_history_keeps_the_region_mapping(self):
+        boxes = region_boxes(REGIONS)
+        lines = [{'original': "a", 'box': (2, 82, 196, 96), 'region': 0}, {'original': "b", 'box': (352, 2, 466, 16), 'region': 1}]
+        from services.drawing_service import OverlayScene
+        entry = HistoryEntry(OverlayScene(Image.new("RGB", (470, 310)), lines, ["A", "B"], "Sans"), ["a", "b"], regions=boxes)
+        with tempfile.TemporaryDirectory() as tmp:
+            store = DiskStore(os.path.join(tmp, "history"))
+            store.write(0, entry)
+            restored = store.read(0)
+            store.close()
+        self.assertEqual(restored.regions, boxes)
+        self.assertEqual([line['region'] for line in restored.scene.lines_metadata], [0, 1])
+
+if __name__ == '__main__':
+    unittest.main()
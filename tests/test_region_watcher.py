@@ -0,0 +1,92 @@
+import time
+import unittest
+from types import SimpleNamespace
+from services.capture_service import CaptureService
+from services.ocr_result import OcrResult
+from PIL import Image, ImageDraw
+from core.region_watcher import RegionWatcher
+
+class FakeOCR:
+    def __init__(self):
+        self.crops = []
+        self.perceptual = []
+
+    def perform_ocr(self, image, perceptual=True):
+        self.crops.append(image.size)
+        self.perceptual.append(perceptual)
+        return OcrResult.from_columns({
+            'text': ['Hello'], 'block_num': [1], 'line_num': [1],
+            'left': [2], 'top': [2], 'width': [20], 'height': [10], 'conf': [90]
+        })
+
+class FakeTranslator:
+    def __init__(self):
+        self.requests = []
+
+    def translate_lines(self, lines):
+        self.requests.append(list(lines))
+        return [f"T({line})" for line in lines]
+
+class TestRegionWatcher(unittest.TestCase):
+    def setUp(self):
+        self.ocr = FakeOCR()
+        self.translator = FakeTranslator()
+        self.updates = []
+        self.watcher = RegionWatcher(
+            {}, self.ocr, lambda: self.translator,
+            on_update=lambda *args: self.updates.append(args)
+        )
+        self.frame = Image.new('RGB', (128, 256), 'white')
+
+    def test_unchanged_frames_are_skipped(self):
+        self.assertTrue(self.watcher.process_frame(self.frame))
+        self.assertFalse(self.watcher.process_frame(self.frame.copy()))
+        self.assertEqual(self.watcher.stats, {"frames_processed": 1, "frames_skipped": 1})
+        self.assertEqual(len(self.ocr.crops), 1)
+        self.assertEqual(self.ocr.perceptual, [False])
+        self.assertEqual(len(self.updates), 1)
+
+    def test_only_changed_band_is_reocred(self):
+        self.watcher.process_frame(self.frame)
+        changed = self.frame.copy()
+        ImageDraw.Draw(changed).rectangle([10, 200, 60, 210], fill='black')
+        self.watcher.process_frame(changed)
+
+        # Second pass OCRs a single full-width tile row, not the whole frame
+        self.assertEqual(self.ocr.crops[-1], (128, 32))
+        self.assertEqual(len(self.watcher.lines), 2)
+        # The unchanged line keeps its translation; only the new line is sent upstream
+        self.assertEqual(self.translator.requests, [["Hello"], ["Hello"]])
+        self.assertEqual(self.watcher.lines[1]['box'][1], 194)
+
+    def test_band_grows_over_every_overlapping_line(self):
+        # Sorted top to bottom; each line's descenders overlap the next line's ascenders
+        self.watcher.lines = [{'original': text, 'box': (0, top, 50, top + 20), 'translated': text}
+                              for text, top in (("a", 10), ("b", 25), ("c", 40))]
+        self.watcher._reocr_band(self.frame, 50, 70)
+        # Growing over "c" reaches "b", which reaches "a": all three are re-read whole
+        self.assertEqual(self.ocr.crops[-1], (128, 60))
+        self.assertEqual([line['original'] for line in self.watcher.lines], ["Hello"])
+
+    def test_skipped_frames_return_to_the_pool_and_shown_frames_are_kept(self):
+        grabber = SimpleNamespace(grab=lambda monitor: SimpleNamespace(
+            raw=bytearray(b"\xff" * 4 * 32 * 16), width=32, height=16))
+        capture = CaptureService(grabber)
+        watcher = RegionWatcher({"top": 0, "left": 0, "width": 32, "height": 16}, self.ocr, lambda: self.translator,
+                                on_update=lambda *args: self.updates.append(args), fps=100, capture=capture)
+        watcher.start()
+        deadline = time.time() + 2
+        while watcher.stats["frames_skipped"] < 3 and time.time() < deadline:
+            time.sleep(0.01)
+        watcher.stop()
+        watcher._thread.join()
+
+        self.assertEqual(watcher.stats["frames_processed"], 1)
+        self.assertGreaterEqual(capture.pool.stats["reused"], 2)
+        # The frame shown in the overlay was detached, so the pool only ever owned one more
+        self.assertEqual(capture.pool.stats["allocated"], 2)
+        shown = self.updates[0][2].image
+        self.assertFalse(any(frame is shown for frame in capture.pool._free))
+
+if __name__ == '__main__':
+    unittest.main()
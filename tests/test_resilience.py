@@ -0,0 +1,202 @@
+import asyncio
+import json
+import threading
+import time
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from services.base_translator import TranslationError, RateLimitedError, ProviderUnavailableError, CircuitOpenError
+from services.resilience import CircuitBreaker, ProviderGuard, ResilientTranslator, TokenBucket, parse_retry_after
+from services.stub_translator import StubTranslatorProvider
+from services.translator_service import GoogleTranslatorProvider, OpenAITranslatorProvider
+from utils.async_runtime import runtime
+
+class FaultHandler(BaseHTTPRequestHandler):
+    """
+    Local stand-in for the Google and OpenAI endpoints. Each request pops the next (status, headers)
+    from server.script; an empty script means 200. server.delay adds latency to every response.
+    """
+    protocol_version = "HTTP/1.1"
+
+    def _respond(self, body, content_type):
+        self.server.requests += 1
+        time.sleep(self.server.delay)
+        status, headers = self.server.script.pop(0) if self.server.script else (200, {})
+        data = (body if status == 200 else json.dumps({"error": {"message": "injected", "type": "injected"}})).encode("utf-8")
+        self.send_response(status)
+        for key, value in headers.items():
+            self.send_header(key, value)
+        self.send_header("Content-Type", content_type if status == 200 else "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def do_GET(self):
+        self._respond('<html><body><div class="result-container">translated</div></body></html>', "text/html")
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        self._respond(json.dumps({
+            "id": "stub", "object": "chat.completion", "created": 0, "model": "stub",
+            "choices": [{"index": 0, "finish_reason": "stop", "message": {"role": "assistant", "content": "translated"}}],
+        }), "application/json")
+
+    def log_message(self, *args):
+        pass
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+        self.sleeps = []
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+class TestResilience(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.server = ThreadingHTTPServer(("127.0.0.1", 0), FaultHandler)
+        threading.Thread(target=cls.server.serve_forever, daemon=True).start()
+        cls.base = f"http://127.0.0.1:{cls.server.server_address[1]}"
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+
+    def setUp(self):
+        self.server.script = []
+        self.server.delay = 0.0
+        self.server.requests = 0
+        self.clock = FakeClock()
+        self.google = GoogleTranslatorProvider(base_url=self.base + "/m")
+
+    def tearDown(self):
+        self.google.close()
+
+    def resilient(self, translator, fallback=None, **guard):
+        guard.setdefault("clock", self.clock)
+        return ResilientTranslator(translator, ProviderGuard(**guard), fallback,
+                                   ProviderGuard(clock=self.clock) if fallback else None,
+                                   max_retries=2, sleep=self.clock.sleep)
+
+    def test_errors_are_structured(self):
+        self.server.script = [(429, {"Retry-After": "7"}), (503, {}), (404, {})]
+        with self.assertRaises(RateLimitedError) as raised:
+            self.google.translate("Hello")
+        self.assertEqual((raised.exception.provider, raised.exception.status, raised.exception.retry_after), ("google", 429, 7.0))
+        with self.assertRaises(ProviderUnavailableError):
+            self.google.translate("Hello")
+        with self.assertRaises(TranslationError) as raised:
+            self.google.translate("Hello")
+        self.assertFalse(raised.exception.retryable)
+
+    def test_retry_honours_retry_after(self):
+        self.server.script = [(429, {"Retry-After": "3"}), (500, {})]
+        self.server.delay = 0.02
+        translator = self.resilient(self.google)
+        self.assertEqual(translator.translate("Hello"), "translated")
+        self.assertEqual(self.server.requests, 3)
+        self.assertGreaterEqual(self.clock.sleeps[0], 3.0)
+        self.assertEqual(translator.guard.stats["rate_limited"], 1)
+
+    def test_client_errors_are_not_retried(self):
+        self.server.script = [(400, {})]
+        with self.assertRaises(TranslationError):
+            self.resilient(self.google).translate("Hello")
+        self.assertEqual(self.server.requests, 1)
+
+    def test_open_circuit_fails_over_and_recovers(self):
+        stub = StubTranslatorProvider()
+        translator = self.resilient(self.google, fallback=stub, failure_threshold=2, reset_timeout=30)
+        self.server.script = [(500, {})] * 6
+
+        self.assertEqual(translator.translate("one"), "ONE")
+        self.assertEqual(translator.translate("two"), "TWO")
+        self.assertEqual(translator.guard.breaker.state, "open")
+        requests = self.server.requests
+        self.assertEqual(translator.translate("three"), "THREE")
+        self.assertEqual(self.server.requests, requests)  # open circuit: primary not called
+        self.assertEqual(translator.stats["failovers"], 3)
+
+        self.server.script = []
+        self.clock.now += 31
+        self.assertEqual(translator.translate("four"), "translated")  # half-open trial succeeds
+        self.assertEqual(translator.guard.breaker.state, "closed")
+
+    def test_open_circuit_without_fallback_raises(self):
+        breaker = CircuitBreaker(failure_threshold=1, reset_timeout=10, clock=self.clock)
+        breaker.record_failure()
+        self.assertFalse(breaker.allow())
+        self.clock.now += 10
+        self.assertTrue(breaker.allow())
+        self.assertFalse(breaker.allow())  # a single trial request while half-open
+
+        self.server.script = [(503, {})] * 3
+        translator = self.resilient(self.google, failure_threshold=1)
+        with self.assertRaises(ProviderUnavailableError):
+            translator.translate("Hello")
+        with self.assertRaises(CircuitOpenError):
+            translator.translate("Hello")
+
+    def test_cancelled_half_open_trial_does_not_block_the_provider(self):
+        class HangingTranslator(StubTranslatorProvider):
+            async def translate_async(self, text):
+                await asyncio.sleep(10)
+
+        guard = ProviderGuard(failure_threshold=1, reset_timeout=1, clock=self.clock)
+        translator = ResilientTranslator(HangingTranslator(), guard, max_retries=0)
+        guard.breaker.record_failure()
+        self.clock.now += 5
+        trial = runtime.submit(translator.translate_async("Hello"))
+        time.sleep(0.05)
+        runtime.cancel([trial])
+        time.sleep(0.05)
+        self.assertTrue(trial.cancelled())
+        self.assertTrue(guard.breaker.allow())  # the next capture gets the trial
+
+    def test_token_bucket_paces_and_adapts(self):
+        bucket = TokenBucket(rate=2, capacity=2, clock=self.clock, sleep=self.clock.sleep)
+        self.assertEqual([bucket.reserve() for _ in range(3)], [0.0, 0.0, 0.5])
+        self.clock.now += 10
+        bucket.penalize(retry_after=4)
+        self.assertEqual(bucket.rate, 1.0)
+        self.assertAlmostEqual(bucket.acquire(), 5.0)
+        for _ in range(20):
+            bucket.reward()
+        self.assertEqual(bucket.rate, 2.0)
+
+    def test_openai_rate_limit_is_not_retried_by_the_sdk(self):
+        self.server.script = [(429, {"retry-after": "2"})]
+        provider = OpenAITranslatorProvider("stub-key", base_url=self.base + "/v1")
+        try:
+            with self.assertRaises(RateLimitedError) as raised:
+                provider.translate("Hello")
+        finally:
+            provider.close()
+        self.assertEqual((raised.exception.provider, raised.exception.retry_after), ("openai", 2.0))
+        self.assertEqual(self.server.requests, 1)
+
+    def test_async_providers_share_the_runtime_client(self):
+        self.server.script = [(503, {})]
+        translator = ResilientTranslator(self.google, ProviderGuard(), max_retries=2, base_delay=0.01)
+        self.assertEqual(runtime.run(translator.translate_async("Hello")), "translated")
+        self.assertEqual(translator.guard.stats["retries"], 1)
+
+        provider = OpenAITranslatorProvider("stub-key", base_url=self.base + "/v1")
+        try:
+            self.assertEqual(runtime.run(provider.translate_async("Hello")), "translated")
+            self.assertIs(provider._async()._client, runtime.http_client())
+        finally:
+            provider.close()
+
+    def test_retry_after_formats(self):
+        self.assertEqual(parse_retry_after("12"), 12.0)
+        self.assertIsNone(parse_retry_after("soon"))
+        self.assertEqual(parse_retry_after("Wed, 21 Oct 2015 07:28:00 GMT"), 0.0)
+
+if __name__ == '__main__':
+    unittest.main()
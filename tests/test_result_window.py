@@ -0,0 +1,41 @@
+import os
+import unittest
+from PIL import Image
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+from PyQt6.QtWidgets import QApplication
+from PyQt6.QtCore import QRect, QSize
+from ui.result_window import ResultWindow, position_clear_of
+
+SCREEN = QRect(0, 0, 1920, 1080)
+
+class TestResultWindow(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.app = QApplication.instance() or QApplication([])
+
+    def test_window_goes_beside_the_watched_region(self):
+        size = QSize(600, 500)
+        self.assertEqual(position_clear_of(size, QRect(100, 100, 800, 300), SCREEN).x(), 908)
+        # No room on the right: the left side is used
+        left = position_clear_of(size, QRect(1000, 100, 900, 300), SCREEN)
+        self.assertFalse(QRect(left, size).intersects(QRect(1000, 100, 900, 300)))
+        self.assertTrue(SCREEN.contains(QRect(left, size)))
+        # Wide band across the top: below it
+        self.assertEqual(position_clear_of(size, QRect(0, 0, 1920, 300), SCREEN).y(), 308)
+        self.assertIsNone(position_clear_of(size, QRect(200, 200, 1600, 700), SCREEN))
+
+    def test_watch_updates_do_not_activate_the_window(self):
+        window = ResultWindow()
+        self.addCleanup(window.deleteLater)
+        activations = []
+        window.activateWindow = lambda: activations.append(True)
+        window.show_watch_update("a", "b", Image.new("RGB", (20, 10)))
+        self.assertTrue(window.isVisible())
+        self.assertEqual(activations, [])
+        window.update_display("a", "b", None)
+        self.assertEqual(activations, [True])
+        window.hide()
+
+if __name__ == '__main__':
+    unittest.main()
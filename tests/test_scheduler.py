@@ -0,0 +1,75 @@
+import threading
+import time
+import unittest
+from core.scheduler import PipelineScheduler
+
+class TestPipelineScheduler(unittest.TestCase):
+    def setUp(self):
+        self.scheduler = PipelineScheduler(max_workers=2)
+        self.addCleanup(self.scheduler.shutdown)
+        self.lock = threading.Lock()
+        self.active = 0
+        self.peak = 0
+        self.delivered = []  # what the "UI" displayed
+
+    def make_job(self, value, stages=5, stage_time=0.01):
+        def job(token):
+            with self.lock:
+                self.active += 1
+                self.peak = max(self.peak, self.active)
+            try:
+                for _ in range(stages):
+                    time.sleep(stage_time)
+                    token.raise_if_cancelled()
+                # Mirrors AppController: emit only if still current
+                if self.scheduler.is_current(token.generation):
+                    self.delivered.append(value)
+            finally:
+                with self.lock:
+                    self.active -= 1
+        return job
+
+    def test_burst_is_coalesced_with_bounded_concurrency(self):
+        for i in range(100):
+            self.scheduler.submit(self.make_job(i))
+        self.assertTrue(self.scheduler.wait_idle(timeout=5))
+
+        self.assertLessEqual(self.peak, 2)
+        self.assertLessEqual(self.scheduler.stats["started"], 3)
+        self.assertGreaterEqual(self.scheduler.stats["coalesced"], 97)
+        self.assertEqual(self.delivered, [99])
+
+    def test_no_stale_results_under_repeated_bursts(self):
+        for burst in range(10):
+            for i in range(5):
+                self.scheduler.submit(self.make_job((burst, i), stage_time=0.005))
+            time.sleep(0.012)
+        self.assertTrue(self.scheduler.wait_idle(timeout=5))
+
+        self.assertLessEqual(self.scheduler.stats["max_concurrency"], 2)
+        self.assertEqual(self.delivered[-1], (9, 4))
+        # Anything delivered was the newest request at delivery time, so values only move forward
+        self.assertEqual(self.delivered, sorted(self.delivered))
+
+    def test_running_job_is_cancelled_by_newer_submit(self):
+        started = threading.Event()
+        outcome = []
+
+        def slow(token):
+            started.set()
+            for _ in range(100):
+                time.sleep(0.01)
+                if token.cancelled:
+                    outcome.append("cancelled")
+                    token.raise_if_cancelled()
+            outcome.append("finished")
+
+        self.scheduler.submit(slow)
+        started.wait(1)
+        self.scheduler.submit(self.make_job("latest", stages=1))
+        self.assertTrue(self.scheduler.wait_idle(timeout=5))
+        self.assertEqual(outcome, ["cancelled"])
+        self.assertEqual(self.delivered, ["latest"])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,145 @@
+import threading
+import time
+import unittest
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+from PIL import Image
+from services.batch_translator import BatchTranslator
+from services.ocr_service import OCRService
+from services.script_detection import ScriptDetector, detect_text_language, detect_text_script
+from services.stub_translator import StubTranslatorProvider
+from services.tiled_ocr import TiledOCR
+from services.translation_memory import TranslationMemory, CachedTranslator
+from services.translator_service import GoogleTranslatorProvider, OpenAITranslatorProvider
+
+INSTALLED = {"eng", "osd", "jpn", "kor", "rus"}
+
+class TestTextScript(unittest.TestCase):
+    def test_scripts_of_recognized_text(self):
+        self.assertEqual(detect_text_script(["クエストを開始", "Start"]), "Japanese")
+        self.assertEqual(detect_text_script(["任务日志", "HP 100"]), "Han")
+        self.assertEqual(detect_text_script(["퀘스트 로그"]), "Hangul")
+        self.assertEqual(detect_text_script(["Журнал заданий"]), "Cyrillic")
+        self.assertEqual(detect_text_script(["Café crème"]), "Latin")
+        self.assertIsNone(detect_text_script(["123 %", ""]))
+
+    def test_a_few_stray_characters_do_not_switch_script(self):
+        self.assertEqual(detect_text_script(["Press the 決 button to continue the quest in the temple"]), "Latin")
+
+    def test_source_language_for_translators(self):
+        self.assertEqual(detect_text_language(["ログ"]), "ja")
+        self.assertEqual(detect_text_language(["로그"]), "ko")
+        self.assertIsNone(detect_text_language(["Quest Log"]))
+
+class TestScriptDetector(unittest.TestCase):
+    def detector(self, script, confidence=10.0, installed=INSTALLED):
+        return ScriptDetector(osd=lambda image: (script, confidence), installed=installed)
+
+    def test_only_the_detected_language_set_is_loaded(self):
+        image = Image.new("L", (10, 10))
+        self.assertEqual(self.detector("Japanese").detect(image), "jpn+eng")
+        self.assertEqual(self.detector("Hangul").detect(image), "kor+eng")
+        self.assertEqual(self.detector("Latin").detect(image), "eng")
+
+    def test_unsure_or_missing_packs_fall_back_to_english(self):
+        image = Image.new("L", (10, 10))
+        self.assertEqual(self.detector("Japanese", confidence=0.5).detect(image), "eng")
+        self.assertEqual(self.detector("Arabic").detect(image), "eng")  # 'ara' not installed
+
+        def failing(image):
+            raise RuntimeError("Too few characters")
+        self.assertEqual(ScriptDetector(osd=failing, installed=INSTALLED).detect(image), "eng")
+
+    def test_pre_pass_is_skipped_without_other_packs(self):
+        osd = MagicMock()
+        detector = ScriptDetector(installed={"eng", "osd"})
+        detector._detect_osd = osd
+        self.assertEqual(detector.detect(Image.new("L", (10, 10))), "eng")
+        osd.assert_not_called()
+
+class TestOCRServiceLanguages(unittest.TestCase):
+    def service(self, detector=None, languages='auto'):
+        return OCRService(strategy='tesseract', tiled_ocr=TiledOCR(workers=1), languages=languages, detector=detector)
+
+    def test_recognition_uses_the_detected_set(self):
+        detector = ScriptDetector(osd=lambda image: ("Japanese", 12.0), installed=INSTALLED)
+        with patch("services.ocr_service.pytesseract.image_to_data", return_value={
+            'text': ["ログ"], 'left': [0], 'top': [0], 'width': [20], 'height': [10], 'conf': [90], 'block_num': [1], 'line_num': [1]
+        }) as image_to_data:
+            self.service(detector).perform_ocr(Image.new("RGB", (200, 40), "white"))
+        self.assertEqual(image_to_data.call_args.kwargs["lang"], "jpn+eng")
+
+    def test_fixed_languages_skip_detection(self):
+        service = self.service(languages="eng+rus")
+        self.assertIsNone(service.detector)
+        self.assertEqual(service.languages_for(Image.new("L", (10, 10))), "eng+rus")
+
+    def test_resident_engines_are_cached_per_language_set(self):
+        service = self.service(languages="eng")
+        created = []
+
+        def factory(languages):
+            engine = SimpleNamespace(languages=languages, close=MagicMock())
+            created.append(engine)
+            return lambda: engine
+
+        first = service._engine("tesserocr", "jpn+eng", factory("jpn+eng"))
+        self.assertIs(service._engine("tesserocr", "jpn+eng", factory("unused")), first)
+        for languages in ("kor+eng", "rus+eng", "ell+eng"):
+            service._engine("tesserocr", languages, factory(languages))
+        # The least recently used engine leaves the cache but is not closed under a thread still using it
+        self.assertIsNot(service._engine("tesserocr", "jpn+eng", factory("jpn+eng")), first)
+        first.close.assert_not_called()
+
+    def test_concurrent_misses_build_one_engine(self):
+        service = self.service(languages="eng")
+        builds = []
+
+        def factory():
+            builds.append(threading.current_thread().name)
+            time.sleep(0.05)
+            return SimpleNamespace()
+
+        engines = []
+        threads = [threading.Thread(target=lambda: engines.append(service._engine("tesserocr", "jpn+eng", factory)))
+                   for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(len(builds), 1)
+        self.assertTrue(all(engine is engines[0] for engine in engines))
+
+class TestSourceLanguage(unittest.TestCase):
+    def test_wrapped_translator_carries_the_source_language(self):
+        memory = TranslationMemory(None)
+        stub = StubTranslatorProvider()
+        translator = CachedTranslator(BatchTranslator(stub), memory)
+        japanese = translator.with_source("ja")
+        self.assertIs(translator.with_source(None), translator)
+        self.assertEqual((japanese.source_lang, japanese.translator.source_lang, japanese.translator.translator.source_lang), ("ja", "ja", "ja"))
+        self.assertEqual(stub.source_lang, "auto")
+        self.assertEqual(japanese._key("ログ")[1], "ja")
+
+    def test_google_request_names_the_source(self):
+        provider = GoogleTranslatorProvider()
+        provider.session = MagicMock()
+        provider.translator.session = provider.session
+        provider.session.get.return_value = SimpleNamespace(
+            status_code=200, headers={}, text='<div class="result-container">log</div>')
+        japanese = provider.with_source("ja")
+        self.assertEqual(japanese.translate("ログ"), "log")
+        self.assertEqual(provider.session.get.call_args.kwargs["params"]["sl"], "ja")
+        self.assertEqual(provider.translator._source, "auto")
+
+    def test_openai_prompt_names_the_source(self):
+        provider = OpenAITranslatorProvider.__new__(OpenAITranslatorProvider)
+        provider.client = MagicMock()
+        provider.client.chat.completions.create.return_value = SimpleNamespace(
+            choices=[SimpleNamespace(message=SimpleNamespace(content="日志"))])
+        provider.with_source("ko").translate("로그")
+        prompt = provider.client.chat.completions.create.call_args.kwargs["messages"][0]["content"]
+        self.assertIn("Translate Korean text to Chinese (Simplified).", prompt)
+
+if __name__ == '__main__':
+    unittest.main()
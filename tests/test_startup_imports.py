@@ -0,0 +1,21 @@
+import os
+import subprocess
+import sys
+import unittest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Must stay out of the import path that runs before the capture overlay is shown
+HEAVY_MODULES = ['pandas', 'numpy', 'openai', 'pytesseract', 'deep_translator', 'services.ocr_service']
+
+class TestStartupImports(unittest.TestCase):
+    def test_controller_import_is_lazy(self):
+        code = (
+            "import sys, core.app_controller; "
+            f"print(','.join(m for m in {HEAVY_MODULES!r} if m in sys.modules))"
+        )
+        result = subprocess.run([sys.executable, "-c", code], cwd=ROOT, capture_output=True, text=True, check=True)
+        self.assertEqual(result.stdout.strip(), "", f"Heavy modules imported eagerly: {result.stdout.strip()}")
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,52 @@
+import unittest
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+from services.base_translator import BaseTranslator
+from services.translation_memory import TranslationMemory, CachedTranslator
+from services.translator_service import OpenAITranslatorProvider
+
+class ChunkRecordingTranslator(BaseTranslator):
+    name = "fake"
+    stream_chunk_lines = 2
+
+    def __init__(self):
+        self.requests = []
+
+    def translate(self, text):
+        self.requests.append(text.split("\n"))
+        return "\n".join(f"T({line})" for line in text.split("\n"))
+
+def token_chunks(*pieces):
+    return [SimpleNamespace(choices=[SimpleNamespace(delta=SimpleNamespace(content=piece))]) for piece in pieces]
+
+class TestStreamingTranslation(unittest.TestCase):
+    def test_default_stream_completes_per_chunk(self):
+        translator = ChunkRecordingTranslator()
+        stream = translator.translate_stream(["a", "b", "c"])
+        self.assertEqual(next(stream), (0, "T(a)"))
+        self.assertEqual(translator.requests, [["a", "b"]])
+        self.assertEqual(list(stream), [(1, "T(b)"), (2, "T(c)")])
+        self.assertEqual(translator.requests, [["a", "b"], ["c"]])
+
+    def test_openai_yields_lines_as_tokens_arrive(self):
+        provider = OpenAITranslatorProvider.__new__(OpenAITranslatorProvider)
+        provider.client = MagicMock()
+        provider.client.chat.completions.create.return_value = iter(token_chunks("你", "好\n世", "界\n", "任务"))
+
+        result = list(provider.translate_stream(["Hello", "World", "Quest", "Log"]))
+        self.assertEqual(result, [(0, "你好"), (1, "世界"), (2, "任务"), (3, "")])
+        self.assertTrue(provider.client.chat.completions.create.call_args.kwargs["stream"])
+
+    def test_cached_lines_are_yielded_before_provider_lines(self):
+        memory = TranslationMemory(None)
+        CachedTranslator(ChunkRecordingTranslator(), memory).translate_lines(["Save"])
+
+        inner = ChunkRecordingTranslator()
+        stream = CachedTranslator(inner, memory).translate_stream(["Load", "Save", "Load"])
+        self.assertEqual(next(stream), (1, "T(Save)"))
+        self.assertEqual(inner.requests, [])
+        self.assertEqual(sorted(stream), [(0, "T(Load)"), (2, "T(Load)")])
+        self.assertEqual(inner.requests, [["Load"]])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,43 @@
+import os
+import time
+import unittest
+from unittest.mock import patch
+from services.batch_translator import BatchTranslator
+from services.stub_translator import StubTranslatorProvider
+from services.translator_service import ProviderRegistry
+
+class TestStubTranslator(unittest.TestCase):
+    def test_latency_is_paid_per_request(self):
+        stub = StubTranslatorProvider(latency=0.02)
+        start = time.perf_counter()
+        self.assertEqual(stub.translate("quest log\nsave"), "QUEST LOG\nSAVE")
+        self.assertGreaterEqual(time.perf_counter() - start, 0.02)
+        self.assertEqual(stub.requests, 1)
+
+    def test_markers_survive_batching(self):
+        stub = StubTranslatorProvider()
+        lines = [f"line {i}" for i in range(30)]
+        self.assertEqual(BatchTranslator(stub, max_lines=8).translate_lines(lines), [line.upper() for line in lines])
+        self.assertEqual(stub.requests, 4)
+
+    def test_registry_builds_stub_with_configured_latency(self):
+        registry = ProviderRegistry()
+        with patch.dict(os.environ, {"SCREEN_TRANSLATOR_STUB_LATENCY_MS": "25"}):
+            provider = registry.get("stub")
+        self.assertIsInstance(provider, StubTranslatorProvider)
+        self.assertAlmostEqual(provider.latency, 0.025)
+        registry.invalidate()
+
+    def test_replaced_provider_is_not_closed_under_its_users(self):
+        registry = ProviderRegistry()
+        with patch.dict(os.environ, {"SCREEN_TRANSLATOR_STUB_LATENCY_MS": "0"}):
+            in_use = registry.get("stub")
+        with patch.object(StubTranslatorProvider, "close", side_effect=AssertionError("closed while in use")):
+            with patch.dict(os.environ, {"SCREEN_TRANSLATOR_STUB_LATENCY_MS": "5"}):
+                replacement = registry.get("stub")
+            registry.invalidate()
+        self.assertIsNot(replacement, in_use)
+        self.assertEqual(in_use.translate("still works"), "STILL WORKS")
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,67 @@
+import importlib
+import sys
+import types
+import unittest
+from unittest.mock import MagicMock, patch
+from PIL import Image
+
+TSV = "\n".join([
+    "1\t1\t0\t0\t0\t0\t0\t0\t200\t60\t-1\t",
+    "2\t1\t1\t0\t0\t0\t5\t5\t150\t40\t-1\t",
+    "5\t1\t1\t1\t1\t1\t5\t5\t40\t12\t96.5\tQuest",
+    "5\t1\t1\t1\t1\t2\t50\t6\t30\t11\t91.0\tLog",
+    "5\t1\t1\t1\t2\t1\t5\t30\t60\t12\t88.0\tInventory",
+])
+
+def fake_tesserocr():
+    module = types.ModuleType('tesserocr')
+    module.PSM = types.SimpleNamespace(AUTO=3)
+    api = MagicMock()
+    api.GetTSVText.return_value = TSV
+    module.PyTessBaseAPI = MagicMock(return_value=api)
+    return module
+
+class TestTesserocrOCR(unittest.TestCase):
+    def setUp(self):
+        self.module = fake_tesserocr()
+        patcher = patch.dict(sys.modules, {'tesserocr': self.module})
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        sys.modules.pop('services.tesserocr_ocr', None)
+        self.addCleanup(sys.modules.pop, 'services.tesserocr_ocr', None)
+        self.tesserocr_ocr = importlib.import_module('services.tesserocr_ocr')
+
+    def test_engine_stays_resident(self):
+        engine = self.tesserocr_ocr.TesserocrOCR()
+        image = Image.new('RGB', (200, 60), 'white')
+        engine.perform_ocr(image)
+        result = engine.perform_ocr(image)
+
+        self.assertEqual(self.module.PyTessBaseAPI.call_count, 1)
+        self.assertEqual(result.lines()[0], ['Quest Log', 'Inventory'])
+
+    def test_regions_use_their_own_page_mode(self):
+        engine = self.tesserocr_ocr.TesserocrOCR()
+        image = Image.new('RGB', (800, 600), 'white')
+        result = engine.perform_ocr_regions(image, [((100, 200, 400, 260), 7), ((0, 0, 300, 120), 6)])
+
+        api = engine.api
+        modes = [call.args[0] for call in api.SetPageSegMode.call_args_list]
+        self.assertEqual(modes, [7, 6, 3])  # restored to the engine's mode afterwards
+        self.assertEqual([call.args[0].size for call in api.SetImage.call_args_list], [(300, 60), (300, 120)])
+        self.assertEqual(result.left.tolist()[:3], [105, 150, 105])
+        self.assertEqual(sorted(set(result.block_num.tolist())), [1, 2])
+
+    def test_selected_as_ocr_strategy(self):
+        import services.ocr_service as ocr_service
+        with patch.object(ocr_service, 'HAS_TESSEROCR', True), \
+             patch.object(ocr_service, 'TesserocrOCR', self.tesserocr_ocr.TesserocrOCR, create=True), \
+             patch('services.ocr_service.pytesseract.image_to_data') as mock_image_to_data:
+            service = ocr_service.OCRService(strategy='tesserocr')
+            data = service.perform_ocr(Image.new('RGB', (200, 60), 'white'))
+
+        mock_image_to_data.assert_not_called()
+        self.assertEqual(data.text.tolist(), ['Quest', 'Log', 'Inventory'])
+
+if __name__ == '__main__':
+    unittest.main()
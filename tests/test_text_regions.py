@@ -0,0 +1,97 @@
+import unittest
+from unittest.mock import patch
+import numpy as np
+from PIL import Image, ImageDraw, ImageFont
+from services.ocr_service import OCRService
+from services.preprocess import Preprocessor
+from services.text_regions import PSM_SINGLE_BLOCK, PSM_SINGLE_LINE, TextRegionDetector, merge_regions, xy_cut
+from services.tiled_ocr import TiledOCR
+from services.ocr_result import OcrResult
+
+def scene(lines=("Quest log", "Continue the journey", "Save settings and exit"), title="Inventory"):
+    """Dark shapes over a light scene, a dialogue box with a few lines and a one-line label."""
+    image = Image.new("L", (1000, 600), 235)
+    draw = ImageDraw.Draw(image)
+    font = ImageFont.load_default(size=24)
+    draw.ellipse([40, 40, 360, 360], fill=30)
+    draw.rectangle([600, 60, 960, 220], fill=60)
+    boxes = []
+    for i, line in enumerate(lines):
+        boxes.append(draw.textbbox((120, 430 + i * 40), line, font=font))
+        draw.text((120, 430 + i * 40), line, fill=0, font=font)
+    boxes.append(draw.textbbox((620, 280), title, font=font))
+    draw.text((620, 280), title, fill=0, font=font)
+    return image, boxes
+
+def contains(outer, inner):
+    return outer[0] <= inner[0] and outer[1] <= inner[1] and outer[2] >= inner[2] and outer[3] >= inner[3]
+
+class TestTextRegionDetector(unittest.TestCase):
+    def test_text_is_boxed_and_shapes_are_skipped(self):
+        image, truth = scene()
+        regions = TextRegionDetector().detect(image)
+        self.assertEqual(len(regions), 2)
+        for box in truth:
+            self.assertTrue(any(contains(region, box) for region, _ in regions), box)
+        covered = sum((x1 - x0) * (y1 - y0) for (x0, y0, x1, y1), _ in regions)
+        self.assertLess(covered, 0.15 * 1000 * 600)
+
+    def test_page_mode_per_box(self):
+        image, _ = scene()
+        modes = sorted(psm for _, psm in TextRegionDetector().detect(image))
+        self.assertEqual(modes, [PSM_SINGLE_BLOCK, PSM_SINGLE_LINE])
+
+    def test_blank_capture_has_no_regions(self):
+        self.assertEqual(TextRegionDetector().detect(Image.new("L", (800, 600), 255)), [])
+
+    def test_full_page_and_noise_fall_back_to_one_pass(self):
+        page = Image.new("L", (800, 600), 255)
+        draw = ImageDraw.Draw(page)
+        font = ImageFont.load_default(size=20)
+        for y in range(10, 590, 30):
+            draw.text((10, y), "The ancient temple lies beyond the northern mountains", fill=0, font=font)
+        self.assertIsNone(TextRegionDetector().detect(page))
+
+        noise = np.where(np.random.default_rng(0).random((600, 800)) > 0.5, 255, 0).astype(np.uint8)
+        self.assertIsNone(TextRegionDetector().detect(Image.fromarray(noise, "L")))
+
+    def test_xy_cut_splits_on_empty_rows_then_columns(self):
+        mask = np.zeros((10, 12), dtype=bool)
+        mask[1:3, 1:4] = True
+        mask[1:3, 8:11] = True
+        mask[6:9, 2:10] = True
+        self.assertEqual(xy_cut(mask), [(1, 1, 4, 3), (8, 1, 11, 3), (2, 6, 10, 9)])
+
+    def test_merged_boxes_are_offset_and_renumbered(self):
+        word = OcrResult(text=["Log"], left=[2], top=[3], width=[20], height=[10], conf=[90], block_num=[1], line_num=[1])
+        merged = merge_regions([((100, 50, 200, 80), 7), ((10, 300, 90, 330), 7)], [word, word])
+        self.assertEqual(merged.left.tolist(), [102, 12])
+        self.assertEqual(merged.top.tolist(), [53, 303])
+        self.assertEqual(merged.block_num.tolist(), [1, 2])
+
+class TestOCRServiceRegions(unittest.TestCase):
+    def test_only_the_regions_reach_tesseract(self):
+        image, _ = scene()
+        service = OCRService(strategy='tesseract', tiled_ocr=TiledOCR(workers=1), languages='eng',
+                             preprocessor=Preprocessor(enabled=False))
+        word = {'text': ["Quest"], 'left': [5], 'top': [4], 'width': [40], 'height': [12], 'conf': [90],
+                'block_num': [1], 'line_num': [1]}
+        with patch("pytesseract.image_to_data", return_value=word) as image_to_data:
+            data = service.perform_ocr(image)
+        calls = image_to_data.call_args_list
+        self.assertEqual(len(calls), 2)
+        self.assertEqual(sorted(call.kwargs["config"] for call in calls), ["--psm 6", "--psm 7"])
+        self.assertTrue(all(call.args[0].size[0] * call.args[0].size[1] < 0.1 * 1000 * 600 for call in calls))
+        self.assertEqual(len(data), 2)
+        self.assertTrue(all(left > 5 for left in data.left.tolist()))  # back in capture coordinates
+
+    def test_capture_without_text_skips_ocr(self):
+        service = OCRService(strategy='tesseract', tiled_ocr=TiledOCR(workers=1), languages='eng',
+                             preprocessor=Preprocessor(enabled=False))
+        with patch("pytesseract.image_to_data") as image_to_data:
+            data = service.perform_ocr(Image.new("RGB", (800, 600), "white"))
+        image_to_data.assert_not_called()
+        self.assertTrue(data.empty)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,44 @@
+import unittest
+from services.ocr_result import OcrResult
+from services.tiled_ocr import plan_tiles, merge_tiles
+
+def words(*entries):
+    """entries: (text, left, top, width, height, block_num, line_num) in tile coordinates."""
+    columns = {name: [] for name in ('text', 'left', 'top', 'width', 'height', 'block_num', 'line_num', 'conf')}
+    for text, left, top, width, height, block, line in entries:
+        for name, value in zip(('text', 'left', 'top', 'width', 'height', 'block_num', 'line_num'), (text, left, top, width, height, block, line)):
+            columns[name].append(value)
+        columns['conf'].append(90)
+    return OcrResult.from_columns(columns)
+
+class TestTiledOCR(unittest.TestCase):
+    def test_tiles_cover_image_with_overlap(self):
+        tiles = plan_tiles(1000, 2000, tile_height=768, max_tile_width=2560, overlap=64)
+        self.assertEqual(tiles, [(0, 0, 1000, 768), (0, 704, 1000, 1472), (0, 1408, 1000, 2000)])
+
+        wide = plan_tiles(6000, 500, max_tile_width=2560, overlap=64)
+        self.assertEqual([t[0] for t in wide], [0, 2496, 4992])
+        self.assertEqual(wide[-1][2], 6000)
+
+    def test_overlap_words_deduplicated_and_blocks_renumbered(self):
+        tiles = [(0, 0, 400, 200), (0, 136, 400, 400)]
+        first = words(
+            ('Top', 10, 20, 40, 12, 1, 1),
+            ('Shared', 10, 150, 60, 14, 2, 1),   # centre y=157 is inside this tile's core (< 168)
+            ('Cut', 10, 190, 40, 14, 2, 2),      # touches the interior edge at y=200
+        )
+        second = words(
+            ('Shared', 10, 14, 60, 14, 1, 1),    # same word; centre is before this tile's core (>= 168)
+            ('Cut', 10, 54, 40, 14, 1, 2),       # whole copy of the cut word
+            ('Bottom', 10, 200, 50, 12, 3, 1),
+        )
+        merged = merge_tiles(tiles, [first, second], (400, 400), overlap=64)
+
+        self.assertEqual(sorted(merged.text.tolist()), ['Bottom', 'Cut', 'Shared', 'Top'])
+        texts, metadata = merged.lines()
+        self.assertEqual(texts, ['Top', 'Shared', 'Cut', 'Bottom'])
+        self.assertEqual(metadata[1]['box'], (10, 150, 70, 164))
+        self.assertEqual(merged.block_num.tolist(), [1, 2, 3, 4])
+
+if __name__ == '__main__':
+    unittest.main()
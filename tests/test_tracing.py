@@ -0,0 +1,64 @@
+import json
+import os
+import tempfile
+import time
+import unittest
+from utils.tracing import Tracer, profile_run
+
+class TestTracing(unittest.TestCase):
+    def test_spans_carry_capture_ids_and_feed_percentiles(self):
+        tracer = Tracer(window=10)
+        capture_id = tracer.new_capture_id()
+        for ms in range(1, 21):
+            tracer.record("ocr", 0, ms * 1_000_000, capture_id)
+        with tracer.span("translate:stub", capture_id, lines=3):
+            pass
+
+        stats = tracer.percentiles()
+        # Rolling window: only the last 10 samples (11..20 ms) count
+        self.assertEqual(stats["ocr"], {"count": 10, "p50_ms": 16.0, "p95_ms": 20.0})
+        self.assertIn("translate:stub  p50", tracer.summary(["translate:stub", "missing"]))
+
+        event = tracer.chrome_trace()["traceEvents"][-1]
+        self.assertEqual((event["name"], event["cat"], event["ph"]), ("translate:stub", "translate", "X"))
+        self.assertEqual(event["args"], {"lines": 3, "capture_id": capture_id})
+
+    def test_export_is_valid_chrome_trace_json(self):
+        tracer = Tracer()
+        with tracer.span("ocr", 1):
+            time.sleep(0.001)
+        with tempfile.TemporaryDirectory() as folder:
+            path = tracer.export_chrome_trace(os.path.join(folder, "traces", "t.json"))
+            with open(path, encoding="utf-8") as f:
+                trace = json.load(f)
+        self.assertEqual(len(trace["traceEvents"]), 1)
+        self.assertGreaterEqual(trace["traceEvents"][0]["dur"], 1000)
+
+    def test_disabled_tracer_records_nothing(self):
+        tracer = Tracer(enabled=False)
+        with tracer.span("ocr"):
+            pass
+        self.assertEqual(tracer.percentiles(), {})
+        self.assertEqual(tracer.chrome_trace()["traceEvents"], [])
+
+    def test_ring_buffer_is_bounded_and_spans_are_cheap(self):
+        tracer = Tracer(capacity=1000)
+        start = time.perf_counter()
+        for _ in range(10000):
+            with tracer.span("draw"):
+                pass
+        elapsed = time.perf_counter() - start
+        self.assertEqual(len(tracer.chrome_trace()["traceEvents"]), 1000)
+        self.assertLess(elapsed / 10000, 50e-6)
+
+    def test_profile_run_writes_cpu_and_memory_reports(self):
+        with tempfile.TemporaryDirectory() as folder:
+            prefix = os.path.join(folder, "run")
+            with profile_run(prefix):
+                sum(i * i for i in range(1000))
+            self.assertTrue(os.path.getsize(prefix + ".prof") > 0)
+            with open(prefix + "-memory.txt", encoding="utf-8") as f:
+                self.assertTrue(f.readline().startswith("current"))
+
+if __name__ == '__main__':
+    unittest.main()
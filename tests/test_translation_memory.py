@@ -0,0 +1,101 @@
+import os
+import tempfile
+import unittest
+from services.base_translator import BaseTranslator, ProviderUnavailableError, TranslationError
+from services.batch_translator import BatchTranslator
+from services.resilience import ResilientTranslator
+from services.stub_translator import StubTranslatorProvider
+from services.translation_memory import TranslationMemory, CachedTranslator
+
+class CountingTranslator(BaseTranslator):
+    name = "fake"
+
+    def __init__(self):
+        self.requests = []
+
+    def translate(self, text: str) -> str:
+        self.requests.append(text)
+        return "\n".join(f"T({line})" for line in text.split("\n"))
+
+class TestTranslationMemory(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.db_path = os.path.join(self.tmp.name, "tm.sqlite3")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_duplicates_collapsed_and_only_misses_sent(self):
+        memory = TranslationMemory(self.db_path)
+        inner = CountingTranslator()
+        translator = CachedTranslator(inner, memory)
+
+        result = translator.translate_lines(["File", "Edit", "File", "  File  "])
+        self.assertEqual(result, ["T(File)", "T(Edit)", "T(File)", "T(File)"])
+        self.assertEqual(inner.requests, ["File\nEdit"])
+
+        result = translator.translate_lines(["Edit", "View"])
+        self.assertEqual(result, ["T(Edit)", "T(View)"])
+        self.assertEqual(inner.requests[-1], "View")
+        self.assertEqual(memory.stats["hits"], 1)
+        self.assertEqual(memory.stats["misses"], 3)
+        memory.close()
+
+    def test_persists_across_instances(self):
+        memory = TranslationMemory(self.db_path)
+        CachedTranslator(CountingTranslator(), memory).translate_lines(["Quest Log"])
+        memory.close()
+
+        reopened = TranslationMemory(self.db_path)
+        inner = CountingTranslator()
+        result = CachedTranslator(inner, reopened).translate_lines(["Quest Log"])
+        self.assertEqual(result, ["T(Quest Log)"])
+        self.assertEqual(inner.requests, [])
+        self.assertEqual(reopened.stats["disk_hits"], 1)
+        reopened.close()
+
+    def test_lru_eviction_counted(self):
+        memory = TranslationMemory(None, capacity=2)
+        translator = CachedTranslator(CountingTranslator(), memory)
+        translator.translate_lines(["a", "b", "c"])
+        self.assertEqual(memory.stats["evictions"], 1)
+
+    def test_errors_not_cached(self):
+        class FailingTranslator(CountingTranslator):
+            def translate(self, text):
+                raise TranslationError("boom", provider=self.name)
+
+        memory = TranslationMemory(None)
+        with self.assertRaises(TranslationError):
+            CachedTranslator(FailingTranslator(), memory).translate_lines(["Start"])
+        inner = CountingTranslator()
+        CachedTranslator(inner, memory).translate_lines(["Start"])
+        self.assertEqual(inner.requests, ["Start"])
+
+    def test_padded_results_are_not_persisted(self):
+        class MergingTranslator(CountingTranslator):
+            def translate(self, text):
+                self.requests.append(text)
+                return text.replace("\n", " ")  # two source lines come back as one
+
+        memory = TranslationMemory(None)
+        result = CachedTranslator(MergingTranslator(), memory).translate_lines(["Open the", "door"])
+        self.assertEqual(result, ["Open the door", ""])
+        inner = CountingTranslator()
+        CachedTranslator(inner, memory).translate_lines(["Open the", "door"])
+        self.assertEqual(inner.requests, ["Open the\ndoor"])
+
+    def test_failed_over_results_are_not_persisted_under_the_primary(self):
+        class DownTranslator(CountingTranslator):
+            def translate(self, text):
+                raise ProviderUnavailableError("server error 503", provider=self.name, status=503)
+
+        memory = TranslationMemory(None)
+        resilient = ResilientTranslator(DownTranslator(), fallback=StubTranslatorProvider(), max_retries=0)
+        translator = CachedTranslator(BatchTranslator(resilient), memory)
+        self.assertEqual(translator.translate_lines(["Start"]), ["START"])
+        self.assertEqual(resilient.stats["failovers"], 1)
+        self.assertEqual(memory.get_many([("fake", "auto", "zh-CN", "Start")]), {})
+
+if __name__ == '__main__':
+    unittest.main()
@@ -4,12 +4,34 @@ from PyQt6.QtGui import QPainter, QColor, QPen, QBrush
 import mss
 from PIL import Image
 
+def grab_region(sct, monitor):
+    """Grabs a screen region ({'top', 'left', 'width', 'height'}) with an open mss handle as an RGB PIL Image."""
+    sct_img = sct.grab(monitor)
+    return Image.frombytes("RGB", sct_img.size, sct_img.bgra, "raw", "BGRX")
+
+# Selections smaller than this (either side, in pixels) are ignored
+MIN_SELECTION = 5
+
+def rect_to_monitor(rect):
+    return {"top": rect.top(), "left": rect.left(), "width": rect.width(), "height": rect.height()}
+
 class CaptureOverlay(QWidget):
+    """
+    Full-screen selection. A plain drag captures one region. With allow_multiple, Shift+drag adds a region
+    and keeps the overlay open; the next plain drag (or Enter) finishes, Backspace removes the last region.
+    Several regions are emitted as regions_selected for the controller to grab in one go.
+    """
     capture_complete = pyqtSignal(object)  # Signal emitting PIL Image
+    region_selected = pyqtSignal(dict)     # Signal emitting the selected monitor region
+    regions_selected = pyqtSignal(list)    # Signal emitting several monitor regions (multi-region capture)
     capture_cancelled = pyqtSignal()       # Signal for cancellation
 
-    def __init__(self):
+    def __init__(self, grab=None, allow_multiple=False):
         super().__init__()
+        # grab(monitor) -> PIL Image; the controller passes its CaptureService.grab
+        self.grab = grab
+        self.allow_multiple = allow_multiple
+        self.regions = []  # finished QRects of a multi-region selection
         self.setWindowFlags(Qt.WindowType.FramelessWindowHint | Qt.WindowType.WindowStaysOnTopHint | Qt.WindowType.Tool)
         self.setAttribute(Qt.WidgetAttribute.WA_TranslucentBackground)
         self.setCursor(Qt.CursorShape.CrossCursor)
@@ -30,19 +52,26 @@ class CaptureOverlay(QWidget):
         painter.setPen(Qt.PenStyle.NoPen)
         painter.drawRect(self.rect())
 
+        selections = list(self.regions)
         if self.start_point and self.end_point:
-            selection_rect = QRect(self.start_point, self.end_point).normalized()
-            
+            selections.append(QRect(self.start_point, self.end_point).normalized())
+
+        for selection_rect in selections:
             painter.setCompositionMode(QPainter.CompositionMode.CompositionMode_Clear)
             painter.setBrush(QBrush(Qt.GlobalColor.transparent))
             painter.drawRect(selection_rect)
-            
+
             painter.setCompositionMode(QPainter.CompositionMode.CompositionMode_SourceOver)
             pen = QPen(self.selection_border_color, 2)
             painter.setPen(pen)
             painter.setBrush(Qt.BrushStyle.NoBrush)
             painter.drawRect(selection_rect)
 
+        if self.allow_multiple:
+            painter.setPen(QPen(QColor(255, 255, 255)))
+            painter.drawText(self.rect().adjusted(0, 12, 0, 0), Qt.AlignmentFlag.AlignHCenter | Qt.AlignmentFlag.AlignTop,
+                             f"Shift+drag: add region ({len(self.regions)}) · Enter: capture · Backspace: undo · Esc: cancel")
+
     def mousePressEvent(self, event):
         if event.button() == Qt.MouseButton.LeftButton:
             self.start_point = event.pos()
@@ -59,6 +88,11 @@ class CaptureOverlay(QWidget):
         if event.button() == Qt.MouseButton.LeftButton and self.is_selecting:
             self.end_point = event.pos()
             self.is_selecting = False
+            if self.allow_multiple and (self.regions or event.modifiers() & Qt.KeyboardModifier.ShiftModifier):
+                self.add_region(QRect(self.start_point, self.end_point).normalized())
+                if not event.modifiers() & Qt.KeyboardModifier.ShiftModifier:
+                    self.finish_regions()
+                return
             self.close() 
             self.capture_screen_area()
 
@@ -66,22 +100,40 @@ class CaptureOverlay(QWidget):
         if event.key() == Qt.Key.Key_Escape:
             self.close()
             self.capture_cancelled.emit()
+        elif event.key() in (Qt.Key.Key_Return, Qt.Key.Key_Enter) and self.regions:
+            self.finish_regions()
+        elif event.key() == Qt.Key.Key_Backspace and self.regions:
+            self.regions.pop()
+            self.update()
+
+    def add_region(self, rect):
+        """Keeps a finished selection and clears the rubber band for the next one."""
+        if rect.width() >= MIN_SELECTION and rect.height() >= MIN_SELECTION:
+            self.regions.append(rect)
+        self.start_point = self.end_point = None
+        self.update()
+
+    def finish_regions(self):
+        self.close()
+        if len(self.regions) == 1:
+            self.start_point, self.end_point = self.regions[0].topLeft(), self.regions[0].bottomRight()
+            self.capture_screen_area()
+        elif self.regions:
+            # The overlay is closed first, so the controller's grab does not see it
+            self.regions_selected.emit([rect_to_monitor(rect) for rect in self.regions])
 
     def capture_screen_area(self):
         if not self.start_point or not self.end_point:
             return
 
         rect = QRect(self.start_point, self.end_point).normalized()
-        if rect.width() < 5 or rect.height() < 5:
+        if rect.width() < MIN_SELECTION or rect.height() < MIN_SELECTION:
             return 
         
+        monitor = rect_to_monitor(rect)
+        self.region_selected.emit(monitor)
+        if self.grab is not None:
+            self.capture_complete.emit(self.grab(monitor))
+            return
         with mss.mss() as sct:
-            monitor = {
-                "top": rect.top(),
-                "left": rect.left(),
-                "width": rect.width(),
-                "height": rect.height(),
-            }
-            sct_img = sct.grab(monitor)
-            img = Image.frombytes("RGB", sct_img.size, sct_img.bgra, "raw", "BGRX")
-            self.capture_complete.emit(img)
+            self.capture_complete.emit(grab_region(sct, monitor))
@@ -0,0 +1,120 @@
+from PyQt6.QtWidgets import QWidget
+from PyQt6.QtGui import QPainter, QPixmap, QImage, QFont, QFontMetricsF, QColor
+from PyQt6.QtCore import Qt, QRect, QPointF
+from services.font_manager import fit_text
+
+def pil_to_pixmap(image):
+    """
+    Converts a PIL image to a QPixmap with a single copy: the QImage only borrows the bytes
+    from tobytes() and QPixmap.fromImage() makes the copy Qt keeps.
+    """
+    if image.mode not in ("RGB", "RGBA"):
+        image = image.convert("RGB")
+    data = image.tobytes("raw", image.mode)
+    fmt = QImage.Format.Format_RGB888 if image.mode == "RGB" else QImage.Format.Format_RGBA8888
+    qimage = QImage(data, image.width, image.height, image.width * len(image.mode), fmt)
+    return QPixmap.fromImage(qimage)
+
+class OverlayView(QWidget):
+    """
+    Shows an OverlayScene: the untouched screenshot as a pixmap (converted once per capture)
+    with the white patches and translated text painted on top as a vector layer.
+    Progressive updates of the same capture only repaint the text.
+    """
+
+    def __init__(self, message="Waiting for capture..."):
+        super().__init__()
+        self._message = message
+        self._base = None  # PIL image the pixmap was built from
+        self._pixmap = None
+        self._scene = None
+        self._layouts = {}  # (text, box_w, box_h) -> (pixel size, wrapped lines), per capture and font
+        self._metrics = {}  # pixel size -> QFontMetricsF of the scene font
+        self.stats = {"base_conversions": 0, "paints": 0}
+
+    def set_message(self, text):
+        self._message = text
+        self._base = self._pixmap = self._scene = None
+        self.setMinimumSize(0, 0)
+        self.update()
+
+    def set_scene(self, scene):
+        if scene.image is not self._base:
+            self._pixmap = pil_to_pixmap(scene.image)
+            self._base = scene.image
+            self._clear_layouts()
+            self.stats["base_conversions"] += 1
+            self.setMinimumSize(self._pixmap.size())
+        elif self._scene is not None and scene.font_family != self._scene.font_family:
+            self._clear_layouts()
+        self._scene = scene
+        self.update()
+
+    def _clear_layouts(self):
+        self._layouts.clear()
+        self._metrics.clear()
+
+    def _font_metrics(self, size):
+        metrics = self._metrics.get(size)
+        if metrics is None:
+            font = self._scene_font()
+            font.setPixelSize(size)
+            metrics = self._metrics[size] = QFontMetricsF(font)
+        return metrics
+
+    def _layout(self, text, box_w, box_h):
+        """Same fit/wrap policy as the PIL renderer (services.font_manager.fit_text), measured with Qt's font."""
+        key = (text, box_w, box_h)
+        layout = self._layouts.get(key)
+        if layout is None:
+            layout = self._layouts[key] = fit_text(
+                text, box_w, box_h,
+                measure=lambda line, size: self._font_metrics(size).horizontalAdvance(line),
+                line_height=lambda size: self._font_metrics(size).ascent() + self._font_metrics(size).descent())
+        return layout
+
+    def _scene_font(self):
+        font = QFont(self.font())
+        if self._scene is not None and self._scene.font_family:
+            font.setFamily(self._scene.font_family)
+        return font
+
+    def paint_scene(self, painter, visible=None):
+        """Paints the current scene with its top-left at the painter origin."""
+        painter.drawPixmap(0, 0, self._pixmap)
+        lines = self._scene.lines_metadata
+        texts = self._scene.translated_texts
+        rects = [QRect(x_min - 2, y_min - 2, x_max - x_min + 4, y_max - y_min + 4)
+                 for x_min, y_min, x_max, y_max in (metadata['box'] for metadata in lines)]
+        shown = [i for i, rect in enumerate(rects) if visible is None or visible.intersects(rect)]
+
+        # Two passes, like draw_translation_overlay: every patch before any text
+        for i in shown:
+            painter.fillRect(rects[i], QColor("white"))
+
+        painter.setPen(QColor("black"))
+        font = self._scene_font()
+        for i in shown:
+            text = texts[i].strip() if i < len(texts) else ""
+            if not text:
+                continue
+            x_min, y_min, x_max, y_max = lines[i]['box']
+            size, wrapped = self._layout(text, x_max - x_min, y_max - y_min)
+            font.setPixelSize(size)
+            painter.setFont(font)
+            metrics = self._font_metrics(size)
+            line_height = metrics.ascent() + metrics.descent() if len(wrapped) > 1 else 0
+            for row, line in enumerate(wrapped):
+                painter.drawText(QPointF(x_min, y_min + row * line_height + metrics.ascent()), line)
+        self.stats["paints"] += 1
+
+    def paintEvent(self, event):
+        painter = QPainter(self)
+        if self._pixmap is None:
+            painter.drawText(self.rect(), Qt.AlignmentFlag.AlignCenter, self._message)
+            return
+        # Centre the capture like the QLabel used to
+        dx = max(0, (self.width() - self._pixmap.width()) // 2)
+        dy = max(0, (self.height() - self._pixmap.height()) // 2)
+        painter.translate(dx, dy)
+        self.paint_scene(painter, event.rect().translated(-dx, -dy))
@@ -1,11 +1,38 @@
-from PyQt6.QtWidgets import QWidget, QVBoxLayout, QLabel, QTextEdit, QComboBox, QPushButton, QScrollArea
-from PyQt6.QtGui import QPixmap, QImage
-from PyQt6.QtCore import Qt, pyqtSignal
+from PyQt6.QtWidgets import QWidget, QVBoxLayout, QHBoxLayout, QLabel, QTextEdit, QComboBox, QFontComboBox, QPushButton, QScrollArea
+from PyQt6.QtCore import Qt, QPoint, QRect, pyqtSignal
+from PyQt6.QtGui import QGuiApplication
 from ui.styles import load_styles
+from ui.overlay_view import OverlayView
+
+# Gap between the result window and a region it is moved away from
+CLEARANCE = 8
+
+def position_clear_of(size, region, available):
+    """
+    Top-left QPoint for a window of size (QSize) beside region (QRect), inside available (QRect):
+    right, left, below or above it, whichever fits first. None when no side has room.
+    """
+    width, height = size.width(), size.height()
+    for x, y in ((region.right() + 1 + CLEARANCE, region.top()),
+                 (region.left() - CLEARANCE - width, region.top()),
+                 (region.left(), region.bottom() + 1 + CLEARANCE),
+                 (region.left(), region.top() - CLEARANCE - height)):
+        x = max(available.left(), min(x, available.right() + 1 - width))
+        y = max(available.top(), min(y, available.bottom() + 1 - height))
+        rect = QRect(QPoint(x, y), size)
+        if available.contains(rect) and not rect.intersects(region):
+            return rect.topLeft()
+    return None
 
 class ResultWindow(QWidget):
     capture_requested = pyqtSignal()
+    recapture_requested = pyqtSignal()
+    watch_requested = pyqtSignal()
     provider_changed = pyqtSignal(str)
+    font_changed = pyqtSignal(str)
+    history_requested = pyqtSignal(int)  # step through earlier captures: -1 previous, +1 next
+    save_layout_requested = pyqtSignal()
+    layout_capture_requested = pyqtSignal()
 
     def __init__(self):
         super().__init__()
@@ -15,12 +42,11 @@ class ResultWindow(QWidget):
         
         layout = QVBoxLayout()
         
-        self.image_label = QLabel("Waiting for capture...")
-        self.image_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
+        self.overlay_view = OverlayView("Waiting for capture...")
         
         self.scroll_area = QScrollArea()
         self.scroll_area.setWidgetResizable(True)
-        self.scroll_area.setWidget(self.image_label)
+        self.scroll_area.setWidget(self.overlay_view)
         
         self.original_text_display = QTextEdit()
         self.original_text_display.setPlaceholderText("Captured Text...")
@@ -34,9 +60,39 @@ class ResultWindow(QWidget):
         
         self.provider_combo = QComboBox()
         self.provider_combo.addItems(["google", "openai"])
+
+        # Font of the painted translation layer; changing it only re-renders
+        self.font_combo = QFontComboBox()
         
         self.btn_new_capture = QPushButton("New Selection")
         self.btn_new_capture.setObjectName("CaptureButton")
+
+        self.btn_recapture = QPushButton("Re-capture Last Region")
+
+        self.btn_watch = QPushButton("Watch Region")
+
+        # Region set of the last capture (Shift+drag adds regions) saved for one-click repeats
+        self.btn_save_layout = QPushButton("Save Regions as Layout")
+        self.btn_capture_layout = QPushButton("Capture Layout")
+        layout_row = QHBoxLayout()
+        layout_row.addWidget(self.btn_save_layout)
+        layout_row.addWidget(self.btn_capture_layout)
+
+        # Earlier captures of the session, re-displayed without OCR or translation
+        self.btn_previous = QPushButton("◀ Previous")
+        self.btn_next = QPushButton("Next ▶")
+        self.history_label = QLabel("")
+        self.history_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
+        history_layout = QHBoxLayout()
+        history_layout.addWidget(self.btn_previous)
+        history_layout.addWidget(self.history_label, 1)
+        history_layout.addWidget(self.btn_next)
+        self.set_history(None, 0)
+
+        self.status_label = QLabel("")
+
+        # Rolling p50/p95 per stage and provider (utils.tracing)
+        self.latency_label = QLabel("")
         
         layout.addWidget(QLabel("Visual Overlay:"))
         layout.addWidget(self.scroll_area, 1)
@@ -46,7 +102,15 @@ class ResultWindow(QWidget):
         layout.addWidget(self.translated_text_display)
         layout.addWidget(QLabel("Provider:"))
         layout.addWidget(self.provider_combo)
+        layout.addWidget(QLabel("Overlay Font:"))
+        layout.addWidget(self.font_combo)
         layout.addWidget(self.btn_new_capture)
+        layout.addWidget(self.btn_recapture)
+        layout.addWidget(self.btn_watch)
+        layout.addLayout(layout_row)
+        layout.addLayout(history_layout)
+        layout.addWidget(self.status_label)
+        layout.addWidget(self.latency_label)
         
         self.setLayout(layout)
         self.setStyleSheet(load_styles())
@@ -54,32 +118,67 @@ class ResultWindow(QWidget):
 
         # Connect internal signals to external emitters
         self.btn_new_capture.clicked.connect(self.capture_requested.emit)
+        self.btn_recapture.clicked.connect(self.recapture_requested.emit)
+        self.btn_watch.clicked.connect(self.watch_requested.emit)
+        self.btn_save_layout.clicked.connect(self.save_layout_requested.emit)
+        self.btn_capture_layout.clicked.connect(self.layout_capture_requested.emit)
+        self.btn_previous.clicked.connect(lambda: self.history_requested.emit(-1))
+        self.btn_next.clicked.connect(lambda: self.history_requested.emit(1))
         self.provider_combo.currentTextChanged.connect(self.provider_changed.emit)
+        self.font_combo.currentFontChanged.connect(lambda font: self.font_changed.emit(font.family()))
 
-    def update_display(self, original_text, translated_text, pil_image):
+    def update_display(self, original_text, translated_text, scene, activate=True):
+        """
+        scene is an OverlayScene (or a plain PIL image); None keeps the current picture.
+        activate=False updates without raising or focusing the window (watch mode refreshes).
+        """
         self.original_text_display.setText(original_text)
         self.translated_text_display.setText(translated_text)
-        if pil_image:
-            q_img = self.pil_to_qimage(pil_image)
-            pixmap = QPixmap.fromImage(q_img)
-            self.image_label.setPixmap(pixmap)
+        if scene is not None:
+            if not hasattr(scene, "lines_metadata"):
+                from services.drawing_service import OverlayScene
+                scene = OverlayScene(scene)
+            self.overlay_view.set_scene(scene)
         
         if not self.isVisible():
+            self.setAttribute(Qt.WidgetAttribute.WA_ShowWithoutActivating, not activate)
             self.show()
-        self.activateWindow()
-
-    def pil_to_qimage(self, pil_img):
-        if pil_img.mode == "RGB":
-            data = pil_img.tobytes("raw", "RGB")
-            stride = pil_img.width * 3
-            img = QImage(data, pil_img.width, pil_img.height, stride, QImage.Format.Format_RGB888)
-            return img.copy()
-        elif pil_img.mode == "RGBA":
-            data = pil_img.tobytes("raw", "RGBA")
-            stride = pil_img.width * 4
-            img = QImage(data, pil_img.width, pil_img.height, stride, QImage.Format.Format_RGBA8888)
-            return img.copy()
-        return QImage()
+        if activate:
+            self.activateWindow()
+
+    def show_watch_update(self, original_text, translated_text, scene):
+        self.update_display(original_text, translated_text, scene, activate=False)
+
+    def move_clear_of(self, region):
+        """
+        Moves the window beside a screen region (QRect) it covers, so it is not grabbed with it (watch mode).
+        Returns False when no side of the region has room on its screen.
+        """
+        if not self.frameGeometry().intersects(region):
+            return True
+        screen = QGuiApplication.screenAt(region.center()) or QGuiApplication.primaryScreen()
+        position = position_clear_of(self.frameGeometry().size(), region, screen.availableGeometry())
+        if position is None:
+            return False
+        self.move(position)
+        return True
+
+    def set_watching(self, watching):
+        self.btn_watch.setText("Stop Watching" if watching else "Watch Region")
+        if not watching:
+            self.status_label.setText("")
+
+    def set_history(self, position, count):
+        """Shows which capture of the session is displayed (position is 0-based, None: none yet)."""
+        self.history_label.setText(f"Capture {position + 1} / {count}" if position is not None else "")
+        self.btn_previous.setEnabled(position is not None and position > 0)
+        self.btn_next.setEnabled(position is not None and position < count - 1)
+
+    def set_status(self, text):
+        self.status_label.setText(text)
+
+    def set_latency(self, text):
+        self.latency_label.setText(text)
 
     def closeEvent(self, event):
         from PyQt6.QtWidgets import QApplication
@@ -0,0 +1,162 @@
+"""
+One long-lived asyncio event loop for the whole session, running in a dedicated daemon thread.
+
+Async I/O (Windows OCR's WinRT calls, async translation providers and their shared HTTP client)
+runs on it instead of creating and tearing down a loop per call or holding one OS thread per
+request. Blocking work called from coroutines goes to a bounded executor via offload().
+Loop responsiveness is traced as "loop_lag": how late a periodic wake-up fires.
+"""
+import asyncio
+import importlib
+import importlib.util
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from utils.tracing import tracer
+
+# Async HTTP library for providers: httpx2 is the transport of current OpenAI SDKs (same API as httpx),
+# so one client can serve both. Looked up without importing; the import is paid on first use.
+HTTP_MODULE = next((name for name in ("httpx2", "httpx") if importlib.util.find_spec(name)), None)
+HAS_ASYNC_HTTP = HTTP_MODULE is not None
+
+def http_module():
+    """The async HTTP library module. Raises ImportError when neither httpx2 nor httpx is installed."""
+    if HTTP_MODULE is None:
+        raise ImportError("async providers need httpx (pip install httpx)")
+    return importlib.import_module(HTTP_MODULE)
+
+class AsyncRuntime:
+    """
+    Starts its loop thread on first use. Any thread may submit() coroutines (returns a
+    concurrent.futures.Future) or run() them to completion; run() must not be called from the loop itself.
+    """
+
+    def __init__(self, lag_interval=0.25, executor_workers=None):
+        self.lag_interval = lag_interval
+        self.executor_workers = executor_workers or min(8, (os.cpu_count() or 1) + 2)
+        self._loop = None
+        self._thread = None
+        self._executor = None
+        self._http_client = None
+        self._lock = threading.Lock()
+        self.stats = {"submitted": 0, "offloaded": 0, "lag_ms_last": 0.0, "lag_ms_max": 0.0}
+
+    @property
+    def running(self):
+        return self._thread is not None and self._thread.is_alive()
+
+    @property
+    def loop(self):
+        with self._lock:
+            if self._loop is None:
+                self._start()
+            return self._loop
+
+    def _start(self):
+        loop = asyncio.new_event_loop()
+        self._executor = ThreadPoolExecutor(max_workers=self.executor_workers, thread_name_prefix="async-offload")
+        loop.set_default_executor(self._executor)
+        started = threading.Event()
+
+        def main():
+            asyncio.set_event_loop(loop)
+            loop.call_soon(started.set)
+            if self.lag_interval:
+                loop.create_task(self._monitor_lag())
+            loop.run_forever()
+            loop.close()
+
+        self._thread = threading.Thread(target=main, name="async-runtime", daemon=True)
+        self._thread.start()
+        started.wait()
+        self._loop = loop
+
+    def in_loop(self):
+        return self._thread is not None and threading.current_thread() is self._thread
+
+    def submit(self, coroutine):
+        """Schedules a coroutine on the loop; returns a concurrent.futures.Future for its result."""
+        loop = self.loop
+        self.stats["submitted"] += 1
+        return asyncio.run_coroutine_threadsafe(coroutine, loop)
+
+    def cancel(self, futures):
+        """
+        Cancels submitted coroutines from one loop callback, so all of them see the cancellation before any
+        runs again (one by one, a cancelled task leaving a semaphore could let a waiting one start its request).
+        """
+        futures = list(futures)
+
+        def cancel_all():
+            for future in futures:
+                future.cancel()
+
+        if self.in_loop():
+            cancel_all()
+        elif self._loop is not None and not self._loop.is_closed():
+            self._loop.call_soon_threadsafe(cancel_all)
+
+    def run(self, coroutine, timeout=None):
+        """Runs a coroutine on the loop and blocks the calling thread until it finishes."""
+        if self.in_loop():
+            coroutine.close()
+            raise RuntimeError("AsyncRuntime.run() called from the event loop thread; await the coroutine instead")
+        return self.submit(coroutine).result(timeout)
+
+    async def offload(self, fn, *args):
+        """Awaits a blocking call (OCR, disk, a sync provider) on the executor, keeping the loop free."""
+        self.stats["offloaded"] += 1
+        return await asyncio.get_running_loop().run_in_executor(None, fn, *args)
+
+    def http_client(self):
+        """
+        The HTTP client shared by every async provider (one connection pool, one event loop).
+        Only use it from coroutines running on this runtime's loop.
+        """
+        with self._lock:
+            if self._http_client is None:
+                httpx = http_module()
+                self._http_client = httpx.AsyncClient(timeout=30, limits=httpx.Limits(max_keepalive_connections=20))
+            return self._http_client
+
+    async def _monitor_lag(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            expected = loop.time() + self.lag_interval
+            await asyncio.sleep(self.lag_interval)
+            lag = max(0.0, loop.time() - expected)
+            now = time.perf_counter_ns()
+            tracer.record("loop_lag", now - int(lag * 1e9), now)
+            self.stats["lag_ms_last"] = lag * 1000
+            self.stats["lag_ms_max"] = max(self.stats["lag_ms_max"], lag * 1000)
+
+    def close(self, timeout=5):
+        """Closes the shared HTTP client, stops the loop and joins its thread. The runtime can be started again."""
+        with self._lock:
+            loop, thread, client = self._loop, self._thread, self._http_client
+            self._loop = self._thread = self._http_client = None
+        if loop is None:
+            return
+        if client is not None:
+            try:
+                asyncio.run_coroutine_threadsafe(client.aclose(), loop).result(timeout)
+            except Exception as e:
+                print(f"Async runtime: closing the HTTP client failed ({e})")
+
+        async def cancel_tasks():
+            tasks = [task for task in asyncio.all_tasks() if task is not asyncio.current_task()]
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+        try:
+            asyncio.run_coroutine_threadsafe(cancel_tasks(), loop).result(timeout)
+        finally:
+            loop.call_soon_threadsafe(loop.stop)
+            thread.join(timeout)
+            self._executor.shutdown(wait=False, cancel_futures=True)
+
+# Process-wide runtime, started lazily by the first caller
+runtime = AsyncRuntime()
@@ -14,17 +14,63 @@ def get_tesseract_cmd():
             return p
     return 'tesseract' # Hope it's in PATH
 
+def get_tessdata_dir():
+    """Returns the tessdata directory next to the Tesseract executable, or None to use the library default."""
+    cmd = get_tesseract_cmd()
+    if os.path.isabs(cmd):
+        path = os.path.join(os.path.dirname(cmd), 'tessdata')
+        if os.path.isdir(path):
+            return path
+    return os.getenv("TESSDATA_PREFIX")
+
+_env_cache = {}
+
 def get_openai_api_key():
     """Retrieves OpenAI API key from environment or project file."""
-    # Look for .env first
+    # Look for .env first (parsed once per modification, not on every capture)
     env_path = os.path.join(os.getcwd(), '.env')
     if os.path.exists(env_path):
-        with open(env_path, 'r') as f:
-            for line in f:
-                if line.startswith('OPENAI_API_KEY='):
-                    return line.split('=')[1].strip()
+        mtime = os.path.getmtime(env_path)
+        if _env_cache.get('path') != env_path or _env_cache.get('mtime') != mtime:
+            key = None
+            with open(env_path, 'r') as f:
+                for line in f:
+                    if line.startswith('OPENAI_API_KEY='):
+                        key = line.split('=')[1].strip()
+                        break
+            _env_cache.update(path=env_path, mtime=mtime, key=key)
+        if _env_cache['key']:
+            return _env_cache['key']
     return os.getenv("OPENAI_API_KEY")
 
+def get_ocr_strategy():
+    """OCR engine selection for OCRService: auto | windows | tesserocr | tesseract."""
+    return os.getenv("SCREEN_TRANSLATOR_OCR", "auto")
+
+def get_ocr_languages():
+    """Tesseract languages for OCRService: 'auto' (script detection per capture) or a fixed set such as 'eng+jpn'."""
+    return os.getenv("SCREEN_TRANSLATOR_OCR_LANG", "auto")
+
+def get_text_regions_enabled():
+    """Whether Tesseract only OCRs detected text regions (SCREEN_TRANSLATOR_TEXT_REGIONS, default on)."""
+    return os.getenv("SCREEN_TRANSLATOR_TEXT_REGIONS", "1") != "0"
+
+def get_stub_latency():
+    """Request latency in seconds for the offline 'stub' provider (SCREEN_TRANSLATOR_STUB_LATENCY_MS)."""
+    return float(os.getenv("SCREEN_TRANSLATOR_STUB_LATENCY_MS", "0")) / 1000.0
+
+def get_history_budget():
+    """In-memory byte budget of the capture history (SCREEN_TRANSLATOR_HISTORY_MB, default 256)."""
+    return int(float(os.getenv("SCREEN_TRANSLATOR_HISTORY_MB", "256")) * 1024 * 1024)
+
+def get_cache_dir():
+    """Returns the directory used for persistent caches (translation memory, etc.)."""
+    return os.getenv("SCREEN_TRANSLATOR_CACHE_DIR") or os.path.join(os.getcwd(), '.cache')
+
+def get_layout_path():
+    """Saved multi-region capture layout (SCREEN_TRANSLATOR_LAYOUT, default layout.json in the cache dir)."""
+    return os.getenv("SCREEN_TRANSLATOR_LAYOUT") or os.path.join(get_cache_dir(), 'layout.json')
+
 def get_font_path():
     """Returns a path to a valid Chinese-supporting font on Windows."""
     paths = [
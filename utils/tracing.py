@@ -0,0 +1,134 @@
+"""
+Lightweight pipeline instrumentation, cheap enough to leave on:
+a span is two perf_counter_ns() calls and a bounded deque append. Percentiles are only computed on request.
+"""
+import cProfile
+import itertools
+import json
+import os
+import threading
+import time
+import tracemalloc
+from collections import deque
+from contextlib import contextmanager
+
+class Tracer:
+    """
+    Records timing spans (stage name, capture id, thread) into a ring buffer for Chrome-trace export,
+    and keeps the last `window` durations per stage for rolling p50/p95.
+    Stage names may carry a qualifier after a colon, e.g. "translate:google", for per-provider figures.
+    """
+
+    def __init__(self, capacity=20000, window=200, enabled=True):
+        self.enabled = enabled
+        self.window = window
+        self._events = deque(maxlen=capacity)
+        self._samples = {}
+        self._lock = threading.Lock()
+        self._capture_ids = itertools.count(1)
+        self._origin_ns = time.perf_counter_ns()
+
+    def new_capture_id(self):
+        return next(self._capture_ids)
+
+    def record(self, name, start_ns, end_ns, capture_id=None, **args):
+        if not self.enabled:
+            return
+        if capture_id is not None:
+            args["capture_id"] = capture_id
+        event = (name, start_ns, end_ns, threading.get_ident(), args)
+        with self._lock:
+            self._events.append(event)
+            samples = self._samples.get(name)
+            if samples is None:
+                samples = self._samples[name] = deque(maxlen=self.window)
+            samples.append((end_ns - start_ns) / 1e6)
+
+    @contextmanager
+    def span(self, name, capture_id=None, **args):
+        start = time.perf_counter_ns()
+        try:
+            yield
+        finally:
+            self.record(name, start, time.perf_counter_ns(), capture_id, **args)
+
+    def percentiles(self):
+        """{stage: {'count', 'p50_ms', 'p95_ms'}} over the rolling window."""
+        with self._lock:
+            snapshot = {name: sorted(samples) for name, samples in self._samples.items()}
+        return {
+            name: {
+                "count": len(values),
+                "p50_ms": values[len(values) // 2],
+                "p95_ms": values[min(len(values) - 1, int(len(values) * 0.95))],
+            }
+            for name, values in snapshot.items() if values
+        }
+
+    def summary(self, stages=None):
+        """One line per stage, e.g. 'ocr  p50 120 ms · p95 310 ms (n=42)'."""
+        stats = self.percentiles()
+        names = [name for name in (stages or sorted(stats)) if name in stats]
+        return "\n".join(
+            f"{name}  p50 {stats[name]['p50_ms']:.0f} ms · p95 {stats[name]['p95_ms']:.0f} ms (n={stats[name]['count']})"
+            for name in names
+        )
+
+    def chrome_trace(self):
+        """Events in Chrome trace format (chrome://tracing, Perfetto): complete ("X") events in microseconds."""
+        with self._lock:
+            events = list(self._events)
+        pid = os.getpid()
+        return {
+            "displayTimeUnit": "ms",
+            "traceEvents": [
+                {"name": name, "cat": name.split(":", 1)[0], "ph": "X", "pid": pid, "tid": tid,
+                 "ts": (start - self._origin_ns) / 1000, "dur": (end - start) / 1000, "args": args}
+                for name, start, end, tid, args in events
+            ],
+        }
+
+    def export_chrome_trace(self, path):
+        folder = os.path.dirname(path)
+        if folder:
+            os.makedirs(folder, exist_ok=True)
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(self.chrome_trace(), f)
+        return path
+
+    def clear(self):
+        with self._lock:
+            self._events.clear()
+            self._samples.clear()
+
+# Process-wide tracer; SCREEN_TRANSLATOR_TRACE=0 turns recording off
+tracer = Tracer(enabled=os.getenv("SCREEN_TRANSLATOR_TRACE", "1") != "0")
+
+@contextmanager
+def profile_run(path_prefix, memory=True, top=30):
+    """
+    cProfile (and optionally tracemalloc) around one run. Writes <prefix>.prof (open with pstats/snakeviz)
+    and <prefix>-memory.txt with the top allocation sites. cProfile only sees the calling thread.
+    """
+    folder = os.path.dirname(path_prefix)
+    if folder:
+        os.makedirs(folder, exist_ok=True)
+    started_tracing = memory and not tracemalloc.is_tracing()
+    if started_tracing:
+        tracemalloc.start(10)
+    profiler = cProfile.Profile()
+    profiler.enable()
+    try:
+        yield
+    finally:
+        profiler.disable()
+        profiler.dump_stats(path_prefix + ".prof")
+        if memory:
+            snapshot = tracemalloc.take_snapshot()
+            current, peak = tracemalloc.get_traced_memory()
+            if started_tracing:
+                tracemalloc.stop()
+            with open(path_prefix + "-memory.txt", "w", encoding="utf-8") as f:
+                f.write(f"current {current / 1e6:.1f} MB, peak {peak / 1e6:.1f} MB\n")
+                for stat in snapshot.statistics("lineno")[:top]:
+                    f.write(f"{stat}\n")